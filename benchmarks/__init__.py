@@ -0,0 +1 @@
+"""Benchmarks offline del portfolio de stocks."""
@@ -0,0 +1,119 @@
+"""
+Benchmark del tiempo de importación de los módulos del paquete.
+
+Cada módulo se importa en un intérprete nuevo, por lo que los tiempos no
+dependen de lo que ya esté cargado. Además del tiempo se reporta si la
+importación cargó alguna dependencia pesada, y con --check se termina con
+error si un módulo liviano carga una dependencia que no le corresponde.
+
+Uso:
+    python -m benchmarks.imports
+    python -m benchmarks.imports --check
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, TypedDict
+
+logger = logging.getLogger(__name__)
+
+# Dependencias pesadas cuya carga se reporta
+HEAVY_MODULES = ["numpy", "pandas", "yfinance", "pyarrow", "streamlit"]
+
+# Dependencias pesadas que cada módulo no debe cargar al importarse
+FORBIDDEN: Dict[str, List[str]] = {
+    "models": HEAVY_MODULES,
+    "utils": HEAVY_MODULES,
+    "utils.formatting": HEAVY_MODULES,
+    "utils.memo": HEAVY_MODULES,
+    "utils.market": ["yfinance", "streamlit"],
+    "classes.portfolio": ["yfinance", "streamlit"],
+}
+
+ROOT = Path(__file__).resolve().parent.parent
+
+_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+class ImportResult(TypedDict):
+    """Resultado de la importación de un módulo."""
+
+    module: str
+    seconds: float
+    loaded: List[str]
+    forbidden: List[str]
+
+
+def measure_import(module: str, repeat: int = 3) -> ImportResult:
+    """
+    Mide la importación de un módulo en intérpretes nuevos.
+
+    Args:
+        module: Nombre del módulo a importar
+        repeat: Cantidad de mediciones; se reporta la mediana
+
+    Returns:
+        ImportResult: Tiempo mediano, dependencias pesadas cargadas y las que
+            el módulo no debería cargar
+    """
+    timings = []
+    loaded: List[str] = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", _SCRIPT.format(module=module, heavy=HEAVY_MODULES)],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        report = json.loads(output.strip().splitlines()[-1])
+        timings.append(report["seconds"])
+        loaded = report["loaded"]
+    forbidden = [name for name in loaded if name in FORBIDDEN.get(module, [])]
+    return {
+        "module": module,
+        "seconds": statistics.median(timings),
+        "loaded": loaded,
+        "forbidden": forbidden,
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Punto de entrada de la línea de comandos."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1] if __doc__ else None)
+    parser.add_argument("modules", nargs="*", help="Módulos a medir (por defecto, todos)")
+    parser.add_argument("--repeat", type=int, default=3, help="Mediciones por módulo")
+    parser.add_argument(
+        "--check", action="store_true", help="Fallar si un módulo carga dependencias prohibidas"
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    modules = args.modules or [*FORBIDDEN, "classes.vectorized", "utils.providers"]
+    results = [measure_import(module, args.repeat) for module in modules]
+    for result in results:
+        logger.info(
+            f"{result['module']:<20} {result['seconds'] * 1000:>8.1f} ms  "
+            f"{', '.join(result['loaded']) or '-'}"
+        )
+
+    violations = [result for result in results if result["forbidden"]]
+    for result in violations:
+        logger.error(f"{result['module']} carga {', '.join(result['forbidden'])} al importarse")
+    if args.check and violations:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
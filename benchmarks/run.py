@@ -0,0 +1,334 @@
+"""
+Benchmarks offline de Stock, Portfolio y utils.market.
+
+Los precios provienen de un SyntheticProvider determinista, por lo que los
+tiempos no dependen de la red y son comparables entre versiones. Para cada
+escenario (operación, cantidad de tenencias, rango de fechas) se reporta el
+tiempo de ejecución, la cantidad de llamadas al proveedor de datos y el pico
+de memoria, y los resultados se guardan en JSON.
+
+Uso:
+    python -m benchmarks.run                        # Grilla completa
+    python -m benchmarks.run --quick                # Grilla reducida
+    python -m benchmarks.run --compare anterior.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import platform
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from importlib import metadata
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, TypedDict
+
+import numpy as np
+import pandas as pd
+
+from classes.ledger import Ledger
+from classes.portfolio import Portfolio
+from utils.cache import PriceCache, set_price_cache
+from utils.market import get_stock_price
+from utils.memo import PriceMemo, set_price_memo
+from utils.price_index import PriceIndex, set_price_index
+from utils.providers import MarketDataProvider, SyntheticProvider, set_provider
+
+logger = logging.getLogger(__name__)
+
+# Grilla de escenarios
+SIZES = [10, 100, 1_000, 10_000, 100_000]
+QUICK_SIZES = [10, 100, 1_000]
+SPANS = {"week": 7, "quarter": 91, "year": 365, "decade": 3652}
+QUICK_SPANS = {"week": 7, "year": 365}
+
+# Fecha final de todos los escenarios
+END_DATE = date(2024, 12, 31)
+
+# Cantidad de símbolos distintos y de fechas de compra distintas
+UNIVERSE_SIZE = 100
+PURCHASE_DAYS = 250
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+class BenchmarkResult(TypedDict):
+    """Resultado de un escenario."""
+
+    operation: str
+    holdings: int
+    span: str
+    span_days: int
+    wall_time_s: float
+    provider_calls: int
+    peak_memory_bytes: int
+
+
+class CountingProvider(MarketDataProvider):
+    """Proveedor que delega en otro y cuenta las llamadas."""
+
+    def __init__(self, provider: MarketDataProvider) -> None:
+        """Inicializa el proveedor."""
+        self.provider = provider
+        self.calls = 0
+
+    def history(self, symbol: str, start: datetime | date, end: datetime | date) -> pd.DataFrame:
+        """Cuenta y delega la consulta de historial."""
+        self.calls += 1
+        return self.provider.history(symbol, start, end)
+
+    def recent_history(self, symbol: str, period: str) -> pd.DataFrame:
+        """Cuenta y delega la consulta de historial reciente."""
+        self.calls += 1
+        return self.provider.recent_history(symbol, period)
+
+    def download(
+        self, symbols: Sequence[str], start: datetime | date, end: datetime | date
+    ) -> Dict[str, pd.DataFrame]:
+        """Cuenta y delega la descarga de varios símbolos."""
+        self.calls += 1
+        return self.provider.download(symbols, start, end)
+
+
+def generate_holdings(size: int, span_days: int, seed: int = 0) -> List[Tuple[str, str]]:
+    """
+    Genera tenencias deterministas (símbolo, fecha de compra).
+
+    Las fechas de compra se reparten entre el año y medio previo al inicio del
+    rango y el final, de modo que haya acciones compradas antes y durante el rango.
+    """
+    rng = np.random.default_rng(seed)
+    first = END_DATE - timedelta(days=span_days + 548)
+    offsets = rng.integers(0, (END_DATE - first).days, PURCHASE_DAYS)
+    purchase_days = [(first + timedelta(days=int(offset))).isoformat() for offset in offsets]
+    symbols = rng.integers(0, UNIVERSE_SIZE, size)
+    days = rng.integers(0, PURCHASE_DAYS, size)
+    return [(f"SYM{symbol:03d}", purchase_days[day]) for symbol, day in zip(symbols, days)]
+
+
+def build_portfolio(holdings: Sequence[Tuple[str, str]]) -> Portfolio:
+    """Construye un portfolio con las tenencias indicadas."""
+    portfolio = Portfolio()
+    for symbol, purchase_date in holdings:
+        portfolio.add_stock(symbol, purchase_date)
+    return portfolio
+
+
+def build_ledger(holdings: Sequence[Tuple[str, str]]) -> Ledger:
+    """
+    Construye un libro con una compra de dos acciones por tenencia.
+
+    Una de cada tres tenencias vende una acción en la fecha final, por lo que
+    hay beneficio realizado y posiciones abiertas. Los precios se obtienen al
+    calcular el beneficio.
+    """
+    ledger = Ledger()
+    for symbol, purchase_date in holdings:
+        ledger.buy(symbol, purchase_date, 2.0)
+    for symbol, _ in holdings[::3]:
+        ledger.sell(symbol, END_DATE.isoformat(), 1.0)
+    return ledger
+
+
+def fresh_portfolio(portfolio: Portfolio) -> Portfolio:
+    """Copia los lotes ya resueltos de un portfolio, sin el estado incremental de profit."""
+    copy = Portfolio()
+    for stock in portfolio.stocks:
+        copy.add_lot(stock)
+    return copy
+
+
+def quietly(operation: Callable[[], object]) -> None:
+    """Ejecuta una operación descartando las notas que imprime por consola."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        operation()
+
+
+def measure(
+    operation: Callable[[], object],
+    provider: CountingProvider,
+    reset: Optional[Callable[[], None]] = None,
+) -> Tuple[float, int, int]:
+    """
+    Mide una operación en frío: tiempo, llamadas al proveedor y pico de memoria.
+
+    La operación se ejecuta dos veces con la memoización y el índice de cierres
+    vacíos y, si se indica, después de reset, que restablece fuera de la
+    medición el estado que la operación guarda entre llamadas: la primera para
+    medir el tiempo y las llamadas, y la segunda bajo tracemalloc para el pico
+    de memoria, ya que tracemalloc distorsiona los tiempos.
+    """
+    if reset is not None:
+        reset()
+    set_price_memo(PriceMemo())
+    set_price_index(PriceIndex())
+    provider.calls = 0
+    started = time.perf_counter()
+    quietly(operation)
+    wall_time = time.perf_counter() - started
+    calls = provider.calls
+
+    if reset is not None:
+        reset()
+    set_price_memo(PriceMemo())
+    set_price_index(PriceIndex())
+    tracemalloc.start()
+    try:
+        quietly(operation)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return wall_time, calls, peak
+
+
+def run(
+    sizes: Sequence[int],
+    spans: Dict[str, int],
+    max_init: int,
+    cache_path: Optional[str] = None,
+) -> List[BenchmarkResult]:
+    """
+    Ejecuta la grilla de escenarios.
+
+    Args:
+        sizes: Cantidades de tenencias
+        spans: Rangos de fechas por nombre, en días
+        max_init: Cantidad máxima de tenencias para medir la construcción de
+            Stock y get_stock_price, que escalan linealmente
+        cache_path: Caché en disco a utilizar, o None para medir sin caché
+
+    Returns:
+        List[BenchmarkResult]: Resultado de cada escenario
+    """
+    provider = CountingProvider(SyntheticProvider())
+    set_provider(provider)
+    set_price_cache(PriceCache(cache_path) if cache_path else None)
+
+    results: List[BenchmarkResult] = []
+    for span, span_days in spans.items():
+        start_date = (END_DATE - timedelta(days=span_days)).isoformat()
+        end_date = END_DATE.isoformat()
+        for size in sizes:
+            holdings = generate_holdings(size, span_days)
+            with contextlib.redirect_stdout(io.StringIO()):
+                portfolio = build_portfolio(holdings)
+            ledger = build_ledger(holdings)
+            end = datetime.combine(END_DATE, datetime.min.time())
+
+            def init_stocks() -> object:
+                return build_portfolio(holdings)
+
+            def lookup_prices() -> object:
+                return [get_stock_price(symbol, end) for symbol, _ in holdings]
+
+            def reset_portfolio() -> None:
+                # profit guarda los términos de cada lote entre llamadas
+                nonlocal portfolio
+                portfolio = fresh_portfolio(portfolio)
+
+            operations: List[Tuple[str, Callable[[], object]]] = [
+                ("profit", lambda: portfolio.profit(start_date, end_date)),
+                ("profit_vectorized", lambda: portfolio.profit_vectorized(start_date, end_date)),
+                ("risk", lambda: portfolio.risk(start_date, end_date, benchmark="SYM000")),
+                ("ledger", lambda: ledger.profit(end_date)),
+            ]
+            if size <= max_init:
+                operations.append(("stock_init", init_stocks))
+                operations.append(("get_stock_price", lookup_prices))
+            operations.append(
+                ("value_series", lambda: portfolio.value_series(start_date, end_date))
+            )
+
+            for name, operation in operations:
+                reset = reset_portfolio if name == "profit" else None
+                wall_time, calls, peak = measure(operation, provider, reset)
+                result: BenchmarkResult = {
+                    "operation": name,
+                    "holdings": size,
+                    "span": span,
+                    "span_days": span_days,
+                    "wall_time_s": wall_time,
+                    "provider_calls": calls,
+                    "peak_memory_bytes": peak,
+                }
+                results.append(result)
+                logger.info(
+                    f"{name:<18} {size:>7} {span:<8} {wall_time:>10.4f}s "
+                    f"{calls:>7} llamadas {peak / 1_048_576:>9.1f} MiB"
+                )
+    return results
+
+
+def package_version() -> str:
+    """Versión instalada del paquete, si está disponible."""
+    try:
+        return metadata.version("stocks-portfolio")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def save(results: List[BenchmarkResult], output: Path) -> None:
+    """Guarda los resultados en JSON junto con datos del entorno."""
+    output.parent.mkdir(parents=True, exist_ok=True)
+    report = {
+        "version": package_version(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    output.write_text(json.dumps(report, indent=2))
+    logger.info(f"\nResultados guardados en {output}")
+
+
+def compare(results: List[BenchmarkResult], baseline_path: Path) -> None:
+    """Muestra la relación de tiempos y llamadas respecto de una ejecución anterior."""
+    baseline = json.loads(baseline_path.read_text())
+    previous = {
+        (item["operation"], item["holdings"], item["span"]): item for item in baseline["results"]
+    }
+    logger.info(f"\nComparación con {baseline_path} (versión {baseline.get('version')}):")
+    for result in results:
+        key = (result["operation"], result["holdings"], result["span"])
+        if key not in previous:
+            continue
+        old = previous[key]
+        ratio = result["wall_time_s"] / old["wall_time_s"] if old["wall_time_s"] else float("inf")
+        logger.info(
+            f"{key[0]:<18} {key[1]:>7} {key[2]:<8} tiempo x{ratio:>6.2f} "
+            f"llamadas {old['provider_calls']} -> {result['provider_calls']}"
+        )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Punto de entrada de la línea de comandos."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1] if __doc__ else None)
+    parser.add_argument("--quick", action="store_true", help="Ejecutar una grilla reducida")
+    parser.add_argument("--sizes", type=int, nargs="+", help="Cantidades de tenencias")
+    parser.add_argument(
+        "--max-init",
+        type=int,
+        default=10_000,
+        help="Tenencias máximas para medir stock_init y get_stock_price",
+    )
+    parser.add_argument("--cache", help="Ruta de un caché en disco a utilizar")
+    parser.add_argument("--output", type=Path, help="Archivo JSON de resultados")
+    parser.add_argument("--compare", type=Path, help="JSON de una ejecución anterior")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    sizes = args.sizes or (QUICK_SIZES if args.quick else SIZES)
+    spans = QUICK_SPANS if args.quick else SPANS
+
+    results = run(sizes, spans, args.max_init, args.cache)
+    output = args.output or RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}.json"
+    save(results, output)
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
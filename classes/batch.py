@@ -0,0 +1,104 @@
+"""Valuación en lote de muchos portfolios con un único conjunto de precios compartido."""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from classes.portfolio import Portfolio
+from classes.stock import resolve_stocks
+from models.portfolio import PortfolioResult
+from utils.market import get_stock_prices, validate_dates
+
+# Cantidad de portfolios a partir de la cual se valúan en varios procesos
+PARALLEL_THRESHOLD = 500
+
+# Bloques por proceso, para repartir mejor portfolios de distinto tamaño
+CHUNKS_PER_PROCESS = 4
+
+PricePool = Dict[Tuple[str, datetime], float]
+
+
+def price_pool(portfolios: Sequence[Portfolio], start_date: str, end_date: str) -> PricePool:
+    """
+    Obtiene con una única descarga los precios que necesitan todos los portfolios.
+
+    Cada par (símbolo, fecha) se consulta una sola vez aunque aparezca en
+    muchos portfolios.
+
+    Args:
+        portfolios: Portfolios a valuar
+        start_date: Fecha inicial en formato YYYY-MM-DD
+        end_date: Fecha final en formato YYYY-MM-DD
+
+    Returns:
+        dict: Precio de cierre para cada par (símbolo, fecha)
+
+    Raises:
+        ValueError: Si las fechas son inválidas o no hay datos disponibles
+    """
+    start, end = validate_dates(start_date, end_date)
+    requests: Dict[Tuple[str, datetime], None] = {}
+    for portfolio in portfolios:
+        requests.update(dict.fromkeys(portfolio.price_requests(start, end)))
+    return get_stock_prices(requests)
+
+
+def _value_chunk(
+    portfolios: Sequence[Portfolio], start_date: str, end_date: str, prices: PricePool
+) -> List[PortfolioResult]:
+    """Valúa un bloque de portfolios con los precios compartidos."""
+    return [portfolio.profit_with_prices(start_date, end_date, prices) for portfolio in portfolios]
+
+
+def value_portfolios(
+    portfolios: Sequence[Portfolio],
+    start_date: str,
+    end_date: str,
+    processes: Optional[int] = None,
+) -> List[PortfolioResult]:
+    """
+    Calcula el beneficio de muchos portfolios entre dos fechas.
+
+    Se reúnen los pares (símbolo, fecha) que necesitan todos los portfolios y
+    se obtienen con una única descarga; luego cada portfolio se valúa contra
+    esos precios, en varios procesos si la cantidad de portfolios es grande.
+
+    Args:
+        portfolios: Portfolios a valuar
+        start_date: Fecha inicial en formato YYYY-MM-DD
+        end_date: Fecha final en formato YYYY-MM-DD
+        processes: Cantidad de procesos a utilizar. Por defecto, uno por CPU si
+            hay al menos PARALLEL_THRESHOLD portfolios; 1 para no usar procesos
+
+    Returns:
+        List[PortfolioResult]: Resultado de cada portfolio, en el orden recibido
+
+    Raises:
+        ValueError: Si las fechas son inválidas, alguna acción no se pudo
+            resolver o no hay datos disponibles
+    """
+    portfolios = list(portfolios)
+    validate_dates(start_date, end_date)
+
+    # Las acciones diferidas de todos los portfolios se resuelven juntas
+    errors = resolve_stocks(stock for portfolio in portfolios for stock in portfolio.stocks)
+    if errors:
+        raise ValueError(errors[0]["error"])
+    prices = price_pool(portfolios, start_date, end_date)
+
+    if processes is None:
+        processes = (os.cpu_count() or 1) if len(portfolios) >= PARALLEL_THRESHOLD else 1
+    if processes <= 1 or len(portfolios) < 2:
+        return _value_chunk(portfolios, start_date, end_date, prices)
+
+    size = max(1, -(-len(portfolios) // (processes * CHUNKS_PER_PROCESS)))
+    chunks = [portfolios[i : i + size] for i in range(0, len(portfolios), size)]
+    results: List[PortfolioResult] = []
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = [
+            executor.submit(_value_chunk, chunk, start_date, end_date, prices) for chunk in chunks
+        ]
+        for future in futures:
+            results.extend(future.result())
+    return results
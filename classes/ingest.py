@@ -0,0 +1,162 @@
+"""
+Carga de tenencias desde archivos CSV grandes en bloques.
+
+El archivo se lee en bloques de filas con un generador, por lo que la memoria
+usada no depende del tamaño del archivo. Las acciones de cada bloque se
+resuelven en lote (una validación por símbolo distinto y una única descarga de
+precios) y se agregan al portfolio. Las filas inválidas se reportan en lugar de
+interrumpir la carga.
+
+El CSV debe tener las columnas symbol y purchase_date (YYYY-MM-DD), y
+opcionalmente quantity, cost_basis y currency.
+"""
+
+import csv
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from classes.portfolio import Portfolio
+from classes.stock import Stock, resolve_stocks
+from models.portfolio import IngestProgress, RowError
+from utils.fx import DEFAULT_CURRENCY
+
+# Columnas obligatorias del CSV de tenencias
+REQUIRED_COLUMNS = ["symbol", "purchase_date"]
+
+# Filas por bloque por defecto
+DEFAULT_CHUNKSIZE = 10_000
+
+CsvRow = Tuple[int, Dict[str, str]]
+
+
+def iter_csv_chunks(path: str | Path, chunksize: int = DEFAULT_CHUNKSIZE) -> Iterator[List[CsvRow]]:
+    """
+    Lee un CSV de tenencias en bloques de filas.
+
+    Args:
+        path: Ruta del archivo CSV
+        chunksize: Cantidad de filas por bloque
+
+    Yields:
+        List[CsvRow]: Pares (número de línea, fila) con los nombres de columna
+            en minúsculas. Las filas con campos de más incluyen la clave "" y las
+            filas con campos de menos tienen valores vacíos
+
+    Raises:
+        ValueError: Si el archivo no tiene las columnas obligatorias
+    """
+    if chunksize <= 0:
+        raise ValueError("El tamaño de bloque debe ser mayor a cero")
+    with open(path, newline="", encoding="utf-8-sig") as file:
+        reader = csv.reader(file)
+        header = [column.strip().lower() for column in next(reader, [])]
+        missing = [column for column in REQUIRED_COLUMNS if column not in header]
+        if missing:
+            raise ValueError(f"Faltan columnas en {path}: {', '.join(missing)}")
+
+        chunk: List[CsvRow] = []
+        for values in reader:
+            if not any(value.strip() for value in values):
+                continue
+            row = {column: value.strip() for column, value in zip(header, values)}
+            if len(values) > len(header):
+                row[""] = ",".join(values[len(header) :])
+            chunk.append((reader.line_num, row))
+            if len(chunk) >= chunksize:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def _parse_row(row: Dict[str, str], purchase_date: pd.Timestamp) -> Stock:
+    """
+    Crea una acción diferida a partir de una fila del CSV.
+
+    Raises:
+        ValueError: Si la fila está mal formada
+    """
+    if "" in row:
+        raise ValueError("La fila tiene más campos que el encabezado")
+    if not row.get("symbol"):
+        raise ValueError("Falta el símbolo")
+    if pd.isna(purchase_date):
+        raise ValueError(f"Fecha de compra inválida: {row.get('purchase_date', '')}")
+    try:
+        quantity = float(row.get("quantity") or 1.0)
+        cost_basis = float(row["cost_basis"]) if row.get("cost_basis") else None
+    except ValueError:
+        raise ValueError("La cantidad y el costo deben ser números")
+    currency = row.get("currency") or DEFAULT_CURRENCY
+    return Stock(
+        row["symbol"], row["purchase_date"], quantity, cost_basis, lazy=True, currency=currency
+    )
+
+
+def ingest_csv(
+    portfolio: Portfolio,
+    path: str | Path,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    progress: Optional[Callable[[IngestProgress], None]] = None,
+    max_workers: int = 8,
+) -> List[RowError]:
+    """
+    Agrega al portfolio las tenencias de un CSV, bloque por bloque.
+
+    Args:
+        portfolio: Portfolio al que se agregan las acciones
+        path: Ruta del archivo CSV
+        chunksize: Cantidad de filas leídas y resueltas por bloque
+        progress: Función que recibe el avance después de cada bloque
+        max_workers: Cantidad máxima de símbolos validados en simultáneo
+
+    Returns:
+        List[RowError]: Filas mal formadas o que no se pudieron resolver
+
+    Raises:
+        ValueError: Si el archivo no tiene las columnas obligatorias
+    """
+    errors: List[RowError] = []
+    status: IngestProgress = {"rows": 0, "added": 0, "errors": 0}
+
+    for chunk in iter_csv_chunks(path, chunksize):
+        dates = pd.to_datetime(
+            [row.get("purchase_date", "") for _, row in chunk], format="%Y-%m-%d", errors="coerce"
+        )
+        stocks: List[Tuple[CsvRow, Stock]] = []
+        chunk_errors: List[RowError] = []
+        for (line, row), purchase_date in zip(chunk, dates):
+            try:
+                stocks.append(((line, row), _parse_row(row, purchase_date)))
+            except ValueError as e:
+                chunk_errors.append(_row_error(line, row, str(e)))
+
+        # Las acciones que no se resuelven quedan sin resolver, en el mismo
+        # orden que los errores devueltos
+        failures = iter(resolve_stocks((stock for _, stock in stocks), max_workers))
+        for (line, row), stock in stocks:
+            if stock.resolved:
+                portfolio.add_lot(stock)
+                status["added"] += 1
+            else:
+                chunk_errors.append(_row_error(line, row, next(failures)["error"]))
+
+        # Los errores de formato y de resolución se reportan en el orden del archivo
+        errors.extend(sorted(chunk_errors, key=lambda error: error["line"]))
+        status["rows"] += len(chunk)
+        status["errors"] = len(errors)
+        if progress is not None:
+            progress(status.copy())
+    return errors
+
+
+def _row_error(line: int, row: Dict[str, str], error: str) -> RowError:
+    """Arma el error de una fila."""
+    return {
+        "line": line,
+        "symbol": row.get("symbol", "").upper(),
+        "purchase_date": row.get("purchase_date", ""),
+        "error": error,
+    }
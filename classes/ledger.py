@@ -0,0 +1,430 @@
+"""
+Libro de transacciones: compras y ventas con comisiones y beneficio realizado y no realizado.
+
+Las ventas se asignan a los lotes comprados con el método FIFO (primero los
+lotes más antiguos) o de costo promedio. Las transacciones se recorren una sola
+vez ordenadas por fecha con una cola de lotes por símbolo: cada venta consume
+lotes desde el frente de la cola y cada lote se agota una sola vez, por lo que
+el costo total es lineal en la cantidad de transacciones.
+
+Las comisiones de compra forman parte del costo del lote y las de venta se
+descuentan del importe cobrado.
+"""
+
+import math
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from classes.portfolio import Portfolio
+from classes.stock import Stock
+from models.ledger import LedgerResult, PositionResult
+from utils.market import get_stock_prices
+
+# Tipos de transacción
+BUY = "buy"
+SELL = "sell"
+
+# Métodos de asignación de las ventas a los lotes comprados
+FIFO = "fifo"
+AVERAGE_COST = "average"
+COST_METHODS = (FIFO, AVERAGE_COST)
+
+# Columnas de la tabla de transacciones
+LEDGER_COLUMNS = ["date", "symbol", "side", "quantity", "price", "fee"]
+
+# Columnas de la tabla de ventas con su beneficio realizado
+REALIZED_COLUMNS = ["date", "symbol", "quantity", "proceeds", "cost", "fee", "profit"]
+
+# Cantidad por debajo de la cual un lote se considera agotado
+_EPSILON = 1e-9
+
+
+def _parse_date(value: str) -> datetime:
+    """Convierte una fecha en formato YYYY-MM-DD."""
+    try:
+        return datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        raise ValueError("Las fechas deben estar en formato YYYY-MM-DD")
+
+
+class _Position:
+    """Estado de un símbolo durante el recorrido del libro."""
+
+    __slots__ = ("lots", "quantity", "cost", "realized", "fees")
+
+    def __init__(self) -> None:
+        # Lotes abiertos: [cantidad restante, costo unitario, fecha, precio de compra]
+        self.lots: Deque[List[Any]] = deque()
+        self.quantity = 0.0
+        self.cost = 0.0
+        self.realized = 0.0
+        self.fees = 0.0
+
+    def consume(self, quantity: float) -> float:
+        """Quita una cantidad de los lotes más antiguos y devuelve su costo FIFO."""
+        remaining = quantity
+        cost = 0.0
+        lots = self.lots
+        while remaining > _EPSILON and lots:
+            lot = lots[0]
+            if lot[0] - remaining <= _EPSILON:
+                # El lote se agota y sale de la cola
+                cost += lot[0] * lot[1]
+                remaining -= lot[0]
+                lots.popleft()
+            else:
+                cost += remaining * lot[1]
+                lot[0] -= remaining
+                remaining = 0.0
+        return cost
+
+
+def match_transactions(
+    frame: pd.DataFrame, method: str = FIFO
+) -> Tuple[Dict[str, _Position], pd.DataFrame]:
+    """
+    Asigna las ventas a los lotes comprados recorriendo las transacciones una sola vez.
+
+    Las transacciones se ordenan por fecha; las de una misma fecha conservan
+    el orden en que se registraron.
+
+    Args:
+        frame: Tabla de transacciones con las columnas de LEDGER_COLUMNS y
+            todos los precios resueltos
+        method: Método de asignación, FIFO o AVERAGE_COST
+
+    Returns:
+        tuple: (estado por símbolo, tabla de ventas con REALIZED_COLUMNS)
+
+    Raises:
+        ValueError: Si el método es inválido o una venta supera la cantidad en cartera
+    """
+    if method not in COST_METHODS:
+        raise ValueError(f"Método inválido: {method}. Use {' o '.join(COST_METHODS)}")
+    dates = frame["date"].to_numpy().astype("datetime64[us]")
+    order = np.argsort(dates, kind="stable")
+    columns = [dates[order].tolist()] + [
+        frame[column].to_numpy()[order].tolist() for column in LEDGER_COLUMNS[1:]
+    ]
+    average = method == AVERAGE_COST
+
+    positions: Dict[str, _Position] = {}
+    realized: List[Tuple[datetime, str, float, float, float, float, float]] = []
+    for date, symbol, side, quantity, price, fee in zip(*columns):
+        position = positions.get(symbol)
+        if position is None:
+            position = positions[symbol] = _Position()
+        position.fees += fee
+        if side == BUY:
+            cost = quantity * price + fee
+            position.lots.append([quantity, cost / quantity, date, price])
+            position.quantity += quantity
+            position.cost += cost
+            continue
+
+        if quantity > position.quantity + _EPSILON:
+            raise ValueError(
+                f"La venta de {symbol} del {date:%Y-%m-%d} supera "
+                f"la cantidad en cartera ({position.quantity:g})"
+            )
+        fifo_cost = position.consume(quantity)
+        cost = position.cost * quantity / position.quantity if average else fifo_cost
+        position.quantity -= quantity
+        position.cost -= cost
+        if position.quantity <= _EPSILON:
+            position.quantity = 0.0
+            position.cost = 0.0
+            position.lots.clear()
+        proceeds = quantity * price - fee
+        position.realized += proceeds - cost
+        realized.append((date, symbol, quantity, proceeds, cost, fee, proceeds - cost))
+
+    table = pd.DataFrame(realized, columns=REALIZED_COLUMNS).astype(
+        {"date": "datetime64[ns]", "symbol": object}
+    )
+    return positions, table
+
+
+class Ledger:
+    """Registra compras y ventas y calcula el beneficio realizado y no realizado."""
+
+    def __init__(self) -> None:
+        """Inicializa un libro vacío."""
+        self._dates: List[datetime] = []
+        self._symbols: List[str] = []
+        self._sides: List[str] = []
+        self._quantities: List[float] = []
+        self._prices: List[float] = []
+        self._fees: List[float] = []
+
+    def __len__(self) -> int:
+        """Cantidad de transacciones registradas."""
+        return len(self._dates)
+
+    def record(
+        self,
+        symbol: str,
+        date: str,
+        side: str,
+        quantity: float,
+        price: Optional[float] = None,
+        fee: float = 0.0,
+    ) -> None:
+        """
+        Registra una transacción.
+
+        Args:
+            symbol: Símbolo de la acción (ej: AAPL)
+            date: Fecha de la transacción en formato YYYY-MM-DD
+            side: BUY o SELL
+            quantity: Cantidad de acciones
+            price: Precio por acción. Por defecto, el cierre de la fecha, que
+                se obtiene en lote al calcular el beneficio
+            fee: Comisión pagada
+
+        Raises:
+            ValueError: Si alguno de los datos es inválido
+        """
+        symbol = symbol.strip().upper()
+        side = side.strip().lower()
+        if side not in (BUY, SELL):
+            raise ValueError(f"Tipo de transacción inválido: {side}. Use {BUY} o {SELL}")
+        # NaN no cumple ninguna comparación, por lo que se descarta explícitamente
+        if not math.isfinite(quantity) or quantity <= 0:
+            raise ValueError(f"La cantidad de {symbol} debe ser un número finito mayor a cero")
+        if price is not None and (not math.isfinite(price) or price < 0):
+            raise ValueError(f"El precio de {symbol} debe ser un número finito no negativo")
+        if not math.isfinite(fee) or fee < 0:
+            raise ValueError(f"La comisión de {symbol} debe ser un número finito no negativo")
+        self._dates.append(_parse_date(date))
+        self._symbols.append(symbol)
+        self._sides.append(side)
+        self._quantities.append(float(quantity))
+        self._prices.append(np.nan if price is None else float(price))
+        self._fees.append(float(fee))
+
+    def buy(
+        self,
+        symbol: str,
+        date: str,
+        quantity: float,
+        price: Optional[float] = None,
+        fee: float = 0.0,
+    ) -> None:
+        """Registra una compra (ver record)."""
+        self.record(symbol, date, BUY, quantity, price, fee)
+
+    def sell(
+        self,
+        symbol: str,
+        date: str,
+        quantity: float,
+        price: Optional[float] = None,
+        fee: float = 0.0,
+    ) -> None:
+        """Registra una venta (ver record)."""
+        self.record(symbol, date, SELL, quantity, price, fee)
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Devuelve las transacciones como tabla, en el orden en que se registraron.
+
+        Returns:
+            pd.DataFrame: Una fila por transacción con las columnas de
+                LEDGER_COLUMNS; los precios sin indicar son NaN
+        """
+        frame: pd.DataFrame = pd.DataFrame(
+            {
+                "date": pd.DatetimeIndex(self._dates).as_unit("ns"),
+                "symbol": np.asarray(self._symbols, dtype=object),
+                "side": np.asarray(self._sides, dtype=object),
+                "quantity": np.asarray(self._quantities, dtype=float),
+                "price": np.asarray(self._prices, dtype=float),
+                "fee": np.asarray(self._fees, dtype=float),
+            },
+            columns=LEDGER_COLUMNS,
+        )
+        return frame
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame) -> "Ledger":
+        """
+        Crea un libro a partir de una tabla de transacciones, validándola en bloque.
+
+        Args:
+            frame: Tabla con las columnas date, symbol, side y quantity, y
+                opcionalmente price y fee
+
+        Returns:
+            Ledger: El libro con las transacciones de la tabla
+
+        Raises:
+            ValueError: Si faltan columnas o alguna fila es inválida
+        """
+        missing = [column for column in LEDGER_COLUMNS[:4] if column not in frame.columns]
+        if missing:
+            raise ValueError(f"Faltan columnas en la tabla de transacciones: {missing}")
+        try:
+            dates = pd.to_datetime(frame["date"], format="%Y-%m-%d").dt.normalize()
+        except (ValueError, TypeError):
+            raise ValueError("Las fechas deben estar en formato YYYY-MM-DD")
+        sides = frame["side"].astype(str).str.strip().str.lower()
+        quantities = frame["quantity"].to_numpy(dtype=float)
+        prices = (
+            frame["price"].to_numpy(dtype=float)
+            if "price" in frame
+            else np.full(len(frame), np.nan)
+        )
+        fees = frame["fee"].to_numpy(dtype=float) if "fee" in frame else np.zeros(len(frame))
+        # Un precio vacío (NaN) se resuelve con el cierre del día
+        invalid = (
+            ~sides.isin([BUY, SELL]).to_numpy()
+            | ~(np.isfinite(quantities) & (quantities > 0))
+            | np.isinf(prices)
+            | (prices < 0)
+            | ~(np.isfinite(fees) & (fees >= 0))
+        )
+        if invalid.any():
+            row = int(np.flatnonzero(invalid)[0])
+            raise ValueError(f"Transacción inválida en la fila {row}")
+
+        ledger = cls()
+        ledger._dates = dates.dt.to_pydatetime().tolist()
+        ledger._symbols = frame["symbol"].astype(str).str.strip().str.upper().tolist()
+        ledger._sides = sides.tolist()
+        ledger._quantities = quantities.tolist()
+        ledger._prices = prices.tolist()
+        ledger._fees = fees.tolist()
+        return ledger
+
+    def _resolved_frame(self, end: Optional[datetime] = None) -> pd.DataFrame:
+        """Tabla de transacciones hasta una fecha, con los precios faltantes resueltos en lote."""
+        frame = self.to_frame()
+        if end is not None:
+            frame = frame[frame["date"] <= end]
+        missing = frame["price"].isna().to_numpy()
+        if missing.any():
+            pairs = list(
+                zip(
+                    frame["symbol"].to_numpy()[missing].tolist(),
+                    pd.DatetimeIndex(frame["date"].to_numpy()[missing]).to_pydatetime().tolist(),
+                )
+            )
+            prices = get_stock_prices(pairs)
+            frame = frame.copy()
+            frame.loc[missing, "price"] = [prices[pair] for pair in pairs]
+        return frame
+
+    def realized(self, method: str = FIFO) -> pd.DataFrame:
+        """
+        Calcula el beneficio realizado de cada venta.
+
+        Args:
+            method: Método de asignación de las ventas, FIFO o AVERAGE_COST
+
+        Returns:
+            pd.DataFrame: Una fila por venta, ordenadas por fecha, con las
+                columnas de REALIZED_COLUMNS
+
+        Raises:
+            ValueError: Si el método es inválido, una venta supera la cantidad
+                en cartera o falta algún precio
+        """
+        _, table = match_transactions(self._resolved_frame(), method)
+        return table
+
+    def profit(self, end_date: str, method: str = FIFO) -> LedgerResult:
+        """
+        Calcula el beneficio realizado y no realizado de cada símbolo a una fecha.
+
+        Las transacciones posteriores a la fecha final se ignoran. Las
+        posiciones abiertas se valúan al cierre de la fecha final con una
+        única descarga de precios.
+
+        Args:
+            end_date: Fecha final en formato YYYY-MM-DD
+            method: Método de asignación de las ventas, FIFO o AVERAGE_COST
+
+        Returns:
+            LedgerResult: Diccionario con los resultados por símbolo y totales
+
+        Raises:
+            ValueError: Si la fecha o el método son inválidos, una venta supera
+                la cantidad en cartera o no hay datos disponibles
+        """
+        end = _parse_date(end_date)
+        positions, _ = match_transactions(self._resolved_frame(end), method)
+        open_symbols = [symbol for symbol, position in positions.items() if position.quantity > 0]
+        end_prices = get_stock_prices((symbol, end) for symbol in open_symbols)
+
+        results: List[PositionResult] = []
+        for symbol, position in positions.items():
+            end_price = end_prices.get((symbol, end), 0.0)
+            market_value = position.quantity * end_price
+            results.append(
+                {
+                    "symbol": symbol,
+                    "quantity": position.quantity,
+                    "cost_basis": position.cost,
+                    "average_cost": position.cost / position.quantity if position.quantity else 0.0,
+                    "end_price": end_price,
+                    "market_value": market_value,
+                    "realized_profit": position.realized,
+                    "unrealized_profit": market_value - position.cost,
+                    "fees": position.fees,
+                }
+            )
+        total_realized = sum(result["realized_profit"] for result in results)
+        total_unrealized = sum(result["unrealized_profit"] for result in results)
+        return {
+            "positions": results,
+            "method": method,
+            "total_cost_basis": sum(result["cost_basis"] for result in results),
+            "total_market_value": sum(result["market_value"] for result in results),
+            "total_realized": total_realized,
+            "total_unrealized": total_unrealized,
+            "total_fees": sum(result["fees"] for result in results),
+            "total_profit": total_realized + total_unrealized,
+        }
+
+    def to_portfolio(self, end_date: Optional[str] = None, method: str = FIFO) -> Portfolio:
+        """
+        Crea un portfolio con los lotes que siguen abiertos, sin consultas adicionales.
+
+        Cada lote conserva su fecha de compra y su costo; con AVERAGE_COST el
+        costo unitario de todos los lotes de un símbolo es el costo promedio.
+
+        Args:
+            end_date: Fecha en formato YYYY-MM-DD hasta la cual considerar las
+                transacciones. Por defecto, todas
+            method: Método de asignación de las ventas, FIFO o AVERAGE_COST
+
+        Returns:
+            Portfolio: Portfolio con un lote por compra no vendida por completo
+
+        Raises:
+            ValueError: Si la fecha o el método son inválidos, una venta
+                supera la cantidad en cartera o un lote abierto no tiene costo
+        """
+        end = _parse_date(end_date) if end_date is not None else None
+        positions, _ = match_transactions(self._resolved_frame(end), method)
+        portfolio = Portfolio()
+        for symbol, position in positions.items():
+            average_cost = position.cost / position.quantity if position.quantity else 0.0
+            for quantity, unit_cost, purchase_date, price in position.lots:
+                cost = average_cost if method == AVERAGE_COST else unit_cost
+                portfolio.add_lot(
+                    Stock.from_resolved(
+                        symbol,
+                        f"{purchase_date:%Y-%m-%d}",
+                        purchase_date,
+                        price,
+                        cost,
+                        quantity,
+                    )
+                )
+        return portfolio
@@ -1,16 +1,151 @@
 """Módulo que implementa la clase Portfolio para gestionar colecciones de acciones."""
 
-from typing import List
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple, Union
 
-from classes.stock import Stock
-from models.portfolio import PortfolioResult, StockResult
+import pandas as pd
+
+from classes.risk import DEFAULT_ROLLING_WINDOW, portfolio_risk, portfolio_rolling_risk
+from classes.stock import Stock, resolve_stocks
+from classes.total_return import vectorized_total_return
+from classes.vectorized import (
+    ProfitArrays,
+    check_single_currency,
+    holdings_frame,
+    value_series,
+    vectorized_profit,
+    vectorized_profit_arrays,
+)
+from models.portfolio import HoldingError, PortfolioResult, StockResult, TotalReturnResult
+from models.risk import RiskResult
+from utils.aio import run_limited
+from utils.fx import DEFAULT_CURRENCY
 from utils.market import (
     calculate_annualized_return,
     calculate_years_between,
-    get_stock_price,
+    get_stock_prices,
     validate_dates,
 )
 
+# Tenencia a agregar: (símbolo, fecha de compra), con la cantidad y la moneda
+# opcionales como tercer y cuarto elemento
+HoldingSpec = Union[Tuple[str, str], Tuple[str, str, float], Tuple[str, str, float, str]]
+
+
+def _holding_quantity(item: HoldingSpec) -> float:
+    """Devuelve la cantidad de una tenencia, o 1 si no se indica."""
+    return item[2] if len(item) >= 3 else 1.0
+
+
+def _holding_currency(item: HoldingSpec, default: str) -> str:
+    """Devuelve la moneda de una tenencia, o la indicada por defecto si no la tiene."""
+    return item[3] if len(item) == 4 else default
+
+
+def _purchase_terms(
+    stock: Stock,
+    start: datetime,
+    start_date: str,
+    prices: Mapping[Tuple[str, datetime], float],
+) -> Tuple[datetime, float]:
+    """
+    Obtiene la fecha y el precio de compra de un lote para un período.
+
+    Si la acción fue comprada antes de la fecha de inicio, se usa el precio de
+    la fecha de inicio como precio de compra.
+    """
+    if stock.purchase_date < start:
+        purchase_price = prices[(stock.symbol, start)]
+        print(
+            f"Nota: Para {stock.symbol}, usando precio de {start_date} "
+            f"(${purchase_price:.2f}) como precio de compra"
+        )
+        return start, purchase_price
+    return stock.purchase_date, stock.unit_cost
+
+
+class _Valuation:
+    """Términos por lote y totales acumulados de una valuación del portfolio."""
+
+    def __init__(self, end: datetime, end_prices: Dict[str, float], removals: int) -> None:
+        """
+        Inicializa una valuación vacía.
+
+        Args:
+            end: Fecha final del período
+            end_prices: Precio de cierre final por símbolo
+            removals: Cantidad de lotes quitados del portfolio al iniciarla
+        """
+        self.end = end
+        self.end_prices = end_prices
+        self.removals = removals
+        self.stocks: List[StockResult] = []
+        self.total_investment = 0.0
+        self.total_profit = 0.0
+        self.weighted_years = 0.0
+
+    @property
+    def count(self) -> int:
+        """Cantidad de lotes incluidos."""
+        return len(self.stocks)
+
+    def extends(self, end: datetime, end_prices: Dict[str, float], removals: int) -> bool:
+        """Indica si la valuación sigue vigente y sólo hay que sumarle lotes nuevos."""
+        return (
+            end == self.end
+            and removals == self.removals
+            and all(end_prices.get(symbol) == price for symbol, price in self.end_prices.items())
+        )
+
+    def add(self, stock: Stock, purchase_date: datetime, purchase_price: float) -> None:
+        """Suma los términos de un lote a los totales."""
+        end_price = self.end_prices.get(stock.symbol)
+        if end_price is None:
+            raise ValueError(f"No hay precio final para {stock.symbol}")
+        investment = purchase_price * stock.quantity
+        profit = (end_price - purchase_price) * stock.quantity
+
+        # Calcular retorno anualizado individual
+        years = calculate_years_between(purchase_date, self.end)
+        total_return = profit / investment
+        annualized_return = calculate_annualized_return(total_return, years)
+
+        # Acumular totales
+        self.total_investment += investment
+        self.total_profit += profit
+        self.stocks.append(
+            {
+                "symbol": stock.symbol,
+                "purchase_date": purchase_date,
+                "purchase_price": purchase_price,
+                "quantity": stock.quantity,
+                "end_price": end_price,
+                "profit": profit,
+                "annualized_return": annualized_return,
+            }
+        )
+
+        # Acumular años ponderados por inversión
+        self.weighted_years += years * (investment / self.total_investment)
+
+    def result(self) -> PortfolioResult:
+        """Devuelve el resultado con los totales acumulados."""
+        # Calcular retorno anualizado del portfolio
+        if self.total_investment > 0:
+            total_return = self.total_profit / self.total_investment
+            annualized_return = calculate_annualized_return(total_return, self.weighted_years)
+        else:
+            annualized_return = 0.0
+
+        return {
+            "stocks": [item.copy() for item in self.stocks],
+            "total_investment": self.total_investment,
+            "total_profit": self.total_profit,
+            "annualized_return": annualized_return,
+        }
+
 
 class Portfolio:
     """Gestiona una colección de acciones y calcula métricas del portfolio."""
@@ -18,28 +153,265 @@ class Portfolio:
     def __init__(self) -> None:
         """Inicializa un portfolio vacío."""
         self.stocks: List[Stock] = []
+        # Índice de lotes por símbolo
+        self._lots: Dict[str, List[Stock]] = {}
+        # Estado de la valuación incremental de profit
+        self._terms: Dict[Stock, Tuple[datetime, float]] = {}
+        self._terms_start: Optional[datetime] = None
+        self._valuation: Optional[_Valuation] = None
+        self._removals = 0
+
+    def _register(self, stock: Stock) -> None:
+        """Agrega un lote al portfolio y al índice por símbolo."""
+        self.stocks.append(stock)
+        self._lots.setdefault(stock.symbol, []).append(stock)
+
+    def remove_stock(self, stock: Stock) -> None:
+        """
+        Quita un lote del portfolio.
+
+        Args:
+            stock: Lote a quitar, tal como aparece en stocks o lots
 
-    def add_stock(self, symbol: str, purchase_date: str) -> None:
+        Raises:
+            ValueError: Si el lote no pertenece al portfolio
+        """
+        if not any(item is stock for item in self.stocks):
+            raise ValueError(f"El lote de {stock.symbol} no pertenece al portfolio")
+        self.stocks = [item for item in self.stocks if item is not stock]
+        lots = [item for item in self._lots[stock.symbol] if item is not stock]
+        if lots:
+            self._lots[stock.symbol] = lots
+        else:
+            del self._lots[stock.symbol]
+        self._terms.pop(stock, None)
+        self._removals += 1
+
+    @property
+    def symbols(self) -> List[str]:
+        """Símbolos distintos del portfolio, en orden de incorporación."""
+        return list(self._lots)
+
+    def lots(self, symbol: str) -> List[Stock]:
+        """
+        Devuelve los lotes de un símbolo.
+
+        Args:
+            symbol: Símbolo de la acción (ej: AAPL)
+
+        Returns:
+            List[Stock]: Lotes del símbolo en orden de incorporación
+        """
+        return list(self._lots.get(symbol.upper(), []))
+
+    def add_stock(
+        self,
+        symbol: str,
+        purchase_date: str,
+        quantity: float = 1.0,
+        cost_basis: Optional[float] = None,
+        lazy: bool = False,
+        currency: str = DEFAULT_CURRENCY,
+    ) -> None:
         """
         Agrega una acción al portfolio.
 
         Args:
             symbol: Símbolo de la acción (ej: AAPL)
             purchase_date: Fecha de compra en formato YYYY-MM-DD
+            quantity: Cantidad de acciones del lote
+            cost_basis: Costo total pagado por el lote. Por defecto, el precio de
+                cierre del día de compra por la cantidad
+            lazy: Si es True, la acción se agrega sin consultas y se resuelve con
+                resolve o al calcular el portfolio
+            currency: Moneda en la que cotiza la acción (ej: USD, ARS)
 
         Raises:
             ValueError: Si el símbolo es inválido o no hay datos disponibles
         """
-        stock = Stock(symbol, purchase_date)
-        self.stocks.append(stock)
+        stock = Stock(symbol, purchase_date, quantity, cost_basis, lazy=lazy, currency=currency)
+        self._register(stock)
+
+    def add_lot(self, stock: Stock) -> None:
+        """
+        Agrega al portfolio un lote ya creado, sin consultas.
+
+        Permite reconstruir un portfolio a partir de lotes guardados o creados
+        en lote (por ejemplo, con Stock.from_resolved o con lazy=True).
 
-    def profit(self, start_date: str, end_date: str) -> PortfolioResult:
+        Args:
+            stock: Lote a agregar. No debe pertenecer ya al portfolio
+        """
+        self._register(stock)
+
+    def add_stocks(
+        self,
+        holdings: Iterable[HoldingSpec],
+        max_workers: int = 8,
+        lazy: bool = False,
+        currency: str = DEFAULT_CURRENCY,
+    ) -> List[HoldingError]:
+        """
+        Agrega varias acciones al portfolio validándolas y valuándolas en paralelo.
+
+        Las acciones válidas se agregan todas juntas al final, en el orden recibido,
+        por lo que el portfolio nunca queda con una carga a medias.
+
+        Args:
+            holdings: Tuplas (símbolo, fecha de compra en formato YYYY-MM-DD) con
+                la cantidad y la moneda opcionales como tercer y cuarto elemento
+            max_workers: Cantidad máxima de acciones procesadas en simultáneo
+            lazy: Si es True, las acciones se agregan sin consultas y se
+                resuelven en lote con resolve o al calcular el portfolio
+            currency: Moneda de las tenencias que no la indican (ej: USD, ARS)
+
+        Returns:
+            List[HoldingError]: Errores de las acciones que no se pudieron agregar
+        """
+        items = list(holdings)
+        if lazy:
+            results: List[Tuple[Optional[Stock], Optional[str]]] = []
+            for item in items:
+                try:
+                    stock = Stock(
+                        item[0],
+                        item[1],
+                        _holding_quantity(item),
+                        lazy=True,
+                        currency=_holding_currency(item, currency),
+                    )
+                    results.append((stock, None))
+                except ValueError as e:
+                    results.append((None, str(e)))
+            return self._register_results(items, results)
+
+        def build(item: HoldingSpec) -> Tuple[Optional[Stock], Optional[str]]:
+            try:
+                stock = Stock(
+                    item[0],
+                    item[1],
+                    _holding_quantity(item),
+                    currency=_holding_currency(item, currency),
+                )
+                return stock, None
+            except ValueError as e:
+                return None, str(e)
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            results = list(executor.map(build, items))
+
+        return self._register_results(items, results)
+
+    async def aadd_stocks(
+        self, holdings: Iterable[HoldingSpec], currency: str = DEFAULT_CURRENCY
+    ) -> List[HoldingError]:
+        """
+        Versión asíncrona de add_stocks.
+
+        Las acciones se crean concurrentemente con Stock.acreate, hasta el límite
+        de concurrencia de utils.aio.
+
+        Args:
+            holdings: Tuplas (símbolo, fecha de compra en formato YYYY-MM-DD) con
+                la cantidad y la moneda opcionales como tercer y cuarto elemento
+            currency: Moneda de las tenencias que no la indican (ej: USD, ARS)
+
+        Returns:
+            List[HoldingError]: Errores de las acciones que no se pudieron agregar
+        """
+        items = list(holdings)
+
+        async def build(item: HoldingSpec) -> Tuple[Optional[Stock], Optional[str]]:
+            try:
+                stock = await Stock.acreate(
+                    item[0],
+                    item[1],
+                    _holding_quantity(item),
+                    currency=_holding_currency(item, currency),
+                )
+                return stock, None
+            except ValueError as e:
+                return None, str(e)
+
+        results = await asyncio.gather(*(build(item) for item in items))
+        return self._register_results(items, results)
+
+    def _register_results(
+        self,
+        items: List[HoldingSpec],
+        results: Iterable[Tuple[Optional[Stock], Optional[str]]],
+    ) -> List[HoldingError]:
+        """Agrega las acciones creadas en orden y devuelve los errores."""
+        stocks: List[Stock] = []
+        errors: List[HoldingError] = []
+        for item, (stock, error) in zip(items, results):
+            if stock is not None:
+                stocks.append(stock)
+            else:
+                errors.append({"symbol": item[0], "purchase_date": item[1], "error": error or ""})
+
+        for stock in stocks:
+            self._register(stock)
+        return errors
+
+    def resolve(self, max_workers: int = 8) -> List[HoldingError]:
+        """
+        Resuelve en lote las acciones agregadas con lazy=True.
+
+        Las acciones que no se pudieron resolver se quitan del portfolio.
+
+        Args:
+            max_workers: Cantidad máxima de símbolos validados en simultáneo
+
+        Returns:
+            List[HoldingError]: Errores de las acciones quitadas
+        """
+        errors = resolve_stocks(self.stocks, max_workers)
+        if errors:
+            stocks = [stock for stock in self.stocks if stock.resolved]
+            self.stocks = []
+            self._lots = {}
+            self._removals += 1
+            for stock in stocks:
+                self._register(stock)
+        return errors
+
+    def _ensure_resolved(self) -> None:
+        """
+        Resuelve en lote las acciones pendientes antes de un cálculo.
+
+        Raises:
+            ValueError: Si alguna acción no se pudo resolver
+        """
+        errors = resolve_stocks(self.stocks)
+        if errors:
+            raise ValueError(errors[0]["error"])
+
+    @property
+    def currencies(self) -> List[str]:
+        """Monedas distintas de las acciones del portfolio, en orden de incorporación."""
+        return list(dict.fromkeys(stock.currency for stock in self.stocks))
+
+    def profit(
+        self, start_date: str, end_date: str, currency: Optional[str] = None
+    ) -> PortfolioResult:
         """
         Calcula el beneficio y métricas del portfolio entre dos fechas.
 
+        El cálculo es incremental: el precio de compra de cada lote se guarda
+        mientras no cambie la fecha inicial, y si desde la llamada anterior sólo
+        se agregaron lotes y no cambiaron la fecha ni los precios finales, sólo
+        se suman los términos de los lotes nuevos. En cada llamada únicamente se
+        consultan los precios finales (y los iniciales de los lotes nuevos).
+
+        Si se indica una moneda de reporte, los importes se convierten a ella
+        con el motor vectorizado (ver profit_vectorized).
+
         Args:
             start_date: Fecha inicial en formato YYYY-MM-DD
             end_date: Fecha final en formato YYYY-MM-DD
+            currency: Moneda de reporte. Es obligatoria si el portfolio tiene
+                acciones en más de una moneda
 
         Returns:
             PortfolioResult: Diccionario con los resultados del cálculo:
@@ -49,77 +421,290 @@ class Portfolio:
                 - annualized_return: Retorno anualizado
 
         Raises:
-            ValueError: Si las fechas son inválidas o no hay datos disponibles
+            ValueError: Si las fechas son inválidas, no hay datos disponibles o
+                el portfolio mezcla monedas sin indicar la de reporte
         """
+        if currency is not None:
+            return self.profit_vectorized(start_date, end_date, currency)
         if not self.stocks:
-            return {
-                "stocks": [],
-                "total_investment": 0.0,
-                "total_profit": 0.0,
-                "annualized_return": 0.0,
-            }
+            return _Valuation(datetime.min, {}, 0).result()
+        check_single_currency(self.currencies)
 
-        # Validar fechas
+        # Validar fechas y resolver las acciones pendientes
         start, end = validate_dates(start_date, end_date)
+        self._ensure_resolved()
+
+        # Los precios de compra dependen sólo de la fecha inicial
+        if start != self._terms_start:
+            self._terms = {}
+            self._terms_start = start
+            self._valuation = None
+        pending = [stock for stock in self.stocks if stock not in self._terms]
+
+        # Obtener los precios necesarios con una única descarga: el final de
+        # cada símbolo y el inicial de los lotes nuevos comprados antes
+        requests = [(symbol, end) for symbol in self._lots]
+        requests.extend((stock.symbol, start) for stock in pending if stock.purchase_date < start)
+        prices = get_stock_prices(requests)
+        for stock in pending:
+            self._terms[stock] = _purchase_terms(stock, start, start_date, prices)
+
+        # Se reutilizan los términos acumulados si sólo se agregaron lotes
+        end_prices = {symbol: prices[(symbol, end)] for symbol in self._lots}
+        valuation = self._valuation
+        if valuation is None or not valuation.extends(end, end_prices, self._removals):
+            valuation = _Valuation(end, end_prices, self._removals)
+        valuation.end_prices = end_prices
+        for stock in self.stocks[valuation.count :]:
+            valuation.add(stock, *self._terms[stock])
+        self._valuation = valuation
+        return valuation.result()
+
+    def price_requests(self, start: datetime, end: datetime) -> List[Tuple[str, datetime]]:
+        """
+        Devuelve los pares (símbolo, fecha) cuyo precio se necesita para profit.
+
+        Se pide un precio por símbolo y fecha sin importar la cantidad de lotes.
+
+        Args:
+            start: Fecha inicial del período
+            end: Fecha final del período
 
-        # Calcular beneficios
-        total_investment = 0.0
-        total_profit = 0.0
-        stocks_data: List[StockResult] = []
-        weighted_years = 0.0
+        Returns:
+            List[Tuple[str, datetime]]: El cierre final de cada símbolo, y el de
+                la fecha inicial para los símbolos con lotes comprados antes
+        """
+        requests = []
+        for symbol, lots in self._lots.items():
+            requests.append((symbol, end))
+            if any(stock.purchase_date < start for stock in lots):
+                requests.append((symbol, start))
+        return requests
+
+    def profit_with_prices(
+        self,
+        start_date: str,
+        end_date: str,
+        prices: Mapping[Tuple[str, datetime], float],
+    ) -> PortfolioResult:
+        """
+        Calcula lo mismo que profit con precios ya obtenidos, sin consultas.
+
+        Args:
+            start_date: Fecha inicial en formato YYYY-MM-DD
+            end_date: Fecha final en formato YYYY-MM-DD
+            prices: Precio de cierre de cada par devuelto por price_requests
+
+        Returns:
+            PortfolioResult: Diccionario con los resultados del cálculo
+
+        Raises:
+            ValueError: Si las fechas son inválidas o el portfolio mezcla monedas
+        """
+        if not self.stocks:
+            return _Valuation(datetime.min, {}, 0).result()
+        check_single_currency(self.currencies)
+        start, end = validate_dates(start_date, end_date)
 
+        valuation = _Valuation(end, {symbol: prices[(symbol, end)] for symbol in self._lots}, 0)
         for stock in self.stocks:
-            # Si la acción fue comprada antes de la fecha de inicio,
-            # usar el precio de la fecha de inicio como precio de compra
-            if stock.purchase_date < start:
-                purchase_price = get_stock_price(stock.symbol, start)
-                purchase_date = start
-                print(
-                    f"Nota: Para {stock.symbol}, usando precio de {start_date} "
-                    f"(${purchase_price:.2f}) como precio de compra"
-                )
-            else:
-                purchase_price = stock.purchase_price
-                purchase_date = stock.purchase_date
-
-            # Obtener precio final
-            end_price = get_stock_price(stock.symbol, end)
-            profit = end_price - purchase_price
-
-            # Calcular retorno anualizado individual
-            years = calculate_years_between(purchase_date, end)
-            total_return = profit / purchase_price
-            annualized_return = calculate_annualized_return(total_return, years)
-
-            # Acumular totales
-            total_investment += purchase_price
-            total_profit += profit
-
-            # Guardar resultados
-            stocks_data.append(
-                {
-                    "symbol": stock.symbol,
-                    "purchase_date": purchase_date,
-                    "purchase_price": purchase_price,
-                    "end_price": end_price,
-                    "profit": profit,
-                    "annualized_return": annualized_return,
-                }
-            )
-
-            # Acumular años ponderados por inversión
-            weighted_years += years * (purchase_price / total_investment)
+            valuation.add(stock, *_purchase_terms(stock, start, start_date, prices))
+        return valuation.result()
 
-        # Calcular retorno anualizado del portfolio
-        if total_investment > 0:
-            total_return = total_profit / total_investment
-            annualized_return = calculate_annualized_return(total_return, weighted_years)
-        else:
-            annualized_return = 0.0
+    async def aprofit(
+        self, start_date: str, end_date: str, currency: Optional[str] = None
+    ) -> PortfolioResult:
+        """
+        Versión asíncrona de profit.
 
-        return {
-            "stocks": stocks_data,
-            "total_investment": total_investment,
-            "total_profit": total_profit,
-            "annualized_return": annualized_return,
-        }
+        El cálculo se ejecuta en un hilo respetando el límite de concurrencia de
+        utils.aio, por lo que un mismo proceso puede valuar muchos portfolios a la
+        vez sin bloquear el event loop.
+
+        Args:
+            start_date: Fecha inicial en formato YYYY-MM-DD
+            end_date: Fecha final en formato YYYY-MM-DD
+            currency: Moneda de reporte. Es obligatoria si el portfolio tiene
+                acciones en más de una moneda
+
+        Returns:
+            PortfolioResult: Diccionario con los resultados del cálculo
+
+        Raises:
+            ValueError: Si las fechas son inválidas, no hay datos disponibles o
+                falta la moneda de reporte de un portfolio con varias monedas
+        """
+        return await run_limited(self.profit, start_date, end_date, currency)
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Devuelve las tenencias del portfolio como una tabla columnar.
+
+        Returns:
+            pd.DataFrame: Una fila por lote con las columnas symbol, purchase_date,
+                purchase_price (costo por acción) y quantity
+        """
+        self._ensure_resolved()
+        return holdings_frame(self.stocks)
+
+    def profit_vectorized(
+        self, start_date: str, end_date: str, currency: Optional[str] = None
+    ) -> PortfolioResult:
+        """
+        Calcula lo mismo que profit con el motor vectorizado.
+
+        Pensado para portfolios con decenas de miles de tenencias: los precios se
+        obtienen con un join sobre la tabla de tenencias y las métricas se
+        calculan con operaciones sobre arrays en lugar de un ciclo por acción.
+
+        Args:
+            start_date: Fecha inicial en formato YYYY-MM-DD
+            end_date: Fecha final en formato YYYY-MM-DD
+            currency: Moneda de reporte. Los tipos de cambio se descargan junto
+                con los precios, una serie por par de monedas
+
+        Returns:
+            PortfolioResult: Diccionario con los resultados del cálculo
+
+        Raises:
+            ValueError: Si las fechas son inválidas, no hay datos disponibles o
+                el portfolio mezcla monedas sin indicar la de reporte
+        """
+        return vectorized_profit(self.to_frame(), start_date, end_date, currency)
+
+    def profit_arrays(
+        self, start_date: str, end_date: str, currency: Optional[str] = None
+    ) -> ProfitArrays:
+        """
+        Calcula lo mismo que profit_vectorized y devuelve el resultado en arrays.
+
+        Evita crear un diccionario por tenencia; el resultado ocupa una fracción
+        de la memoria y se convierte a PortfolioResult con to_result.
+
+        Args:
+            start_date: Fecha inicial en formato YYYY-MM-DD
+            end_date: Fecha final en formato YYYY-MM-DD
+            currency: Moneda de reporte (ver profit_vectorized)
+
+        Returns:
+            ProfitArrays: Resultados por tenencia y totales del portfolio
+
+        Raises:
+            ValueError: Si las fechas son inválidas, no hay datos disponibles o
+                el portfolio mezcla monedas sin indicar la de reporte
+        """
+        return vectorized_profit_arrays(self.to_frame(), start_date, end_date, currency)
+
+    def total_return(
+        self, start_date: str, end_date: str, currency: Optional[str] = None
+    ) -> TotalReturnResult:
+        """
+        Calcula el retorno total del portfolio, con los dividendos reinvertidos.
+
+        Los dividendos y splits se obtienen del mismo historial que los precios,
+        sin consultas adicionales. Cada resultado informa la cantidad de acciones
+        al final (con los splits y las acciones compradas con los dividendos) y
+        los dividendos cobrados.
+
+        Args:
+            start_date: Fecha inicial en formato YYYY-MM-DD
+            end_date: Fecha final en formato YYYY-MM-DD
+            currency: Moneda de reporte. Es obligatoria si el portfolio tiene
+                acciones en más de una moneda
+
+        Returns:
+            TotalReturnResult: Diccionario con los resultados del cálculo
+
+        Raises:
+            ValueError: Si las fechas son inválidas, no hay datos disponibles o
+                falta la moneda de reporte de un portfolio con varias monedas
+        """
+        return vectorized_total_return(self.to_frame(), start_date, end_date, currency)
+
+    def value_series(self, start_date: str, end_date: str, freq: str = "D") -> pd.DataFrame:
+        """
+        Calcula el valor y el rendimiento del portfolio para cada fecha de un rango.
+
+        Cada símbolo se descarga una sola vez, por lo que sirve para graficar la
+        evolución del portfolio sin una consulta por fecha.
+
+        Args:
+            start_date: Fecha inicial en formato YYYY-MM-DD
+            end_date: Fecha final en formato YYYY-MM-DD
+            freq: Frecuencia de las fechas, como en pandas (ej: "D", "W-FRI", "ME")
+
+        Returns:
+            pd.DataFrame: Indexado por fecha con las columnas market_value,
+                total_investment, total_profit, total_return y annualized_return
+
+        Raises:
+            ValueError: Si las fechas son inválidas o no hay datos disponibles
+        """
+        return value_series(self.to_frame(), start_date, end_date, freq)
+
+    def risk(
+        self,
+        start_date: str,
+        end_date: str,
+        benchmark: Optional[str] = None,
+        risk_free_rate: float = 0.0,
+        currency: Optional[str] = None,
+    ) -> RiskResult:
+        """
+        Calcula las métricas de riesgo del portfolio entre dos fechas.
+
+        Se calculan a partir de los rendimientos diarios: volatilidad anualizada,
+        caída máxima, ratios de Sharpe y Sortino y, si se indica un benchmark,
+        beta respecto de él. Los historiales ya obtenidos no se vuelven a descargar.
+
+        Args:
+            start_date: Fecha inicial en formato YYYY-MM-DD
+            end_date: Fecha final en formato YYYY-MM-DD
+            benchmark: Símbolo contra el cual calcular beta (ej: SPY)
+            risk_free_rate: Tasa libre de riesgo anual (ej: 0.04 para 4%)
+            currency: Moneda de reporte: el valor de cada día se convierte con
+                el tipo de cambio de ese día. Es obligatoria si el portfolio
+                tiene acciones en más de una moneda
+
+        Returns:
+            RiskResult: Diccionario con las métricas de riesgo
+
+        Raises:
+            ValueError: Si las fechas son inválidas, no hay datos suficientes o
+                falta la moneda de reporte de un portfolio con varias monedas
+        """
+        return portfolio_risk(
+            self.to_frame(), start_date, end_date, benchmark, risk_free_rate, currency
+        )
+
+    def rolling_risk(
+        self,
+        start_date: str,
+        end_date: str,
+        window: int = DEFAULT_ROLLING_WINDOW,
+        benchmark: Optional[str] = None,
+        risk_free_rate: float = 0.0,
+        currency: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """
+        Calcula los rendimientos diarios y las métricas de riesgo en una ventana móvil.
+
+        Args:
+            start_date: Fecha inicial en formato YYYY-MM-DD
+            end_date: Fecha final en formato YYYY-MM-DD
+            window: Cantidad de días de trading de la ventana
+            benchmark: Símbolo contra el cual calcular beta (ej: SPY)
+            risk_free_rate: Tasa libre de riesgo anual
+            currency: Moneda de reporte (ver risk)
+
+        Returns:
+            pd.DataFrame: Indexado por fecha con las columnas returns, drawdown,
+                volatility y sharpe_ratio, y beta si se indicó un benchmark
+
+        Raises:
+            ValueError: Si las fechas son inválidas, no hay datos suficientes o
+                falta la moneda de reporte de un portfolio con varias monedas
+        """
+        return portfolio_rolling_risk(
+            self.to_frame(), start_date, end_date, window, benchmark, risk_free_rate, currency
+        )
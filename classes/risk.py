@@ -0,0 +1,334 @@
+"""
+Métricas de riesgo del portfolio a partir del historial de precios.
+
+Los rendimientos diarios se calculan sobre las cantidades agregadas por
+símbolo (y por moneda, si se convierte a una moneda de reporte), por lo que
+el costo depende de la cantidad de símbolos y de días y no de la cantidad de
+lotes. Los historiales se obtienen con get_stock_histories,
+que reutiliza la memoización y el caché en disco: calcular el riesgo después
+de profit o value_series no vuelve a descargar los mismos datos.
+"""
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from classes.vectorized import PRICE_LOOKBACK, _close_matrix, fx_pairs
+from models.risk import RiskResult
+from utils.market import get_stock_histories, validate_dates
+
+# Días de trading por año, para anualizar las métricas diarias
+TRADING_DAYS_PER_YEAR = 252
+
+# Ventana por defecto de las métricas móviles (aproximadamente un trimestre)
+DEFAULT_ROLLING_WINDOW = 63
+
+
+def _daily_rate(annual_rate: float) -> float:
+    """Convierte una tasa anual en su equivalente diaria."""
+    return float((1 + annual_rate) ** (1 / TRADING_DAYS_PER_YEAR) - 1)
+
+
+def _trading_days(
+    histories: Dict[str, pd.DataFrame], start: pd.Timestamp, end: pd.Timestamp
+) -> pd.DatetimeIndex:
+    """Fechas entre start y end en las que al menos un símbolo tiene barra."""
+    dates = pd.DatetimeIndex([], dtype="datetime64[ns]", name="Date")
+    for history in histories.values():
+        dates = dates.union(pd.DatetimeIndex(history.index).as_unit("ns"))
+    in_range: pd.DatetimeIndex = dates[(dates >= start) & (dates <= end)]
+    return in_range
+
+
+def daily_returns(
+    holdings: pd.DataFrame,
+    start_date: str,
+    end_date: str,
+    benchmark: Optional[str] = None,
+    currency: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Calcula los rendimientos diarios del portfolio y, opcionalmente, de un benchmark.
+
+    El rendimiento de cada día se mide sobre las acciones que se tenían al
+    cierre del día anterior, por lo que las compras no se cuentan como
+    ganancia. Los lotes comprados antes del inicio se consideran desde el
+    inicio. El benchmark y los tipos de cambio se descargan junto con los
+    símbolos del portfolio.
+
+    Args:
+        holdings: Tabla de tenencias (ver holdings_frame)
+        start_date: Fecha inicial en formato YYYY-MM-DD
+        end_date: Fecha final en formato YYYY-MM-DD
+        benchmark: Símbolo contra el cual comparar (ej: SPY)
+        currency: Moneda de reporte: el valor de cada día se convierte con el
+            tipo de cambio de ese día. Es obligatoria si las tenencias están en
+            más de una moneda
+
+    Returns:
+        pd.DataFrame: Indexado por fecha con la columna portfolio y, si se
+            indicó un benchmark, la columna benchmark. Sólo incluye los días en
+            los que el portfolio tenía tenencias
+
+    Raises:
+        ValueError: Si las fechas son inválidas, el portfolio no tiene
+            tenencias en el rango, mezcla monedas sin indicar la de reporte o
+            no hay datos disponibles
+    """
+    start, end = validate_dates(start_date, end_date)
+    pairs_column = fx_pairs(holdings, currency)
+    symbols_column = holdings["symbol"].to_numpy(dtype=object)
+    purchase_dates = pd.DatetimeIndex(holdings["purchase_date"]).as_unit("ns")
+    in_range = purchase_dates <= pd.Timestamp(end)
+    if not in_range.any():
+        raise ValueError("El portfolio no tiene tenencias en el rango de fechas")
+
+    # Las cantidades se agregan por símbolo y serie de tipo de cambio
+    codes, groups = pd.factorize(
+        pd.MultiIndex.from_arrays([symbols_column[in_range], pairs_column[in_range]])
+    )
+    symbols = [str(symbol) for symbol, _ in groups]
+    pairs = [str(pair) for _, pair in groups]
+    traded = list(dict.fromkeys(symbols if benchmark is None else [*symbols, benchmark]))
+    histories = get_stock_histories(
+        list(dict.fromkeys([*traded, *filter(None, pairs)])),
+        start - PRICE_LOOKBACK.to_pytimedelta(),
+        end + pd.Timedelta(days=1),
+    )
+    # Los días de las series de tipo de cambio no cuentan como días de trading
+    dates = _trading_days(
+        {symbol: histories[symbol] for symbol in traded}, pd.Timestamp(start), pd.Timestamp(end)
+    )
+    if len(dates) < 2:
+        raise ValueError("No hay suficientes días de trading en el rango de fechas")
+    closes = _close_matrix(histories, dates)
+
+    # Cantidad de acciones de cada grupo al cierre de cada día
+    positions = dates.searchsorted(purchase_dates[in_range], side="left")
+    added = np.zeros((len(dates) + 1, len(groups)))
+    np.add.at(added, (positions, codes), holdings["quantity"].to_numpy(dtype=float)[in_range])
+    shares = np.cumsum(added[:-1], axis=0)[:-1]
+
+    prices = closes[symbols].to_numpy(dtype=float)
+    if any(pairs):
+        ones = np.ones(len(dates))
+        prices = prices * np.column_stack(
+            [closes[pair].to_numpy(dtype=float) if pair else ones for pair in pairs]
+        )
+    previous, current = prices[:-1], prices[1:]
+    held = shares > 0
+    missing = held & (np.isnan(previous) | np.isnan(current))
+    if missing.any():
+        symbol = symbols[int(np.argwhere(missing)[0][1])]
+        raise ValueError(
+            f"Error al obtener el precio para {symbol}: "
+            f"No se encontraron datos históricos para {symbol}"
+        )
+    previous_value = (shares * np.where(held, previous, 0.0)).sum(axis=1)
+    current_value = (shares * np.where(held, current, 0.0)).sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        portfolio = np.where(previous_value > 0, current_value / previous_value - 1, np.nan)
+
+    returns = pd.DataFrame({"portfolio": portfolio}, index=dates[1:])
+    if benchmark is not None:
+        if closes[benchmark].isna().all():
+            raise ValueError(f"No se encontraron datos históricos para {benchmark}")
+        benchmark_closes = closes[benchmark].to_numpy(dtype=float)
+        returns["benchmark"] = benchmark_closes[1:] / benchmark_closes[:-1] - 1
+    result: pd.DataFrame = returns[returns["portfolio"].notna()]
+    return result
+
+
+def drawdown(returns: pd.Series) -> pd.Series:
+    """
+    Calcula la caída del valor acumulado respecto del máximo anterior.
+
+    Args:
+        returns: Rendimientos diarios
+
+    Returns:
+        pd.Series: Caída de cada día, como fracción negativa (0 en los máximos)
+    """
+    wealth = (1 + returns).cumprod()
+    peak = wealth.cummax().clip(lower=1.0)
+    result: pd.Series = wealth / peak - 1
+    return result
+
+
+def _beta(returns: pd.Series, benchmark_returns: pd.Series) -> float:
+    """Beta de los rendimientos respecto del benchmark."""
+    variance = float(benchmark_returns.var())
+    if not variance > 0:
+        return 0.0
+    return float(returns.cov(benchmark_returns)) / variance
+
+
+def risk_metrics(
+    returns: pd.Series,
+    benchmark_returns: Optional[pd.Series] = None,
+    risk_free_rate: float = 0.0,
+    benchmark: Optional[str] = None,
+) -> RiskResult:
+    """
+    Calcula las métricas de riesgo de una serie de rendimientos diarios.
+
+    La volatilidad y los ratios se anualizan con TRADING_DAYS_PER_YEAR días.
+    Los ratios valen 0 si la volatilidad correspondiente es nula.
+
+    Args:
+        returns: Rendimientos diarios del portfolio
+        benchmark_returns: Rendimientos diarios del benchmark, para calcular beta
+        risk_free_rate: Tasa libre de riesgo anual (ej: 0.04 para 4%)
+        benchmark: Símbolo del benchmark, para identificarlo en el resultado
+
+    Returns:
+        RiskResult: Diccionario con las métricas de riesgo
+
+    Raises:
+        ValueError: Si hay menos de dos rendimientos
+    """
+    returns = returns.dropna()
+    if len(returns) < 2:
+        raise ValueError("Se necesitan al menos dos días de rendimientos")
+
+    excess = returns - _daily_rate(risk_free_rate)
+    mean_excess = float(excess.mean())
+    deviation = float(returns.std())
+    downside = float(np.sqrt((excess.clip(upper=0.0) ** 2).mean()))
+    annualization = float(np.sqrt(TRADING_DAYS_PER_YEAR))
+    growth = float(np.prod(1 + returns.to_numpy(dtype=float)))
+
+    beta: Optional[float] = None
+    if benchmark_returns is not None:
+        aligned = pd.concat([returns, benchmark_returns], axis=1, join="inner").dropna()
+        beta = _beta(aligned.iloc[:, 0], aligned.iloc[:, 1]) if len(aligned) >= 2 else 0.0
+
+    return {
+        "days": len(returns),
+        "total_return": growth - 1,
+        "volatility": deviation * annualization,
+        "max_drawdown": float(drawdown(returns).min()),
+        "sharpe_ratio": mean_excess / deviation * annualization if deviation > 0 else 0.0,
+        "sortino_ratio": mean_excess / downside * annualization if downside > 0 else 0.0,
+        "benchmark": benchmark,
+        "beta": beta,
+    }
+
+
+def rolling_risk(
+    returns: pd.Series,
+    benchmark_returns: Optional[pd.Series] = None,
+    window: int = DEFAULT_ROLLING_WINDOW,
+    risk_free_rate: float = 0.0,
+) -> pd.DataFrame:
+    """
+    Calcula las métricas de riesgo en una ventana móvil.
+
+    Args:
+        returns: Rendimientos diarios del portfolio
+        benchmark_returns: Rendimientos diarios del benchmark, para calcular beta
+        window: Cantidad de días de la ventana
+        risk_free_rate: Tasa libre de riesgo anual
+
+    Returns:
+        pd.DataFrame: Indexado por fecha con las columnas returns, drawdown,
+            volatility y sharpe_ratio, y beta si se indicó un benchmark. Los
+            primeros window - 1 días de las métricas móviles quedan vacíos
+
+    Raises:
+        ValueError: Si la ventana no es mayor a uno
+    """
+    if window < 2:
+        raise ValueError("La ventana debe ser de al menos dos días")
+    annualization = float(np.sqrt(TRADING_DAYS_PER_YEAR))
+    rolling = returns.rolling(window)
+    deviation = rolling.std()
+    excess_mean = rolling.mean() - _daily_rate(risk_free_rate)
+
+    series: pd.DataFrame = pd.DataFrame(
+        {
+            "returns": returns,
+            "drawdown": drawdown(returns),
+            "volatility": deviation * annualization,
+            "sharpe_ratio": (excess_mean / deviation.where(deviation > 0)) * annualization,
+        }
+    )
+    if benchmark_returns is not None:
+        benchmark_returns = benchmark_returns.reindex(returns.index)
+        variance = benchmark_returns.rolling(window).var()
+        covariance = returns.rolling(window).cov(benchmark_returns)
+        series["beta"] = covariance / variance.where(variance > 0)
+    return series
+
+
+def _split_returns(returns: pd.DataFrame) -> Tuple[pd.Series, Optional[pd.Series]]:
+    """Separa los rendimientos del portfolio y del benchmark."""
+    benchmark = returns["benchmark"] if "benchmark" in returns else None
+    return returns["portfolio"], benchmark
+
+
+def portfolio_risk(
+    holdings: pd.DataFrame,
+    start_date: str,
+    end_date: str,
+    benchmark: Optional[str] = None,
+    risk_free_rate: float = 0.0,
+    currency: Optional[str] = None,
+) -> RiskResult:
+    """
+    Calcula las métricas de riesgo de una tabla de tenencias entre dos fechas.
+
+    Args:
+        holdings: Tabla de tenencias (ver holdings_frame)
+        start_date: Fecha inicial en formato YYYY-MM-DD
+        end_date: Fecha final en formato YYYY-MM-DD
+        benchmark: Símbolo contra el cual calcular beta (ej: SPY)
+        risk_free_rate: Tasa libre de riesgo anual
+        currency: Moneda de reporte (ver daily_returns)
+
+    Returns:
+        RiskResult: Diccionario con las métricas de riesgo
+
+    Raises:
+        ValueError: Si las fechas son inválidas, no hay datos suficientes o
+            las tenencias mezclan monedas sin indicar la de reporte
+    """
+    portfolio, benchmark_returns = _split_returns(
+        daily_returns(holdings, start_date, end_date, benchmark, currency)
+    )
+    return risk_metrics(portfolio, benchmark_returns, risk_free_rate, benchmark)
+
+
+def portfolio_rolling_risk(
+    holdings: pd.DataFrame,
+    start_date: str,
+    end_date: str,
+    window: int = DEFAULT_ROLLING_WINDOW,
+    benchmark: Optional[str] = None,
+    risk_free_rate: float = 0.0,
+    currency: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Calcula las métricas de riesgo móviles de una tabla de tenencias.
+
+    Args:
+        holdings: Tabla de tenencias (ver holdings_frame)
+        start_date: Fecha inicial en formato YYYY-MM-DD
+        end_date: Fecha final en formato YYYY-MM-DD
+        window: Cantidad de días de la ventana
+        benchmark: Símbolo contra el cual calcular beta (ej: SPY)
+        risk_free_rate: Tasa libre de riesgo anual
+        currency: Moneda de reporte (ver daily_returns)
+
+    Returns:
+        pd.DataFrame: Ver rolling_risk
+
+    Raises:
+        ValueError: Si las fechas son inválidas, no hay datos suficientes o
+            las tenencias mezclan monedas sin indicar la de reporte
+    """
+    portfolio, benchmark_returns = _split_returns(
+        daily_returns(holdings, start_date, end_date, benchmark, currency)
+    )
+    return rolling_risk(portfolio, benchmark_returns, window, risk_free_rate)
@@ -1,49 +1,243 @@
 """Módulo que implementa la clase Stock para gestionar acciones individuales."""
 
+import math
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, cast
+
 import pandas as pd
 
+from models.portfolio import HoldingError
 from models.stock import StockResult
+from utils.aio import run_limited
+from utils.fx import DEFAULT_CURRENCY, normalize_currency
 from utils.market import (
     calculate_annualized_return,
     calculate_years_between,
-    get_next_trading_day,
     get_stock_price,
+    get_trading_day_price,
+    get_trading_day_prices,
     validate_symbol,
 )
 
 
+def parse_purchase_date(purchase_date: str) -> datetime:
+    """Convierte una fecha de compra en formato YYYY-MM-DD a datetime."""
+    try:
+        return pd.to_datetime(purchase_date).to_pydatetime()
+    except (ValueError, TypeError):
+        raise ValueError(f"Fecha de compra inválida: {purchase_date}")
+
+
+def _validate_lot(symbol: str, quantity: float, cost: Optional[float]) -> None:
+    """
+    Valida la cantidad y el costo de un lote.
+
+    Raises:
+        ValueError: Si la cantidad o el costo no son números finitos mayores a cero
+    """
+    # NaN no cumple ninguna comparación, por lo que se descarta explícitamente
+    if not math.isfinite(quantity) or quantity <= 0:
+        raise ValueError(f"La cantidad de {symbol} debe ser un número finito mayor a cero")
+    # Un costo nulo deja sin base al retorno del lote
+    if cost is not None and (not math.isfinite(cost) or cost <= 0):
+        raise ValueError(f"El costo de {symbol} debe ser un número finito mayor a cero")
+
+
 class Stock:
-    """Representa una acción con su fecha de compra y precio."""
+    """Representa un lote de una acción con su fecha de compra, cantidad y precio."""
 
-    def __init__(self, symbol: str, purchase_date: str) -> None:
+    # Sin __dict__ por instancia: los portfolios grandes tienen cientos de miles de lotes
+    __slots__ = (
+        "symbol",
+        "currency",
+        "quantity",
+        "requested_date",
+        "_cost_basis",
+        "_purchase_date",
+        "_purchase_price",
+        "_unit_cost",
+    )
+
+    def __init__(
+        self,
+        symbol: str,
+        purchase_date: str,
+        quantity: float = 1.0,
+        cost_basis: Optional[float] = None,
+        lazy: bool = False,
+        currency: str = DEFAULT_CURRENCY,
+    ) -> None:
         """
         Inicializa una acción.
 
         Args:
             symbol: Símbolo de la acción (ej: AAPL)
             purchase_date: Fecha de compra en formato YYYY-MM-DD
+            quantity: Cantidad de acciones del lote
+            cost_basis: Costo total pagado por el lote. Por defecto, el precio de
+                cierre del día de compra por la cantidad
+            lazy: Si es True, no se realizan consultas: la validación, el ajuste al
+                día de trading y el precio de compra se resuelven al acceder a
+                ellos o en lote con resolve_stocks
+            currency: Moneda en la que cotiza la acción (ej: USD, ARS); los
+                precios y el costo están expresados en ella
 
         Raises:
-            ValueError: Si el símbolo es inválido o no hay datos disponibles
+            ValueError: Si el símbolo es inválido, no hay datos disponibles o la
+                cantidad, el costo o la moneda son inválidos
         """
-        # Convertimos el símbolo a mayúsculas y validamos
+        _validate_lot(symbol, quantity, cost_basis)
+
         self.symbol = symbol.upper()
+        self.currency = normalize_currency(currency)
+        self.quantity = float(quantity)
+        self.requested_date = purchase_date
+        self._cost_basis = cost_basis
+        self._purchase_date: Optional[datetime] = None
+        self._purchase_price = 0.0
+        self._unit_cost = 0.0
+
+        if not lazy:
+            self.resolve()
+
+    @classmethod
+    def from_resolved(
+        cls,
+        symbol: str,
+        requested_date: str,
+        purchase_date: datetime,
+        purchase_price: float,
+        unit_cost: float,
+        quantity: float,
+        currency: str = DEFAULT_CURRENCY,
+    ) -> "Stock":
+        """
+        Crea una acción ya resuelta a partir de datos guardados, sin consultas.
+
+        Args:
+            symbol: Símbolo de la acción (ej: AAPL)
+            requested_date: Fecha de compra indicada originalmente
+            purchase_date: Día de trading de la compra
+            purchase_price: Precio de cierre del día de compra
+            unit_cost: Costo por acción del lote
+            quantity: Cantidad de acciones del lote
+            currency: Moneda en la que cotiza la acción
+
+        Returns:
+            Stock: La acción resuelta
+
+        Raises:
+            ValueError: Si la cantidad, el costo o la moneda son inválidos
+        """
+        _validate_lot(symbol, quantity, unit_cost)
+
+        # Se evita __init__ para no repetir la preparación de una acción diferida
+        stock = cls.__new__(cls)
+        stock.symbol = symbol.upper()
+        stock.currency = normalize_currency(currency)
+        stock.quantity = float(quantity)
+        stock.requested_date = requested_date
+        stock._cost_basis = unit_cost * quantity
+        stock._purchase_date = purchase_date
+        stock._purchase_price = purchase_price
+        stock._unit_cost = unit_cost
+        return stock
+
+    @property
+    def resolved(self) -> bool:
+        """Indica si ya se validó la acción y se obtuvo su precio de compra."""
+        return self._purchase_date is not None
+
+    def resolve(self) -> None:
+        """
+        Valida el símbolo y obtiene el día de trading y el precio de compra.
+
+        No hace nada si la acción ya fue resuelta.
+
+        Raises:
+            ValueError: Si el símbolo es inválido o no hay datos disponibles
+        """
+        if self.resolved:
+            return
+
+        # Validamos el símbolo y convertimos la fecha de compra
         validate_symbol(self.symbol)
+        requested = parse_purchase_date(self.requested_date)
 
-        # Convertimos la fecha de compra
-        self.purchase_date = pd.to_datetime(purchase_date).to_pydatetime()
+        # Ajustamos la fecha si es necesario y obtenemos el precio de compra
+        # con la misma consulta
+        self._set_purchase(requested, *get_trading_day_price(self.symbol, requested))
 
-        # Ajustamos la fecha si es necesario
-        next_business_day = get_next_trading_day(self.symbol, self.purchase_date)
-        if next_business_day != self.purchase_date:
+    def _set_purchase(self, requested: datetime, trading_day: datetime, price: float) -> None:
+        """Registra el día de trading y el precio de compra obtenidos."""
+        if trading_day != requested:
             print(
-                f"Nota: La compra de {self.symbol} se ejecutará el {next_business_day} "
-                f"(siguiente día hábil después de {self.purchase_date})"
+                f"Nota: La compra de {self.symbol} se ejecutará el {trading_day} "
+                f"(siguiente día hábil después de {requested})"
             )
-            self.purchase_date = next_business_day
+        self._purchase_date = trading_day
+        self._purchase_price = price
 
-        # Obtenemos el precio de compra
-        self.purchase_price = get_stock_price(self.symbol, self.purchase_date)
+        # Costo por acción: el pagado si se indicó, si no el precio de cierre
+        cost_basis = self._cost_basis
+        self._unit_cost = price if cost_basis is None else cost_basis / self.quantity
+
+    @property
+    def purchase_date(self) -> datetime:
+        """Día de trading de la compra."""
+        self.resolve()
+        return cast(datetime, self._purchase_date)
+
+    @property
+    def purchase_price(self) -> float:
+        """Precio de cierre del día de compra."""
+        self.resolve()
+        return self._purchase_price
+
+    @property
+    def unit_cost(self) -> float:
+        """Costo por acción del lote."""
+        self.resolve()
+        return self._unit_cost
+
+    @classmethod
+    async def acreate(
+        cls,
+        symbol: str,
+        purchase_date: str,
+        quantity: float = 1.0,
+        cost_basis: Optional[float] = None,
+        currency: str = DEFAULT_CURRENCY,
+    ) -> "Stock":
+        """
+        Crea una acción sin bloquear el event loop.
+
+        La validación y la consulta del precio de compra se ejecutan en un hilo
+        respetando el límite de concurrencia de utils.aio.
+
+        Args:
+            symbol: Símbolo de la acción (ej: AAPL)
+            purchase_date: Fecha de compra en formato YYYY-MM-DD
+            quantity: Cantidad de acciones del lote
+            cost_basis: Costo total pagado por el lote
+            currency: Moneda en la que cotiza la acción (ej: USD, ARS)
+
+        Returns:
+            Stock: La acción creada
+
+        Raises:
+            ValueError: Si el símbolo es inválido, no hay datos disponibles o la
+                cantidad, el costo o la moneda son inválidos
+        """
+        return await run_limited(
+            cls, symbol, purchase_date, quantity, cost_basis, currency=currency
+        )
+
+    @property
+    def cost_basis(self) -> float:
+        """Costo total del lote."""
+        return self.unit_cost * self.quantity
 
     def calculate_profit(self, end_date: str) -> StockResult:
         """
@@ -57,18 +251,92 @@ class Stock:
         """
         end_datetime = pd.to_datetime(end_date).to_pydatetime()
         end_price = get_stock_price(self.symbol, end_datetime)
-        profit = end_price - self.purchase_price
+        profit = (end_price - self.unit_cost) * self.quantity
 
         # Calcular retorno anualizado
         years = calculate_years_between(self.purchase_date, end_datetime)
-        total_return = profit / self.purchase_price
+        total_return = profit / self.cost_basis
         annualized_return = calculate_annualized_return(total_return, years)
 
         return {
             "symbol": self.symbol,
             "purchase_date": self.purchase_date,
-            "purchase_price": self.purchase_price,
+            "purchase_price": self.unit_cost,
+            "quantity": self.quantity,
             "end_price": end_price,
             "profit": profit,
             "annualized_return": annualized_return,
         }
+
+
+def resolve_stocks(stocks: Iterable[Stock], max_workers: int = 8) -> List[HoldingError]:
+    """
+    Resuelve en lote las acciones creadas con lazy=True.
+
+    Cada símbolo distinto se valida una sola vez, en paralelo, y los días de
+    trading y precios de compra de todas las acciones se obtienen con una única
+    descarga. Las acciones que no se pudieron resolver quedan sin resolver.
+
+    Args:
+        stocks: Acciones a resolver; las ya resueltas se ignoran
+        max_workers: Cantidad máxima de símbolos validados en simultáneo
+
+    Returns:
+        List[HoldingError]: Errores de las acciones que no se pudieron resolver
+    """
+    pending = [stock for stock in stocks if not stock.resolved]
+    failures: Dict[int, str] = {}
+
+    requested: Dict[int, datetime] = {}
+    for position, stock in enumerate(pending):
+        try:
+            requested[position] = parse_purchase_date(stock.requested_date)
+        except ValueError as e:
+            failures[position] = str(e)
+
+    def check(symbol: str) -> Optional[str]:
+        try:
+            validate_symbol(symbol)
+            return None
+        except ValueError as e:
+            return str(e)
+
+    symbols = list(dict.fromkeys(pending[position].symbol for position in requested))
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        invalid = {
+            symbol: error
+            for symbol, error in zip(symbols, executor.map(check, symbols))
+            if error is not None
+        }
+    for position in list(requested):
+        error = invalid.get(pending[position].symbol)
+        if error is not None:
+            failures[position] = error
+            del requested[position]
+
+    try:
+        trading_days = get_trading_day_prices(
+            (pending[position].symbol, day) for position, day in requested.items()
+        )
+    except ValueError as e:
+        trading_days = {}
+        for position in requested:
+            failures[position] = str(e)
+
+    for position, day in requested.items():
+        stock = pending[position]
+        if (stock.symbol, day) in trading_days:
+            stock._set_purchase(day, *trading_days[(stock.symbol, day)])
+        elif position not in failures:
+            failures[position] = (
+                f"No se encontró día de trading después de {day} para {stock.symbol}"
+            )
+
+    return [
+        {
+            "symbol": pending[position].symbol,
+            "purchase_date": pending[position].requested_date,
+            "error": failures[position],
+        }
+        for position in sorted(failures)
+    ]
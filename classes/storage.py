@@ -0,0 +1,302 @@
+"""
+Guardado y carga de tenencias y resultados en formato columnar (Parquet / Arrow).
+
+Las tenencias se guardan ya resueltas (día de trading, precio y costo de
+compra), por lo que cargarlas no requiere validaciones ni consultas de precios.
+El formato se elige por la extensión del archivo: `.parquet` para Parquet y
+`.arrow` o `.feather` para Arrow IPC sin compresión, que se lee con memory-map
+sin copiar los datos.
+
+Requiere pyarrow, que se instala con el extra `parquet`:
+    pip install "stocks-portfolio[parquet]"
+"""
+
+import json
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Dict, List, Tuple, cast
+
+import pandas as pd
+
+from classes.portfolio import Portfolio
+from classes.stock import Stock
+from models.portfolio import PortfolioResult, StockResult
+from utils.fx import DEFAULT_CURRENCY
+
+# Columnas de la tabla de tenencias guardada
+SAVED_HOLDINGS_COLUMNS = [
+    "symbol",
+    "requested_date",
+    "purchase_date",
+    "purchase_price",
+    "unit_cost",
+    "quantity",
+    "currency",
+]
+
+# Columnas que pueden faltar en archivos guardados con versiones anteriores
+OPTIONAL_HOLDINGS_COLUMNS = ["currency"]
+
+# Columnas de la tabla de resultados por acción
+RESULT_COLUMNS = list(StockResult.__annotations__)
+
+# Clave de los metadatos del esquema con los totales del resultado
+TOTALS_METADATA_KEY = b"stocks_portfolio.totals"
+
+_PARQUET_SUFFIXES = {".parquet", ".pq"}
+_ARROW_SUFFIXES = {".arrow", ".feather", ".ipc"}
+
+
+def _pyarrow() -> Tuple[ModuleType, ModuleType]:
+    """
+    Importa pyarrow, que es una dependencia opcional.
+
+    Raises:
+        ImportError: Si pyarrow no está instalado
+    """
+    try:
+        import pyarrow as pa  # type: ignore
+        import pyarrow.parquet as pq  # type: ignore
+    except ImportError:
+        raise ImportError(
+            "Se requiere pyarrow para guardar y cargar archivos Parquet/Arrow: "
+            'pip install "stocks-portfolio[parquet]"'
+        )
+    return pa, pq
+
+
+def _file_format(path: Path) -> str:
+    """
+    Determina el formato del archivo a partir de su extensión.
+
+    Raises:
+        ValueError: Si la extensión no corresponde a Parquet ni a Arrow
+    """
+    suffix = path.suffix.lower()
+    if suffix in _PARQUET_SUFFIXES:
+        return "parquet"
+    if suffix in _ARROW_SUFFIXES:
+        return "arrow"
+    raise ValueError(f"Extensión no soportada: {path.suffix} (use .parquet, .arrow o .feather)")
+
+
+def write_table(table: Any, path: str | Path) -> None:
+    """
+    Escribe una tabla de pyarrow en Parquet o Arrow IPC según la extensión.
+
+    Args:
+        table: Tabla de pyarrow a escribir
+        path: Ruta del archivo (.parquet, .arrow o .feather)
+    """
+    pa, pq = _pyarrow()
+    path = Path(path)
+    if _file_format(path) == "parquet":
+        pq.write_table(table, path)
+        return
+    with pa.OSFile(str(path), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def read_table(path: str | Path) -> Any:
+    """
+    Lee una tabla de pyarrow con memory-map.
+
+    Los archivos Arrow IPC se leen sin copiar los datos, por lo que la tabla
+    puede entregarse a otras herramientas de análisis sin costo adicional.
+
+    Args:
+        path: Ruta del archivo (.parquet, .arrow o .feather)
+
+    Returns:
+        pyarrow.Table: La tabla leída
+    """
+    pa, pq = _pyarrow()
+    path = Path(path)
+    if _file_format(path) == "parquet":
+        return pq.read_table(path, memory_map=True)
+    return pa.ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+
+
+def holdings_table(portfolio: Portfolio) -> Any:
+    """
+    Construye la tabla de pyarrow con las tenencias de un portfolio.
+
+    Las acciones diferidas que todavía no se resolvieron se guardan sin día ni
+    precio de compra, y vuelven a quedar diferidas al cargarlas.
+
+    Args:
+        portfolio: Portfolio a convertir
+
+    Returns:
+        pyarrow.Table: Una fila por lote con las columnas SAVED_HOLDINGS_COLUMNS
+    """
+    pa, _ = _pyarrow()
+    stocks = portfolio.stocks
+    resolved = [stock.resolved for stock in stocks]
+    return pa.table(
+        {
+            "symbol": pa.array([stock.symbol for stock in stocks], pa.string()),
+            "requested_date": pa.array([stock.requested_date for stock in stocks], pa.string()),
+            "purchase_date": pa.array(
+                [stock.purchase_date if done else None for stock, done in zip(stocks, resolved)],
+                pa.timestamp("us"),
+            ),
+            "purchase_price": pa.array(
+                [stock.purchase_price if done else None for stock, done in zip(stocks, resolved)],
+                pa.float64(),
+            ),
+            "unit_cost": pa.array(
+                [stock.unit_cost if done else None for stock, done in zip(stocks, resolved)],
+                pa.float64(),
+            ),
+            "quantity": pa.array([stock.quantity for stock in stocks], pa.float64()),
+            "currency": pa.array([stock.currency for stock in stocks], pa.string()),
+        }
+    )
+
+
+def save_portfolio(portfolio: Portfolio, path: str | Path) -> None:
+    """
+    Guarda las tenencias de un portfolio.
+
+    Args:
+        portfolio: Portfolio a guardar
+        path: Ruta del archivo (.parquet, .arrow o .feather)
+    """
+    write_table(holdings_table(portfolio), path)
+
+
+def load_portfolio(path: str | Path) -> Portfolio:
+    """
+    Carga un portfolio guardado con save_portfolio, sin consultas de precios.
+
+    Args:
+        path: Ruta del archivo (.parquet, .arrow o .feather)
+
+    Returns:
+        Portfolio: Portfolio con los lotes en el orden en que se guardaron
+
+    Raises:
+        ValueError: Si al archivo le faltan columnas o tiene datos inválidos
+    """
+    table = read_table(path)
+    missing = [
+        column
+        for column in SAVED_HOLDINGS_COLUMNS
+        if column not in table.column_names and column not in OPTIONAL_HOLDINGS_COLUMNS
+    ]
+    if missing:
+        raise ValueError(f"Faltan columnas en {path}: {', '.join(missing)}")
+
+    columns = [column for column in SAVED_HOLDINGS_COLUMNS if column in table.column_names]
+    frame: pd.DataFrame = table.select(columns).to_pandas()
+    if "currency" not in frame:
+        frame["currency"] = DEFAULT_CURRENCY
+    resolved = (frame["purchase_date"].notna() & frame["purchase_price"].notna()).tolist()
+    rows = zip(
+        resolved,
+        frame["symbol"].tolist(),
+        frame["requested_date"].tolist(),
+        pd.DatetimeIndex(frame["purchase_date"]).to_pydatetime(),
+        frame["purchase_price"].tolist(),
+        frame["unit_cost"].tolist(),
+        frame["quantity"].tolist(),
+        frame["currency"].fillna(DEFAULT_CURRENCY).tolist(),
+    )
+    portfolio = Portfolio()
+    for (
+        done,
+        symbol,
+        requested_date,
+        purchase_date,
+        purchase_price,
+        unit_cost,
+        quantity,
+        currency,
+    ) in rows:
+        if done:
+            stock = Stock.from_resolved(
+                symbol, requested_date, purchase_date, purchase_price, unit_cost, quantity, currency
+            )
+        else:
+            stock = Stock(symbol, requested_date, quantity, lazy=True, currency=currency)
+        portfolio.add_lot(stock)
+    return portfolio
+
+
+def result_table(result: PortfolioResult) -> Any:
+    """
+    Construye la tabla de pyarrow de un resultado de valuación.
+
+    Los totales del portfolio se guardan como metadatos del esquema.
+
+    Args:
+        result: Resultado de Portfolio.profit o profit_vectorized
+
+    Returns:
+        pyarrow.Table: Una fila por acción con las columnas de StockResult
+    """
+    pa, _ = _pyarrow()
+    stocks = [cast(Dict[str, Any], item) for item in result["stocks"]]
+    columns = {column: [item[column] for item in stocks] for column in RESULT_COLUMNS}
+    table = pa.table(
+        {
+            "symbol": pa.array(columns["symbol"], pa.string()),
+            "purchase_date": pa.array(columns["purchase_date"], pa.timestamp("us")),
+            **{
+                column: pa.array(columns[column], pa.float64())
+                for column in RESULT_COLUMNS
+                if column not in ("symbol", "purchase_date")
+            },
+        }
+    )
+    totals = {
+        "total_investment": result["total_investment"],
+        "total_profit": result["total_profit"],
+        "annualized_return": result["annualized_return"],
+    }
+    return table.replace_schema_metadata({TOTALS_METADATA_KEY: json.dumps(totals).encode()})
+
+
+def save_result(result: PortfolioResult, path: str | Path) -> None:
+    """
+    Guarda un resultado de valuación.
+
+    Args:
+        result: Resultado de Portfolio.profit o profit_vectorized
+        path: Ruta del archivo (.parquet, .arrow o .feather)
+    """
+    write_table(result_table(result), path)
+
+
+def load_result(path: str | Path) -> PortfolioResult:
+    """
+    Carga un resultado guardado con save_result.
+
+    Args:
+        path: Ruta del archivo (.parquet, .arrow o .feather)
+
+    Returns:
+        PortfolioResult: El resultado guardado
+
+    Raises:
+        ValueError: Si el archivo no contiene los totales del resultado
+    """
+    table = read_table(path)
+    metadata = table.schema.metadata or {}
+    if TOTALS_METADATA_KEY not in metadata:
+        raise ValueError(f"{path} no contiene un resultado de valuación")
+    totals = json.loads(metadata[TOTALS_METADATA_KEY])
+
+    frame: pd.DataFrame = table.select(RESULT_COLUMNS).to_pandas()
+    stocks: List[StockResult] = []
+    for record in frame.to_dict("records"):
+        record["purchase_date"] = pd.Timestamp(record["purchase_date"]).to_pydatetime()
+        stocks.append(cast(StockResult, record))
+    return {
+        "stocks": stocks,
+        "total_investment": cast(float, totals["total_investment"]),
+        "total_profit": cast(float, totals["total_profit"]),
+        "annualized_return": cast(float, totals["annualized_return"]),
+    }
@@ -0,0 +1,224 @@
+"""
+Valuación con retorno total: dividendos reinvertidos y cantidades ajustadas por splits.
+
+Los dividendos y splits provienen de las columnas Dividends y Stock Splits del
+mismo historial que se usa para los precios, por lo que no se hacen consultas
+adicionales, y se guardan junto a las barras en el caché en disco.
+
+Los precios del proveedor están ajustados por splits pero no por dividendos
+(YFinanceProvider los pide con auto_adjust=False), y cada dividendo se
+reinvierte una sola vez, al cierre de su fecha ex-dividendo, por lo que las
+acciones compradas ese mismo día no lo cobran. Con cierres ajustados por
+dividendos, éstos se contarían dos veces.
+
+La cantidad y el costo de un lote son los de la fecha de compra. Un split
+posterior multiplica las acciones del lote, y el valor final es esa cantidad
+de acciones por el cierre final. Los lotes valuados desde un cierre del
+proveedor (sin costo indicado o comprados antes del inicio) convierten ese
+cierre, ajustado por los splits posteriores, al precio por acción de la fecha.
+"""
+
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from classes.vectorized import (
+    PRICE_LOOKBACK,
+    annualize,
+    asof_prices,
+    fx_pairs,
+    fx_rates,
+    vectorized_profit_arrays,
+)
+from models.portfolio import TotalReturnResult
+from models.stock import TotalReturnStockResult
+from utils.market import get_stock_histories, validate_dates
+
+# Columnas acumuladas por símbolo y fecha
+_FACTOR_COLUMNS = ["reinvested", "splits", "income"]
+
+
+def _action_table(histories: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    Acumula los eventos corporativos de cada símbolo en una tabla larga ordenada por fecha.
+
+    Para cada fecha t se guardan el factor de reinversión de dividendos y el de
+    splits acumulados hasta t, y los dividendos cobrados hasta t por unidad del
+    factor de reinversión. Dividiendo los valores de dos fechas se obtiene el
+    efecto de los eventos ocurridos entre ellas.
+    """
+    parts = []
+    for symbol, history in histories.items():
+        if history.empty:
+            continue
+        closes = history["Close"].to_numpy(dtype=float)
+        dividends = np.nan_to_num(
+            history.get("Dividends", pd.Series(0.0, index=history.index)).to_numpy(dtype=float)
+        )
+        ratios = np.nan_to_num(
+            history.get("Stock Splits", pd.Series(0.0, index=history.index)).to_numpy(dtype=float)
+        )
+        multipliers = 1 + dividends / closes
+        reinvested = np.cumprod(multipliers)
+        parts.append(
+            pd.DataFrame(
+                {
+                    "symbol": symbol,
+                    "date": pd.DatetimeIndex(history.index).as_unit("ns"),
+                    "reinvested": reinvested,
+                    "splits": np.cumprod(np.where(ratios > 0, ratios, 1.0)),
+                    "income": np.cumsum(reinvested / multipliers * dividends),
+                }
+            )
+        )
+    if not parts:
+        empty: pd.DataFrame = pd.DataFrame(columns=["symbol", "date", *_FACTOR_COLUMNS]).astype(
+            {"date": "datetime64[ns]", **dict.fromkeys(_FACTOR_COLUMNS, float)}
+        )
+        return empty
+    table: pd.DataFrame = pd.concat(parts, ignore_index=True).sort_values("date")
+    return table
+
+
+def _asof_factors(table: pd.DataFrame, symbols: np.ndarray, dates: np.ndarray) -> pd.DataFrame:
+    """Obtiene los factores acumulados de cada par (símbolo, fecha) con un único join."""
+    query = pd.DataFrame(
+        {
+            "symbol": symbols,
+            "date": pd.DatetimeIndex(dates).as_unit("ns"),
+            "order": np.arange(len(symbols)),
+        }
+    ).sort_values("date")
+    merged: pd.DataFrame = pd.merge_asof(
+        query, table, on="date", by="symbol", direction="backward", tolerance=PRICE_LOOKBACK
+    ).sort_values("order")
+    return merged
+
+
+def vectorized_total_return(
+    holdings: pd.DataFrame, start_date: str, end_date: str, currency: Optional[str] = None
+) -> TotalReturnResult:
+    """
+    Calcula el retorno total de una tabla de tenencias entre dos fechas.
+
+    Usa las mismas reglas que vectorized_profit (las tenencias compradas antes
+    del inicio se valúan desde la fecha de inicio) y el mismo historial, que
+    se obtiene una sola vez. Con una moneda de reporte, los importes se
+    convierten como en vectorized_profit_arrays y los dividendos con el tipo
+    de cambio de la fecha final.
+
+    Args:
+        holdings: Tabla de tenencias (ver holdings_frame)
+        start_date: Fecha inicial en formato YYYY-MM-DD
+        end_date: Fecha final en formato YYYY-MM-DD
+        currency: Moneda de reporte. Es obligatoria si las tenencias están en
+            más de una moneda
+
+    Returns:
+        TotalReturnResult: Diccionario con los resultados del cálculo
+
+    Raises:
+        ValueError: Si las fechas son inválidas, no hay datos disponibles o
+            las tenencias mezclan monedas sin indicar la de reporte
+    """
+    arrays = vectorized_profit_arrays(holdings, start_date, end_date, currency)
+    if not len(arrays):
+        return {
+            "stocks": [],
+            "total_investment": 0.0,
+            "total_dividends": 0.0,
+            "total_value": 0.0,
+            "total_profit": 0.0,
+            "annualized_return": 0.0,
+        }
+
+    start, end = validate_dates(start_date, end_date)
+    end64 = np.datetime64(end, "ns")
+    symbols = arrays.symbols
+    pairs = fx_pairs(holdings, currency)
+
+    # Los mismos símbolos y rango que vectorized_profit_arrays, servidos desde
+    # la memoización
+    histories = get_stock_histories(
+        [*symbols.tolist(), *dict.fromkeys(pairs[pairs != ""])],
+        start - PRICE_LOOKBACK.to_pytimedelta(),
+        end + pd.Timedelta(days=1),
+    )
+    table = _action_table({symbol: histories[symbol] for symbol in symbols.tolist()})
+    base = _asof_factors(table, symbols, arrays.purchase_dates)
+    final = _asof_factors(table, symbols, np.full(len(arrays), end64))
+
+    base_reinvested = base["reinvested"].to_numpy()
+    reinvested = final["reinvested"].to_numpy() / base_reinvested
+    splits = final["splits"].to_numpy() / base["splits"].to_numpy()
+    income = (final["income"].to_numpy() - base["income"].to_numpy()) / base_reinvested
+
+    # Los precios valuados desde un cierre del proveedor pasan a la base de
+    # acciones de la fecha de compra, igual que los costos indicados
+    quantities = arrays.quantities
+    base_rates = fx_rates(histories, pairs, arrays.purchase_dates)
+    closes = asof_prices(histories, symbols, arrays.purchase_dates) * base_rates
+    from_closes = np.isclose(arrays.purchase_prices, closes, rtol=1e-12, atol=0.0)
+    purchase_prices = np.where(from_closes, arrays.purchase_prices * splits, arrays.purchase_prices)
+    shares = quantities * splits * reinvested
+    investments = purchase_prices * quantities
+    end_values = shares * arrays.end_prices
+    profits = end_values - investments
+    annualized_returns, total_investment, total_profit, annualized_return = annualize(
+        investments, profits, arrays.purchase_dates, end64
+    )
+    dividends = (
+        income * quantities * splits * fx_rates(histories, pairs, np.full(len(pairs), end64))
+    )
+
+    purchase_dates: List[datetime] = (
+        pd.DatetimeIndex(arrays.purchase_dates).to_pydatetime().tolist()
+    )
+    columns = zip(
+        arrays.symbols.tolist(),
+        purchase_dates,
+        purchase_prices.tolist(),
+        quantities.tolist(),
+        shares.tolist(),
+        dividends.tolist(),
+        arrays.end_prices.tolist(),
+        end_values.tolist(),
+        profits.tolist(),
+        annualized_returns.tolist(),
+    )
+    stocks: List[TotalReturnStockResult] = [
+        {
+            "symbol": symbol,
+            "purchase_date": purchase_date,
+            "purchase_price": purchase_price,
+            "quantity": quantity,
+            "shares": shares,
+            "dividends": dividend,
+            "end_price": end_price,
+            "end_value": end_value,
+            "profit": profit,
+            "annualized_return": annualized,
+        }
+        for (
+            symbol,
+            purchase_date,
+            purchase_price,
+            quantity,
+            shares,
+            dividend,
+            end_price,
+            end_value,
+            profit,
+            annualized,
+        ) in columns
+    ]
+    return {
+        "stocks": stocks,
+        "total_investment": total_investment,
+        "total_dividends": float(dividends.sum()),
+        "total_value": float(end_values.sum()),
+        "total_profit": total_profit,
+        "annualized_return": annualized_return,
+    }
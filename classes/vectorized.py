@@ -0,0 +1,690 @@
+"""Motor vectorizado para valuar portfolios con una tabla columnar de tenencias."""
+
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from classes.stock import Stock
+from models.portfolio import PortfolioResult, StockResult
+from utils.fx import DEFAULT_CURRENCY, fx_symbols
+from utils.market import PRICE_LOOKBACK_DAYS, get_stock_histories, validate_dates
+
+# Columnas de la tabla de tenencias
+HOLDINGS_COLUMNS = ["symbol", "purchase_date", "purchase_price", "quantity", "currency"]
+
+# Días hacia atrás en los que se busca el último cierre si no hay barra en la fecha
+PRICE_LOOKBACK = pd.Timedelta(days=PRICE_LOOKBACK_DAYS)
+
+
+def holdings_frame(stocks: Sequence[Stock]) -> pd.DataFrame:
+    """
+    Construye la tabla columnar de tenencias a partir de una lista de acciones.
+
+    Args:
+        stocks: Lotes del portfolio
+
+    Returns:
+        pd.DataFrame: Una fila por lote con las columnas symbol, purchase_date,
+            purchase_price (costo por acción), quantity y currency
+    """
+    frame: pd.DataFrame = pd.DataFrame(
+        {
+            "symbol": pd.Series([stock.symbol for stock in stocks], dtype=object),
+            "purchase_date": pd.to_datetime([stock.purchase_date for stock in stocks]),
+            "purchase_price": np.array([stock.unit_cost for stock in stocks], dtype=float),
+            "quantity": np.array([stock.quantity for stock in stocks], dtype=float),
+            "currency": pd.Series([stock.currency for stock in stocks], dtype=object),
+        },
+        columns=HOLDINGS_COLUMNS,
+    )
+    return frame
+
+
+def holdings_from_records(records: Sequence[Tuple[str, str, float, float, str]]) -> pd.DataFrame:
+    """
+    Construye la tabla de tenencias a partir de registros planos.
+
+    Permite valuar tenencias ya resueltas (por ejemplo, guardadas o usadas como
+    clave de caché) sin volver a crear los objetos Stock.
+
+    Args:
+        records: Tuplas (símbolo, fecha de compra YYYY-MM-DD, costo por acción,
+            cantidad, moneda)
+
+    Returns:
+        pd.DataFrame: Tabla de tenencias con las columnas de holdings_frame
+    """
+    frame: pd.DataFrame = pd.DataFrame(
+        {
+            "symbol": pd.Series([record[0] for record in records], dtype=object),
+            "purchase_date": pd.to_datetime([record[1] for record in records]),
+            "purchase_price": np.array([record[2] for record in records], dtype=float),
+            "quantity": np.array([record[3] for record in records], dtype=float),
+            "currency": pd.Series([record[4] for record in records], dtype=object),
+        },
+        columns=HOLDINGS_COLUMNS,
+    )
+    return frame
+
+
+def _close_table(histories: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """Une los historiales en una tabla larga (symbol, date, close) ordenada por fecha."""
+    parts = [
+        pd.DataFrame(
+            {
+                "symbol": symbol,
+                "date": pd.DatetimeIndex(history.index).as_unit("ns"),
+                "close": history["Close"].to_numpy(dtype=float),
+            }
+        )
+        for symbol, history in histories.items()
+        if not history.empty
+    ]
+    if not parts:
+        empty: pd.DataFrame = pd.DataFrame(
+            {
+                "symbol": pd.Series(dtype=object),
+                "date": pd.Series(dtype="datetime64[ns]"),
+                "close": pd.Series(dtype=float),
+            }
+        )
+        return empty
+    table: pd.DataFrame = pd.concat(parts, ignore_index=True).sort_values("date")
+    return table
+
+
+def asof_prices(
+    histories: Dict[str, pd.DataFrame], symbols: np.ndarray, dates: np.ndarray
+) -> np.ndarray:
+    """
+    Obtiene el cierre de cada par (símbolo, fecha) con un único join por fecha.
+
+    Para cada fecha se usa la barra de ese día o, si no existe, el último
+    cierre de los PRICE_LOOKBACK_DAYS días anteriores, igual que get_stock_price.
+
+    Args:
+        histories: Historial por símbolo
+        symbols: Símbolo de cada consulta
+        dates: Fecha de cada consulta
+
+    Returns:
+        np.ndarray: Precio de cierre de cada consulta, en el mismo orden
+
+    Raises:
+        ValueError: Si no hay datos para alguna de las consultas
+    """
+    query = pd.DataFrame(
+        {
+            "symbol": symbols,
+            "date": pd.DatetimeIndex(dates).as_unit("ns"),
+            "order": np.arange(len(symbols)),
+        }
+    ).sort_values("date")
+    merged = pd.merge_asof(
+        query,
+        _close_table(histories),
+        on="date",
+        by="symbol",
+        direction="backward",
+        tolerance=PRICE_LOOKBACK,
+    ).sort_values("order")
+    prices: np.ndarray = merged["close"].to_numpy(dtype=float)
+
+    missing = np.isnan(prices)
+    if missing.any():
+        symbol = merged["symbol"].to_numpy()[missing][0]
+        raise ValueError(
+            f"Error al obtener el precio para {symbol}: "
+            f"No se encontraron datos históricos para {symbol}"
+        )
+    return prices
+
+
+def _symbol_prices(
+    histories: Dict[str, pd.DataFrame], symbols: np.ndarray, day: np.datetime64
+) -> np.ndarray:
+    """Obtiene el cierre de una fecha para cada tenencia, consultando una vez por símbolo."""
+    unique_symbols, inverse = np.unique(symbols.astype(str), return_inverse=True)
+    prices = asof_prices(histories, unique_symbols, np.full(len(unique_symbols), day))
+    lot_prices: np.ndarray = prices[inverse]
+    return lot_prices
+
+
+class ProfitArrays:
+    """
+    Resultado de una valuación guardado en arrays, una posición por tenencia.
+
+    Ocupa mucha menos memoria que la lista de diccionarios de PortfolioResult:
+    los símbolos se guardan como códigos enteros, las fechas como datetime64 y
+    los importes como float64. to_result devuelve la vista PortfolioResult.
+    """
+
+    __slots__ = (
+        "symbol_names",
+        "symbol_codes",
+        "purchase_dates",
+        "purchase_prices",
+        "quantities",
+        "end_prices",
+        "profits",
+        "annualized_returns",
+        "total_investment",
+        "total_profit",
+        "annualized_return",
+    )
+
+    def __init__(
+        self,
+        symbol_names: np.ndarray,
+        symbol_codes: np.ndarray,
+        purchase_dates: np.ndarray,
+        purchase_prices: np.ndarray,
+        quantities: np.ndarray,
+        end_prices: np.ndarray,
+        profits: np.ndarray,
+        annualized_returns: np.ndarray,
+        total_investment: float,
+        total_profit: float,
+        annualized_return: float,
+    ) -> None:
+        """
+        Inicializa el resultado.
+
+        Args:
+            symbol_names: Símbolos distintos
+            symbol_codes: Posición en symbol_names del símbolo de cada tenencia
+            purchase_dates: Fecha desde la que se valúa cada tenencia (datetime64)
+            purchase_prices: Precio desde el que se valúa cada tenencia
+            quantities: Cantidad de acciones de cada tenencia
+            end_prices: Precio final de cada tenencia
+            profits: Beneficio de cada tenencia
+            annualized_returns: Retorno anualizado de cada tenencia
+            total_investment: Inversión total
+            total_profit: Beneficio total
+            annualized_return: Retorno anualizado del portfolio
+        """
+        self.symbol_names = symbol_names
+        self.symbol_codes = symbol_codes
+        self.purchase_dates = purchase_dates
+        self.purchase_prices = purchase_prices
+        self.quantities = quantities
+        self.end_prices = end_prices
+        self.profits = profits
+        self.annualized_returns = annualized_returns
+        self.total_investment = total_investment
+        self.total_profit = total_profit
+        self.annualized_return = annualized_return
+
+    def __len__(self) -> int:
+        """Cantidad de tenencias."""
+        return len(self.symbol_codes)
+
+    @property
+    def symbols(self) -> np.ndarray:
+        """Símbolo de cada tenencia."""
+        symbols: np.ndarray = self.symbol_names[self.symbol_codes]
+        return symbols
+
+    def stock(self, position: int) -> StockResult:
+        """Devuelve el resultado de una tenencia como StockResult."""
+        return {
+            "symbol": str(self.symbol_names[self.symbol_codes[position]]),
+            "purchase_date": pd.Timestamp(self.purchase_dates[position]).to_pydatetime(),
+            "purchase_price": float(self.purchase_prices[position]),
+            "quantity": float(self.quantities[position]),
+            "end_price": float(self.end_prices[position]),
+            "profit": float(self.profits[position]),
+            "annualized_return": float(self.annualized_returns[position]),
+        }
+
+    def to_result(self) -> PortfolioResult:
+        """Devuelve el resultado como PortfolioResult, con un diccionario por tenencia."""
+        purchase_dates: List[datetime] = (
+            pd.DatetimeIndex(self.purchase_dates).to_pydatetime().tolist()
+        )
+        stocks_data: List[StockResult] = [
+            {
+                "symbol": symbol,
+                "purchase_date": purchase_date,
+                "purchase_price": price,
+                "quantity": quantity,
+                "end_price": end_price,
+                "profit": profit,
+                "annualized_return": annualized,
+            }
+            for symbol, purchase_date, price, quantity, end_price, profit, annualized in zip(
+                self.symbols.tolist(),
+                purchase_dates,
+                self.purchase_prices.tolist(),
+                self.quantities.tolist(),
+                self.end_prices.tolist(),
+                self.profits.tolist(),
+                self.annualized_returns.tolist(),
+            )
+        ]
+        return {
+            "stocks": stocks_data,
+            "total_investment": self.total_investment,
+            "total_profit": self.total_profit,
+            "annualized_return": self.annualized_return,
+        }
+
+    def to_frame(self) -> pd.DataFrame:
+        """Devuelve los resultados por tenencia como una tabla con las columnas de StockResult."""
+        frame: pd.DataFrame = pd.DataFrame(
+            {
+                "symbol": pd.Categorical.from_codes(
+                    self.symbol_codes, dtype=pd.CategoricalDtype(pd.Index(self.symbol_names))
+                ),
+                "purchase_date": self.purchase_dates,
+                "purchase_price": self.purchase_prices,
+                "quantity": self.quantities,
+                "end_price": self.end_prices,
+                "profit": self.profits,
+                "annualized_return": self.annualized_returns,
+            }
+        )
+        return frame
+
+
+def annualize(
+    investments: np.ndarray, profits: np.ndarray, base_dates: np.ndarray, end: np.datetime64
+) -> Tuple[np.ndarray, float, float, float]:
+    """
+    Calcula los retornos anualizados por tenencia y los totales del portfolio.
+
+    Usa las mismas reglas que Portfolio.profit: un mínimo de 0.003 años por
+    tenencia y años ponderados por la inversión acumulada hasta cada tenencia.
+
+    Args:
+        investments: Inversión de cada tenencia
+        profits: Beneficio de cada tenencia
+        base_dates: Fecha desde la que se valúa cada tenencia (datetime64)
+        end: Fecha final
+
+    Returns:
+        tuple: (retornos anualizados, inversión total, beneficio total,
+            retorno anualizado del portfolio)
+    """
+    days = (end - base_dates).astype("timedelta64[D]").astype(float)
+    years = np.maximum(days / 365.25, 0.003)
+    total_returns = profits / investments
+    annualized_returns = np.where(years > 0, (1 + total_returns) ** (1 / years) - 1, total_returns)
+
+    # Años ponderados por la inversión acumulada hasta cada tenencia
+    cumulative_investment = np.cumsum(investments)
+    weighted_years = float(np.cumsum(years * investments / cumulative_investment)[-1])
+    total_investment = float(cumulative_investment[-1])
+    total_profit = float(np.cumsum(profits)[-1])
+
+    if total_investment > 0:
+        total_return = total_profit / total_investment
+        annualized_return = float((1 + total_return) ** (1 / weighted_years) - 1)
+    else:
+        annualized_return = 0.0
+    return annualized_returns, total_investment, total_profit, annualized_return
+
+
+def check_single_currency(currencies: Iterable[str]) -> None:
+    """
+    Verifica que los importes se puedan sumar sin una moneda de reporte.
+
+    Raises:
+        ValueError: Si hay tenencias en más de una moneda
+    """
+    distinct = list(dict.fromkeys(currencies))
+    if len(distinct) > 1:
+        raise ValueError(
+            f"El portfolio tiene acciones en varias monedas ({', '.join(distinct)}): "
+            "indique la moneda de reporte"
+        )
+
+
+def _holding_currencies(holdings: pd.DataFrame) -> np.ndarray:
+    """Moneda de cada tenencia; las tablas sin columna currency usan la moneda por defecto."""
+    if "currency" not in holdings:
+        return np.full(len(holdings), DEFAULT_CURRENCY, dtype=object)
+    currencies: np.ndarray = holdings["currency"].fillna(DEFAULT_CURRENCY).to_numpy(dtype=object)
+    return currencies
+
+
+def fx_pairs(holdings: pd.DataFrame, currency: Optional[str]) -> np.ndarray:
+    """
+    Obtiene la serie de tipo de cambio con la que se convierte cada tenencia.
+
+    Args:
+        holdings: Tabla de tenencias (ver holdings_frame)
+        currency: Moneda de reporte, o None para no convertir
+
+    Returns:
+        np.ndarray: Símbolo de la serie de cada tenencia, o "" si no hay que convertir
+
+    Raises:
+        ValueError: Si las tenencias mezclan monedas sin indicar la de reporte
+    """
+    currencies = _holding_currencies(holdings)
+    pairs = np.full(len(currencies), "", dtype=object)
+    if currency is None:
+        check_single_currency(currencies)
+    else:
+        for code, pair in fx_symbols(currencies, currency).items():
+            pairs[currencies == code] = pair
+    return pairs
+
+
+def fx_rates(
+    histories: Dict[str, pd.DataFrame], pairs: np.ndarray, dates: np.ndarray
+) -> np.ndarray:
+    """
+    Obtiene el tipo de cambio de cada tenencia con un único join por fecha.
+
+    Args:
+        histories: Historial por símbolo, incluidas las series de tipo de cambio
+        pairs: Símbolo de la serie de cada tenencia, o "" si no hay que convertir
+        dates: Fecha de cada tenencia
+
+    Returns:
+        np.ndarray: Tipo de cambio de cada tenencia (1 si no hay que convertir)
+
+    Raises:
+        ValueError: Si no hay datos para alguna de las series
+    """
+    rates = np.ones(len(pairs))
+    convert = pairs != ""
+    if convert.any():
+        rates[convert] = asof_prices(histories, pairs[convert], dates[convert])
+    return rates
+
+
+def vectorized_profit(
+    holdings: pd.DataFrame, start_date: str, end_date: str, currency: Optional[str] = None
+) -> PortfolioResult:
+    """
+    Calcula el beneficio y métricas del portfolio con operaciones sobre arrays.
+
+    Devuelve el mismo resultado que Portfolio.profit, pero los precios se
+    obtienen con una única descarga y un join por fecha, y el beneficio, el
+    retorno total y el retorno anualizado se calculan para todas las tenencias
+    a la vez.
+
+    Args:
+        holdings: Tabla de tenencias (ver holdings_frame)
+        start_date: Fecha inicial en formato YYYY-MM-DD
+        end_date: Fecha final en formato YYYY-MM-DD
+        currency: Moneda de reporte (ver vectorized_profit_arrays)
+
+    Returns:
+        PortfolioResult: Diccionario con los resultados del cálculo
+
+    Raises:
+        ValueError: Si las fechas son inválidas, no hay datos disponibles o
+            las tenencias mezclan monedas sin indicar la de reporte
+    """
+    return vectorized_profit_arrays(holdings, start_date, end_date, currency).to_result()
+
+
+def vectorized_profit_arrays(
+    holdings: pd.DataFrame, start_date: str, end_date: str, currency: Optional[str] = None
+) -> ProfitArrays:
+    """
+    Calcula lo mismo que vectorized_profit y devuelve el resultado en arrays.
+
+    Con una moneda de reporte, los precios de compra se convierten con el tipo
+    de cambio de la fecha desde la que se valúa cada tenencia y los finales
+    con el de la fecha final. Las series de tipo de cambio (una por par de
+    monedas) se descargan junto con los precios de las acciones.
+
+    Args:
+        holdings: Tabla de tenencias (ver holdings_frame)
+        start_date: Fecha inicial en formato YYYY-MM-DD
+        end_date: Fecha final en formato YYYY-MM-DD
+        currency: Moneda de reporte. Es obligatoria si las tenencias están en
+            más de una moneda
+
+    Returns:
+        ProfitArrays: Resultados por tenencia y totales del portfolio, en la
+            moneda de reporte
+
+    Raises:
+        ValueError: Si las fechas son inválidas, no hay datos disponibles o
+            las tenencias mezclan monedas sin indicar la de reporte
+    """
+    if holdings.empty:
+        empty = np.array([], dtype=float)
+        return ProfitArrays(
+            np.array([], dtype=object),
+            np.array([], dtype=np.int32),
+            np.array([], dtype="datetime64[ns]"),
+            empty,
+            empty,
+            empty,
+            empty,
+            empty,
+            0.0,
+            0.0,
+            0.0,
+        )
+
+    start, end = validate_dates(start_date, end_date)
+
+    symbols = holdings["symbol"].to_numpy(dtype=object)
+    purchase_dates = pd.DatetimeIndex(holdings["purchase_date"]).as_unit("ns").to_numpy()
+    purchase_prices = holdings["purchase_price"].to_numpy(dtype=float)
+    quantities = holdings["quantity"].to_numpy(dtype=float)
+    start64 = np.datetime64(start, "ns")
+    end64 = np.datetime64(end, "ns")
+
+    pairs = fx_pairs(holdings, currency)
+
+    # Una sola descarga con los precios de inicio y fin de todas las tenencias
+    # y los tipos de cambio
+    histories = get_stock_histories(
+        [*symbols.tolist(), *dict.fromkeys(pairs[pairs != ""])],
+        start - PRICE_LOOKBACK.to_pytimedelta(),
+        end + pd.Timedelta(days=1),
+    )
+    before_start = purchase_dates < start64
+    end_prices = _symbol_prices(histories, symbols, end64)
+    start_prices = np.full(len(symbols), np.nan)
+    if before_start.any():
+        start_prices[before_start] = _symbol_prices(histories, symbols[before_start], start64)
+
+    # Las acciones compradas antes del inicio se valúan desde la fecha de inicio
+    base_prices = np.where(before_start, start_prices, purchase_prices)
+    base_dates = np.where(before_start, start64, purchase_dates)
+    if currency is not None:
+        base_prices = base_prices * fx_rates(histories, pairs, base_dates)
+        end_prices = end_prices * fx_rates(histories, pairs, np.full(len(pairs), end64))
+
+    investments = base_prices * quantities
+    profits = (end_prices - base_prices) * quantities
+    annualized_returns, total_investment, total_profit, annualized_return = annualize(
+        investments, profits, base_dates, end64
+    )
+
+    symbol_names, symbol_codes = np.unique(symbols.astype(str), return_inverse=True)
+    return ProfitArrays(
+        symbol_names.astype(object),
+        symbol_codes.astype(np.int32),
+        base_dates,
+        base_prices,
+        quantities,
+        end_prices,
+        profits,
+        annualized_returns,
+        total_investment,
+        total_profit,
+        annualized_return,
+    )
+
+
+def _close_matrix(histories: Dict[str, pd.DataFrame], dates: pd.DatetimeIndex) -> pd.DataFrame:
+    """
+    Alinea los cierres de cada símbolo a las fechas pedidas.
+
+    Los días sin barra toman el último cierre de los PRICE_LOOKBACK_DAYS días anteriores.
+    """
+    calendar = pd.date_range(dates[0] - PRICE_LOOKBACK, dates[-1], freq="D", unit="ns", name="Date")
+    closes = pd.DataFrame(
+        {
+            symbol: history["Close"].set_axis(pd.DatetimeIndex(history.index).as_unit("ns"))
+            for symbol, history in histories.items()
+        },
+        index=calendar,
+        dtype=float,
+    )
+    aligned: pd.DataFrame = closes.ffill(limit=PRICE_LOOKBACK.days).reindex(dates)
+    return aligned
+
+
+def _weighted_years(
+    positions: np.ndarray,
+    investments: np.ndarray,
+    base_dates: np.ndarray,
+    dates: pd.DatetimeIndex,
+) -> np.ndarray:
+    """
+    Calcula, para cada fecha, los años ponderados que usa annualize.
+
+    Los pesos solo cambian cuando se incorporan tenencias, así que se calculan
+    una vez por cada posición de compra distinta. Dentro de ese tramo los años
+    crecen linealmente con la fecha, salvo el mínimo de 0.003 años, que solo
+    afecta a las tenencias con 0 o 1 día. La memoria es O(fechas + tenencias).
+
+    Args:
+        positions: Posición de la primera fecha en la que está comprada cada tenencia
+        investments: Inversión de cada tenencia
+        base_dates: Fecha desde la que se valúa cada tenencia
+        dates: Fechas de la serie
+
+    Returns:
+        np.ndarray: Años ponderados por fecha (0 antes de la primera compra)
+    """
+    day = np.timedelta64(1, "D")
+    origin = dates[0].to_datetime64()
+    date_days = ((dates.to_numpy() - origin) // day).astype(float)
+    # Días desde el origen redondeados hacia arriba, para que t - base coincida
+    # con los días enteros transcurridos entre la base y cada fecha
+    base_days = -((origin - base_dates) // day).astype(float)
+    weighted_years = np.zeros(len(dates))
+    starts = np.unique(positions[positions < len(dates)])
+    for first, last in zip(starts, [*starts[1:], len(dates)]):
+        active = positions <= first
+        with np.errstate(divide="ignore", invalid="ignore"):
+            weights = np.where(
+                active, investments / np.cumsum(np.where(active, investments, 0.0)), 0.0
+            )
+        order = np.argsort(base_days[active], kind="stable")
+        sorted_days = base_days[active][order]
+        cumulative = np.concatenate(([0.0], np.cumsum(weights[active][order])))
+
+        span = date_days[first:last]
+        linear = (
+            cumulative[-1] * span - (weights * np.where(active, base_days, 0.0)).sum()
+        ) / 365.25
+        # Las tenencias con 0 o 1 día usan el mínimo de 0.003 años
+        for elapsed in (0, 1):
+            left = sorted_days.searchsorted(span - elapsed, side="left")
+            right = sorted_days.searchsorted(span - elapsed, side="right")
+            linear += (cumulative[right] - cumulative[left]) * (0.003 - elapsed / 365.25)
+        weighted_years[first:last] = linear
+    return weighted_years
+
+
+def value_series(
+    holdings: pd.DataFrame, start_date: str, end_date: str, freq: str = "D"
+) -> pd.DataFrame:
+    """
+    Calcula el valor y el rendimiento del portfolio para cada fecha de un rango.
+
+    Cada símbolo se descarga una sola vez para todo el rango. Para cada fecha t
+    se consideran las tenencias compradas hasta t, con las mismas reglas que
+    Portfolio.profit(start_date, t): las compradas antes del inicio se valúan
+    desde el precio de la fecha de inicio.
+
+    Args:
+        holdings: Tabla de tenencias (ver holdings_frame)
+        start_date: Fecha inicial en formato YYYY-MM-DD
+        end_date: Fecha final en formato YYYY-MM-DD
+        freq: Frecuencia de las fechas, como en pandas (ej: "D", "W-FRI", "ME")
+
+    Returns:
+        pd.DataFrame: Indexado por fecha con las columnas market_value,
+            total_investment, total_profit, total_return y annualized_return
+
+    Raises:
+        ValueError: Si las fechas son inválidas o no hay datos disponibles
+    """
+    start, end = validate_dates(start_date, end_date)
+    dates = pd.date_range(start, end, freq=freq, unit="ns", name="Date")
+    columns = ["market_value", "total_investment", "total_profit", "total_return"]
+    columns.append("annualized_return")
+    if holdings.empty or dates.empty:
+        empty: pd.DataFrame = pd.DataFrame(0.0, index=dates, columns=columns)
+        return empty
+    check_single_currency(_holding_currencies(holdings))
+
+    symbols = holdings["symbol"].to_numpy(dtype=object)
+    purchase_dates = pd.DatetimeIndex(holdings["purchase_date"]).as_unit("ns").to_numpy()
+    purchase_prices = holdings["purchase_price"].to_numpy(dtype=float)
+    quantities = holdings["quantity"].to_numpy(dtype=float)
+    start64 = np.datetime64(start, "ns")
+
+    # Un solo historial por símbolo para todo el rango
+    histories = get_stock_histories(
+        symbols.tolist(), start - PRICE_LOOKBACK.to_pytimedelta(), end + pd.Timedelta(days=1)
+    )
+    closes = _close_matrix(histories, dates)
+
+    before_start = purchase_dates < start64
+    base_prices = purchase_prices.copy()
+    if before_start.any():
+        base_prices[before_start] = _symbol_prices(histories, symbols[before_start], start64)
+    base_dates = np.where(before_start, start64, purchase_dates)
+
+    # Posición de la primera fecha en la que cada tenencia está comprada
+    positions = dates.searchsorted(purchase_dates, side="left")
+    investments = base_prices * quantities
+
+    # Acciones y lotes comprados por símbolo, acumulados sobre las fechas
+    names, codes = np.unique(symbols.astype(str), return_inverse=True)
+    added = np.zeros((len(dates) + 1, len(names)))
+    np.add.at(added, (positions, codes), quantities)
+    shares = np.cumsum(added, axis=0)[:-1]
+    bought = np.zeros((len(dates) + 1, len(names)), dtype=np.int64)
+    np.add.at(bought, (positions, codes), 1)
+    held = np.cumsum(bought, axis=0)[:-1] > 0
+    prices = closes[names.tolist()].to_numpy(dtype=float)
+    if np.isnan(prices[held]).any():
+        symbol = names[int(np.argwhere(np.isnan(prices) & held)[0][1])]
+        raise ValueError(
+            f"Error al obtener el precio para {symbol}: "
+            f"No se encontraron datos históricos para {symbol}"
+        )
+
+    market_value = np.where(held, prices * shares, 0.0).sum(axis=1)
+    total_investment = np.cumsum(
+        np.bincount(positions, weights=investments, minlength=len(dates) + 1)
+    )[:-1]
+    total_profit = market_value - total_investment
+    weighted_years = _weighted_years(positions, investments, base_dates, dates)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        total_return = np.where(total_investment > 0, total_profit / total_investment, 0.0)
+        annualized_return = np.where(
+            total_investment > 0, (1 + total_return) ** (1 / weighted_years) - 1, 0.0
+        )
+
+    series: pd.DataFrame = pd.DataFrame(
+        {
+            "market_value": market_value,
+            "total_investment": total_investment,
+            "total_profit": total_profit,
+            "total_return": total_return,
+            "annualized_return": annualized_return,
+        },
+        index=dates,
+        columns=columns,
+    )
+    return series
@@ -1,6 +1,19 @@
 """Modelos/Tipos de datos para el portfolio de stocks."""
 
-from .portfolio import PortfolioResult
-from .stock import StockResult
+from .ledger import LedgerResult, PositionResult
+from .portfolio import HoldingError, IngestProgress, PortfolioResult, RowError, TotalReturnResult
+from .risk import RiskResult
+from .stock import StockResult, TotalReturnStockResult
 
-__all__ = ["PortfolioResult", "StockResult"]
+__all__ = [
+    "HoldingError",
+    "IngestProgress",
+    "LedgerResult",
+    "PortfolioResult",
+    "PositionResult",
+    "RiskResult",
+    "RowError",
+    "StockResult",
+    "TotalReturnResult",
+    "TotalReturnStockResult",
+]
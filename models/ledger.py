@@ -0,0 +1,30 @@
+"""Transaction ledger model definitions."""
+
+from typing import List, TypedDict
+
+
+class PositionResult(TypedDict):
+    """Realized and unrealized profit of one symbol in a transaction ledger."""
+
+    symbol: str
+    quantity: float
+    cost_basis: float
+    average_cost: float
+    end_price: float
+    market_value: float
+    realized_profit: float
+    unrealized_profit: float
+    fees: float
+
+
+class LedgerResult(TypedDict):
+    """Result of a transaction ledger profit calculation."""
+
+    positions: List[PositionResult]
+    method: str
+    total_cost_basis: float
+    total_market_value: float
+    total_realized: float
+    total_unrealized: float
+    total_fees: float
+    total_profit: float
@@ -2,7 +2,7 @@
 
 from typing import List, TypedDict
 
-from .stock import StockResult
+from .stock import StockResult, TotalReturnStockResult
 
 
 class PortfolioResult(TypedDict):
@@ -12,3 +12,39 @@ class PortfolioResult(TypedDict):
     total_investment: float
     total_profit: float
     annualized_return: float
+
+
+class TotalReturnResult(TypedDict):
+    """Result of a portfolio total-return calculation."""
+
+    stocks: List[TotalReturnStockResult]
+    total_investment: float
+    total_dividends: float
+    total_value: float
+    total_profit: float
+    annualized_return: float
+
+
+class HoldingError(TypedDict):
+    """Error while adding a holding to a portfolio."""
+
+    symbol: str
+    purchase_date: str
+    error: str
+
+
+class RowError(TypedDict):
+    """Malformed or unresolvable row in a holdings file."""
+
+    line: int
+    symbol: str
+    purchase_date: str
+    error: str
+
+
+class IngestProgress(TypedDict):
+    """Progress of a holdings file ingestion."""
+
+    rows: int
+    added: int
+    errors: int
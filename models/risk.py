@@ -0,0 +1,16 @@
+"""Risk model definitions."""
+
+from typing import Optional, TypedDict
+
+
+class RiskResult(TypedDict):
+    """Risk metrics of a portfolio's daily returns."""
+
+    days: int
+    total_return: float
+    volatility: float
+    max_drawdown: float
+    sharpe_ratio: float
+    sortino_ratio: float
+    benchmark: Optional[str]
+    beta: Optional[float]
@@ -10,6 +10,22 @@ class StockResult(TypedDict):
     symbol: str
     purchase_date: datetime
     purchase_price: float
+    quantity: float
     end_price: float
     profit: float
     annualized_return: float
+
+
+class TotalReturnStockResult(TypedDict):
+    """Result of a stock total-return calculation, with dividends reinvested."""
+
+    symbol: str
+    purchase_date: datetime
+    purchase_price: float
+    quantity: float
+    shares: float
+    dividends: float
+    end_price: float
+    end_value: float
+    profit: float
+    annualized_return: float
@@ -1,13 +1,73 @@
 """Aplicación Streamlit para mostrar el portfolio de stocks."""
 
 from datetime import date, datetime, timedelta
-from typing import cast
+from typing import Tuple, cast
 
+import pandas as pd
 import streamlit as st
 
 from classes.portfolio import Portfolio
+from classes.vectorized import holdings_from_records, value_series, vectorized_profit
+from models.portfolio import PortfolioResult
+from utils.cache import cacheable_until
 from utils.formatting import format_currency, format_percentage
 
+# Tenencias como tuplas (símbolo, fecha de compra, costo por acción, cantidad,
+# moneda), usadas como clave de los cálculos cacheados
+HoldingsKey = Tuple[Tuple[str, str, float, float, str], ...]
+
+
+def holdings_key(portfolio: Portfolio) -> HoldingsKey:
+    """Devuelve las tenencias del portfolio en un formato apto como clave de caché."""
+    return tuple(
+        (
+            stock.symbol,
+            stock.purchase_date.strftime("%Y-%m-%d"),
+            stock.unit_cost,
+            stock.quantity,
+            stock.currency,
+        )
+        for stock in portfolio.stocks
+    )
+
+
+# Los cálculos se cachean por tenencias y rango de fechas, por lo que las
+# interacciones que no los modifican no vuelven a calcular nada. Al mover sólo
+# la fecha final, el historial ya descargado se sirve desde el caché de precios
+# y únicamente se consultan los días nuevos.
+@st.cache_data(show_spinner="Calculando rendimiento...", max_entries=64)
+def cached_results(holdings: HoldingsKey, start_date: str, end_date: str) -> PortfolioResult:
+    """Calcula el beneficio del portfolio para unas tenencias y un rango de fechas."""
+    return vectorized_profit(holdings_from_records(holdings), start_date, end_date)
+
+
+@st.cache_data(show_spinner="Calculando evolución...", max_entries=64)
+def cached_value_series(holdings: HoldingsKey, start_date: str, end_date: str) -> pd.DataFrame:
+    """Calcula la evolución diaria del portfolio para unas tenencias y un rango de fechas."""
+    return value_series(holdings_from_records(holdings), start_date, end_date)
+
+
+def includes_open_day(end_date: str) -> bool:
+    """Indica si el rango llega a un día cuyo precio todavía puede cambiar."""
+    return datetime.strptime(end_date, "%Y-%m-%d").date() >= cacheable_until()
+
+
+# Los rangos que llegan al día en curso no se cachean: sus precios cambian
+# durante la rueda y el memo de precios ya los vuelve a consultar cada minuto
+def calculate_results(holdings: HoldingsKey, start_date: str, end_date: str) -> PortfolioResult:
+    """Calcula el beneficio del portfolio, usando el caché sólo para días cerrados."""
+    if includes_open_day(end_date):
+        return vectorized_profit(holdings_from_records(holdings), start_date, end_date)
+    return cached_results(holdings, start_date, end_date)
+
+
+def calculate_value_series(holdings: HoldingsKey, start_date: str, end_date: str) -> pd.DataFrame:
+    """Calcula la evolución diaria del portfolio, usando el caché sólo para días cerrados."""
+    if includes_open_day(end_date):
+        return value_series(holdings_from_records(holdings), start_date, end_date)
+    return cached_value_series(holdings, start_date, end_date)
+
+
 # Inicializar el portfolio en el estado de la sesión
 if "portfolio" not in st.session_state:
     st.session_state.portfolio = Portfolio()
@@ -73,11 +133,13 @@ with left_col:
             max_value=datetime.now().date(),
         )
 
+        quantity_input = st.number_input("Cantidad", min_value=0.0001, value=1.0, step=1.0)
+
         if st.form_submit_button("Agregar Acción"):
             try:
                 if isinstance(purchase_date_input, date):
                     st.session_state.portfolio.add_stock(
-                        symbol, purchase_date_input.strftime("%Y-%m-%d")
+                        symbol, purchase_date_input.strftime("%Y-%m-%d"), quantity_input
                     )
                     st.success(f"✅ Acción {symbol} agregada exitosamente")
                 else:
@@ -96,7 +158,8 @@ with right_col:
                 {
                     "Símbolo": stock.symbol,
                     "Fecha de Compra": stock.purchase_date.strftime("%Y-%m-%d"),
-                    "Precio de Compra": format_currency(stock.purchase_price),
+                    "Cantidad": f"{stock.quantity:g}",
+                    "Precio de Compra": format_currency(stock.unit_cost),
                 }
             )
 
@@ -110,68 +173,81 @@ with right_col:
 if st.session_state.portfolio.stocks:
     st.subheader("Análisis del Portfolio")
 
-    # Crear dos columnas para las fechas
-    col1, col2 = st.columns(2)
+    # Las fechas van en un formulario para que cambiarlas no dispare un cálculo
+    with st.form("analysis"):
+        col1, col2 = st.columns(2)
 
-    with col1:
-        start_date_input = st.date_input(
-            "Fecha inicial de análisis",
-            value=cast(date, datetime.now().date() - timedelta(days=30 * 6)),
-            max_value=datetime.now().date(),
-        )
+        with col1:
+            start_date_input = st.date_input(
+                "Fecha inicial de análisis",
+                value=cast(date, datetime.now().date() - timedelta(days=30 * 6)),
+                max_value=datetime.now().date(),
+            )
 
-    with col2:
-        end_date_input = st.date_input(
-            "Fecha final de análisis",
-            value=datetime.now().date(),
-            max_value=datetime.now().date(),
-        )
+        with col2:
+            end_date_input = st.date_input(
+                "Fecha final de análisis",
+                value=datetime.now().date(),
+                max_value=datetime.now().date(),
+            )
 
-    if st.button("Calcular Rendimiento"):
-        try:
+        if st.form_submit_button("Calcular Rendimiento"):
             # Validar que tenemos fechas válidas
             if not isinstance(start_date_input, date) or not isinstance(end_date_input, date):
                 st.error("❌ Fechas de análisis inválidas")
             elif end_date_input <= start_date_input:
                 st.error("❌ La fecha final debe ser posterior a la fecha inicial")
             else:
-                results = st.session_state.portfolio.profit(
-                    start_date=start_date_input.strftime("%Y-%m-%d"),
-                    end_date=end_date_input.strftime("%Y-%m-%d"),
+                st.session_state.analysis_dates = (
+                    start_date_input.strftime("%Y-%m-%d"),
+                    end_date_input.strftime("%Y-%m-%d"),
                 )
 
-                # Mostrar métricas principales
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    st.metric("Inversión Total", format_currency(results["total_investment"]))
-                with col2:
-                    st.metric("Beneficio Total", format_currency(results["total_profit"]))
-                with col3:
-                    st.metric(
-                        "Retorno Anualizado",
-                        format_percentage(results["annualized_return"] * 100),
-                        help="Representa la tasa de rendimiento promedio por año.",
-                    )
+    # El último análisis se vuelve a mostrar en cada rerun desde el caché
+    if "analysis_dates" in st.session_state:
+        try:
+            analysis_start, analysis_end = st.session_state.analysis_dates
+            holdings = holdings_key(st.session_state.portfolio)
+            results = calculate_results(holdings, analysis_start, analysis_end)
 
-                # Mostrar detalles por acción
-                st.subheader("Detalles por Acción")
-                for stock in results["stocks"]:
-                    profit_percentage = (stock["profit"] / stock["purchase_price"]) * 100
-                    expander_title = (
-                        f"{stock['symbol']} - "
-                        f"Comprado: {stock['purchase_date'].strftime('%Y-%m-%d')} - "
-                        f"Beneficio: {format_currency(stock['profit'])} - "
-                        f"Rendimiento: {format_percentage(profit_percentage)} - "
-                        f"Anualizado: {format_percentage(stock['annualized_return'] * 100)}"
-                    )
-                    with st.expander(expander_title):
-                        st.write(f"Fecha de compra: {stock['purchase_date'].strftime('%Y-%m-%d')}")
-                        st.write(f"Precio de compra: {format_currency(stock['purchase_price'])}")
-                        st.write(f"Precio actual: {format_currency(stock['end_price'])}")
-                        st.write(f"Beneficio: {format_currency(stock['profit'])}")
-                        st.write(f"Rendimiento: {format_percentage(profit_percentage)}")
-                        annualized_return = stock["annualized_return"] * 100
-                        st.write(f"Retorno Anualizado: {format_percentage(annualized_return)}")
+            # Mostrar métricas principales
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Inversión Total", format_currency(results["total_investment"]))
+            with col2:
+                st.metric("Beneficio Total", format_currency(results["total_profit"]))
+            with col3:
+                st.metric(
+                    "Retorno Anualizado",
+                    format_percentage(results["annualized_return"] * 100),
+                    help="Representa la tasa de rendimiento promedio por año.",
+                )
+
+            # Mostrar la evolución del portfolio
+            series = calculate_value_series(holdings, analysis_start, analysis_end)
+            st.line_chart(series[["market_value", "total_investment"]])
+
+            # Mostrar detalles por acción
+            st.subheader("Detalles por Acción")
+            for stock in results["stocks"]:
+                investment = stock["purchase_price"] * stock["quantity"]
+                profit_percentage = (stock["profit"] / investment) * 100
+                expander_title = (
+                    f"{stock['symbol']} - "
+                    f"Comprado: {stock['purchase_date'].strftime('%Y-%m-%d')} - "
+                    f"Beneficio: {format_currency(stock['profit'])} - "
+                    f"Rendimiento: {format_percentage(profit_percentage)} - "
+                    f"Anualizado: {format_percentage(stock['annualized_return'] * 100)}"
+                )
+                with st.expander(expander_title):
+                    st.write(f"Fecha de compra: {stock['purchase_date'].strftime('%Y-%m-%d')}")
+                    st.write(f"Cantidad: {stock['quantity']:g}")
+                    st.write(f"Precio de compra: {format_currency(stock['purchase_price'])}")
+                    st.write(f"Precio actual: {format_currency(stock['end_price'])}")
+                    st.write(f"Beneficio: {format_currency(stock['profit'])}")
+                    st.write(f"Rendimiento: {format_percentage(profit_percentage)}")
+                    annualized_return = stock["annualized_return"] * 100
+                    st.write(f"Retorno Anualizado: {format_percentage(annualized_return)}")
 
         except ValueError as e:
             st.error(f"❌ Error: {str(e)}")
@@ -179,6 +255,7 @@ if st.session_state.portfolio.stocks:
     # Agregar botón para reiniciar el portfolio
     if st.button("Reiniciar Portfolio"):
         st.session_state.portfolio = Portfolio()
+        st.session_state.pop("analysis_dates", None)
         st.rerun()
 
 else:
@@ -0,0 +1,20 @@
+"""Configuración compartida de los tests: datos de mercado offline y deterministas."""
+
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from utils.cache import set_price_cache
+from utils.providers import FixtureProvider, set_provider
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+@pytest.fixture(autouse=True, scope="session")
+def offline_market_data() -> Iterator[None]:
+    """Usa los historiales de tests/fixtures en lugar de Yahoo Finance y sin caché en disco."""
+    set_provider(FixtureProvider(FIXTURES_DIR))
+    set_price_cache(None)
+    yield
+    set_provider(None)
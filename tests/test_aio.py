@@ -0,0 +1,64 @@
+"""Tests para la API asíncrona."""
+
+import unittest
+from datetime import datetime
+
+from classes.portfolio import Portfolio
+from classes.stock import Stock
+from utils.aio import aget_stock_prices, get_max_concurrency, set_max_concurrency
+from utils.market import get_stock_price
+
+
+class TestAsyncAPI(unittest.IsolatedAsyncioTestCase):
+    """Tests para las versiones asíncronas de Stock, Portfolio y utils.market."""
+
+    async def test_acreate_stock(self) -> None:
+        """Test de creación asíncrona de una acción."""
+        stock = await Stock.acreate("aapl", "2023-01-14", quantity=2)
+        self.assertEqual(stock.symbol, "AAPL")
+        self.assertEqual(stock.purchase_date, datetime(2023, 1, 17))
+        self.assertEqual(stock.quantity, 2.0)
+
+    async def test_aprofit_matches_profit(self) -> None:
+        """El cálculo asíncrono coincide con el sincrónico."""
+        portfolio = Portfolio()
+        errors = await portfolio.aadd_stocks(
+            [("AAPL", "2023-01-17"), ("XXXX", "2023-01-17"), ("MSFT", "2023-06-01", 5)]
+        )
+        self.assertEqual([error["symbol"] for error in errors], ["XXXX"])
+        self.assertEqual([stock.symbol for stock in portfolio.stocks], ["AAPL", "MSFT"])
+
+        result = await portfolio.aprofit("2023-01-01", "2024-06-28")
+        self.assertEqual(result, portfolio.profit("2023-01-01", "2024-06-28"))
+
+    async def test_currency(self) -> None:
+        """Las versiones asíncronas aceptan la moneda de las acciones y la de reporte."""
+        stock = await Stock.acreate("MSFT", "2023-06-01", currency="eur")
+        self.assertEqual(stock.currency, "EUR")
+
+        portfolio = Portfolio()
+        portfolio.add_stock("AAPL", "2023-01-17", 3)
+        await portfolio.aadd_stocks([("MSFT", "2023-06-01", 2)], currency="EUR")
+        await portfolio.aadd_stocks([("GOOGL", "2023-03-01", 1, "USD")], currency="EUR")
+        self.assertEqual([stock.currency for stock in portfolio.stocks], ["USD", "EUR", "USD"])
+        with self.assertRaises(ValueError):
+            await portfolio.aprofit("2023-01-01", "2024-06-28")
+        result = await portfolio.aprofit("2023-01-01", "2024-06-28", "USD")
+        self.assertEqual(result, portfolio.profit("2023-01-01", "2024-06-28", "USD"))
+
+    async def test_aget_stock_prices(self) -> None:
+        """Test de consulta asíncrona de precios en lote."""
+        day = datetime(2023, 6, 1)
+        prices = await aget_stock_prices([("AAPL", day), ("GOOGL", day)])
+        self.assertEqual(prices[("AAPL", day)], get_stock_price("AAPL", day))
+
+    def test_invalid_concurrency(self) -> None:
+        """El límite de concurrencia debe ser mayor a cero."""
+        previous = get_max_concurrency()
+        with self.assertRaises(ValueError):
+            set_max_concurrency(0)
+        self.assertEqual(get_max_concurrency(), previous)
+
+
+if __name__ == "__main__":
+    unittest.main()
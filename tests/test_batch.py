@@ -0,0 +1,47 @@
+"""Tests para la valuación en lote de portfolios."""
+
+import unittest
+from typing import List
+
+from classes.batch import value_portfolios
+from classes.portfolio import HoldingSpec, Portfolio
+
+
+class TestValuePortfolios(unittest.TestCase):
+    """Tests para value_portfolios."""
+
+    def setUp(self) -> None:
+        self.portfolios = []
+        clients: List[List[HoldingSpec]] = [
+            [("AAPL", "2023-01-17"), ("MSFT", "2023-06-01", 4)],
+            [("MSFT", "2022-12-15", 2)],
+            [],
+            [("GOOGL", "2023-03-01"), ("AAPL", "2024-02-01", 3)],
+        ]
+        for holdings in clients:
+            portfolio = Portfolio()
+            portfolio.add_stocks(holdings, lazy=True)
+            self.portfolios.append(portfolio)
+
+    def test_matches_profit(self) -> None:
+        """Cada resultado coincide con el de profit."""
+        results = value_portfolios(self.portfolios, "2023-01-01", "2024-06-28", processes=1)
+        expected = [portfolio.profit("2023-01-01", "2024-06-28") for portfolio in self.portfolios]
+        self.assertEqual(results, expected)
+
+    def test_processes(self) -> None:
+        """La valuación en varios procesos mantiene el orden y los resultados."""
+        serial = value_portfolios(self.portfolios, "2023-01-01", "2024-06-28", processes=1)
+        parallel = value_portfolios(self.portfolios, "2023-01-01", "2024-06-28", processes=2)
+        self.assertEqual(parallel, serial)
+
+    def test_invalid_holding(self) -> None:
+        """Una acción que no se puede resolver genera un ValueError."""
+        invalid = Portfolio()
+        invalid.add_stock("XXXX", "2023-01-17", lazy=True)
+        with self.assertRaises(ValueError):
+            value_portfolios([*self.portfolios, invalid], "2023-01-01", "2024-06-28")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,253 @@
+"""Tests para el caché de precios en disco."""
+
+import sqlite3
+import tempfile
+import unittest
+from datetime import date, datetime
+from pathlib import Path
+
+import pandas as pd
+
+from utils.cache import SCHEMA_VERSION, PriceCache, set_price_cache
+from utils.market import get_stock_history
+from utils.memo import PriceMemo, get_price_memo
+from utils.providers import FixtureProvider, get_provider, set_provider
+
+
+def _bars(days: list[str], closes: list[float]) -> pd.DataFrame:
+    """Construye un historial con el formato que devuelve el proveedor."""
+    history: pd.DataFrame = pd.DataFrame(
+        {
+            "Open": closes,
+            "High": closes,
+            "Low": closes,
+            "Close": closes,
+            "Volume": [1000.0] * len(closes),
+        },
+        index=pd.DatetimeIndex(days),
+    )
+    return history
+
+
+class TestPriceCache(unittest.TestCase):
+    """Tests básicos para la clase PriceCache."""
+
+    def setUp(self) -> None:
+        self.cache = PriceCache(":memory:")
+
+    def tearDown(self) -> None:
+        self.cache.close()
+
+    def test_missing_ranges_empty_cache(self) -> None:
+        """Sin datos guardados falta todo el rango pedido."""
+        missing = self.cache.missing_ranges("AAPL", date(2023, 1, 1), date(2023, 2, 1))
+        self.assertEqual(missing, [(date(2023, 1, 1), date(2023, 2, 1))])
+
+    def test_store_and_read(self) -> None:
+        """Las barras guardadas se leen por rango de fechas."""
+        history = _bars(["2023-01-17", "2023-01-18"], [135.94, 135.21])
+        self.cache.store("AAPL", date(2023, 1, 14), date(2023, 1, 19), history)
+
+        result = self.cache.read("AAPL", date(2023, 1, 14), date(2023, 1, 18))
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result["Close"].iloc[0], 135.94)
+        self.assertEqual(
+            self.cache.missing_ranges("AAPL", date(2023, 1, 14), date(2023, 1, 19)), []
+        )
+
+    def test_missing_ranges_only_gaps(self) -> None:
+        """Sólo se reportan los huecos que no fueron consultados."""
+        self.cache.store("AAPL", date(2023, 1, 10), date(2023, 1, 20), _bars([], []))
+        missing = self.cache.missing_ranges("AAPL", date(2023, 1, 1), date(2023, 1, 31))
+        self.assertEqual(
+            missing,
+            [(date(2023, 1, 1), date(2023, 1, 10)), (date(2023, 1, 20), date(2023, 1, 31))],
+        )
+
+    def test_coverage_is_merged(self) -> None:
+        """Los rangos adyacentes se fusionan en uno solo."""
+        self.cache.store("AAPL", date(2023, 1, 1), date(2023, 1, 10), _bars([], []))
+        self.cache.store("AAPL", date(2023, 1, 10), date(2023, 1, 20), _bars([], []))
+        self.assertEqual(self.cache.covered_ranges("AAPL"), [(date(2023, 1, 1), date(2023, 1, 20))])
+
+    def test_last_close(self) -> None:
+        """Se devuelve el último cierre guardado del símbolo."""
+        self.assertIsNone(self.cache.last_close("AAPL"))
+        history = _bars(["2023-01-17", "2023-01-18"], [135.94, 135.21])
+        self.cache.store("AAPL", date(2023, 1, 17), date(2023, 1, 19), history)
+        self.assertEqual(self.cache.last_close("AAPL"), 135.21)
+
+    def test_corporate_actions(self) -> None:
+        """Los dividendos y splits se guardan junto a las barras."""
+        history = _bars(["2023-02-10", "2023-02-13"], [172.02, 174.1])
+        history["Dividends"] = [0.23, 0.0]
+        history["Stock Splits"] = [0.0, 4.0]
+        self.cache.store("AAPL", date(2023, 2, 10), date(2023, 2, 14), history)
+
+        result = self.cache.read("AAPL", date(2023, 2, 10), date(2023, 2, 14))
+        self.assertEqual(result["Dividends"].tolist(), [0.23, 0.0])
+        self.assertEqual(result["Stock Splits"].tolist(), [0.0, 4.0])
+
+    def test_missing_actions_are_zero(self) -> None:
+        """Un historial sin columnas de eventos se guarda sin dividendos ni splits."""
+        self.cache.store("AAPL", date(2023, 1, 17), date(2023, 1, 18), _bars(["2023-01-17"], [1.0]))
+        result = self.cache.read("AAPL", date(2023, 1, 17), date(2023, 1, 18))
+        self.assertEqual(result["Dividends"].tolist(), [0.0])
+
+    def test_new_split_invalidates_symbol(self) -> None:
+        """Un split nuevo descarta las barras guardadas del símbolo."""
+        self.cache.store(
+            "AAPL", date(2023, 1, 2), date(2023, 1, 10), _bars(["2023-01-03"], [100.0])
+        )
+        self.cache.store(
+            "MSFT", date(2023, 1, 2), date(2023, 1, 10), _bars(["2023-01-03"], [250.0])
+        )
+        split = _bars(["2023-02-01"], [50.0])
+        split["Stock Splits"] = [2.0]
+
+        self.assertTrue(self.cache.store("AAPL", date(2023, 2, 1), date(2023, 2, 2), split))
+        self.assertEqual(len(self.cache.read("AAPL", date(2023, 1, 1), date(2023, 3, 1))), 1)
+        self.assertEqual(
+            self.cache.missing_ranges("AAPL", date(2023, 1, 2), date(2023, 1, 10)),
+            [(date(2023, 1, 2), date(2023, 1, 10))],
+        )
+        self.assertEqual(len(self.cache.read("MSFT", date(2023, 1, 1), date(2023, 3, 1))), 1)
+
+        # Los splits que el caché ya conoce no invalidan nada
+        older = _bars(["2023-01-03"], [50.0])
+        older["Stock Splits"] = [3.0]
+        self.assertFalse(self.cache.store("AAPL", date(2023, 1, 2), date(2023, 1, 10), older))
+        self.assertEqual(len(self.cache.read("AAPL", date(2023, 1, 1), date(2023, 3, 1))), 2)
+
+    def test_new_dividend_keeps_bars(self) -> None:
+        """Los cierres no se ajustan por dividendos, por lo que un dividendo nuevo no invalida."""
+        self.cache.store(
+            "AAPL", date(2023, 1, 2), date(2023, 1, 10), _bars(["2023-01-03"], [100.0])
+        )
+        dividend = _bars(["2023-02-10"], [150.0])
+        dividend["Dividends"] = [0.46]
+        self.assertFalse(self.cache.store("AAPL", date(2023, 2, 1), date(2023, 3, 1), dividend))
+        self.assertEqual(self.cache.missing_ranges("AAPL", date(2023, 1, 2), date(2023, 1, 10)), [])
+        self.assertEqual(len(self.cache.read("AAPL", date(2023, 1, 1), date(2023, 3, 1))), 2)
+
+
+class TestSplitAfterCaching(unittest.TestCase):
+    """Tests del caché cuando el proveedor reajusta el historial por un split."""
+
+    def setUp(self) -> None:
+        self.previous = get_provider()
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = PriceCache(":memory:")
+        set_price_cache(self.cache)
+        memo = get_price_memo()
+        if memo is not None:
+            memo.clear()
+
+    def tearDown(self) -> None:
+        set_price_cache(None)
+        set_provider(self.previous)
+        self.cache.close()
+        self.directory.cleanup()
+
+    def _provider(self, name: str, last_day: str, close: float, split: bool) -> None:
+        """Usa un proveedor con un historial de cierre constante hasta una fecha."""
+        directory = Path(self.directory.name) / name
+        directory.mkdir()
+        days = pd.bdate_range("2023-01-02", last_day, name="Date")
+        history = _bars(list(days.strftime("%Y-%m-%d")), [close] * len(days))
+        history.index.name = "Date"
+        if split:
+            history["Stock Splits"] = 0.0
+            history.loc["2023-02-01", "Stock Splits"] = 2.0
+        history.to_csv(directory / "SPLT.csv")
+        set_provider(FixtureProvider(directory))
+
+    def test_history_uses_single_price_basis(self) -> None:
+        """Las barras guardadas antes del split se vuelven a consultar ajustadas."""
+        self._provider("before", "2023-01-31", 100.0, split=False)
+        get_stock_history("SPLT", datetime(2023, 1, 2), datetime(2023, 2, 1))
+
+        self._provider("after", "2023-02-28", 50.0, split=True)
+        memo = get_price_memo()
+        if memo is not None:
+            memo.clear()
+        history = get_stock_history("SPLT", datetime(2023, 1, 2), datetime(2023, 3, 1))
+        self.assertEqual(set(history["Close"]), {50.0})
+        self.assertEqual(history.index[0], pd.Timestamp("2023-01-02"))
+
+
+class TestPriceCacheMigration(unittest.TestCase):
+    """Tests para la actualización de cachés con el esquema anterior."""
+
+    def test_migrates_version_1(self) -> None:
+        """Se agregan las columnas de eventos y se descarta la cobertura anterior."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "prices.sqlite3"
+            with sqlite3.connect(path) as conn:
+                conn.executescript("""
+                    CREATE TABLE bars (
+                        symbol TEXT NOT NULL, date TEXT NOT NULL, open REAL, high REAL,
+                        low REAL, close REAL, volume REAL, PRIMARY KEY (symbol, date)
+                    );
+                    CREATE TABLE coverage (symbol TEXT NOT NULL, start TEXT NOT NULL,
+                        end TEXT NOT NULL);
+                    INSERT INTO bars VALUES ('AAPL', '2023-01-17', 1, 1, 1, 1, 1);
+                    INSERT INTO coverage VALUES ('AAPL', '2023-01-17', '2023-01-18');
+                    """)
+            conn.close()
+
+            cache = PriceCache(path)
+            try:
+                self.assertEqual(cache.covered_ranges("AAPL"), [])
+                history = _bars(["2023-01-17"], [2.0])
+                cache.store("AAPL", date(2023, 1, 17), date(2023, 1, 18), history)
+                result = cache.read("AAPL", date(2023, 1, 17), date(2023, 1, 18))
+                self.assertEqual(result["Close"].tolist(), [2.0])
+                self.assertEqual(result["Dividends"].tolist(), [0.0])
+            finally:
+                cache.close()
+            with sqlite3.connect(path) as conn:
+                version = conn.execute("PRAGMA user_version").fetchone()[0]
+            conn.close()
+            self.assertEqual(version, SCHEMA_VERSION)
+
+
+class TestPriceMemo(unittest.TestCase):
+    """Tests básicos para la clase PriceMemo."""
+
+    def setUp(self) -> None:
+        self.now = 0.0
+        self.memo = PriceMemo(maxsize=2, recent_ttl=60.0, clock=lambda: self.now)
+
+    def test_hits_and_misses(self) -> None:
+        """Se cuentan los aciertos y fallos de la memoización."""
+        self.assertIsNone(self.memo.get("AAPL"))
+        self.memo.set("AAPL", 135.94)
+        self.assertEqual(self.memo.get("AAPL"), 135.94)
+
+        stats = self.memo.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["size"]), (1, 1, 1))
+
+    def test_lru_eviction(self) -> None:
+        """Se desaloja la entrada usada hace más tiempo."""
+        self.memo.set("AAPL", 1.0)
+        self.memo.set("MSFT", 2.0)
+        self.memo.get("AAPL")
+        self.memo.set("GOOGL", 3.0)
+
+        self.assertIsNone(self.memo.get("MSFT"))
+        self.assertEqual(self.memo.get("AAPL"), 1.0)
+        self.assertEqual(self.memo.stats()["evictions"], 1)
+
+    def test_recent_entries_expire(self) -> None:
+        """Las entradas del día en curso vencen; las pasadas no."""
+        self.memo.set("today", 1.0, recent=True)
+        self.memo.set("past", 2.0)
+        self.now = 61.0
+
+        self.assertIsNone(self.memo.get("today"))
+        self.assertEqual(self.memo.get("past"), 2.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+"""Tests para las monedas y la conversión de tipos de cambio."""
+
+import unittest
+from datetime import datetime
+
+from classes.portfolio import Portfolio
+from classes.stock import Stock
+from classes.vectorized import holdings_from_records, vectorized_profit
+from utils.formatting import format_currency
+from utils.fx import fx_symbols, normalize_currency
+from utils.instrumentation import SOURCE_PROVIDER, record_fetches
+from utils.market import get_stock_price
+from utils.memo import get_price_memo
+from utils.price_index import get_price_index
+
+
+class TestCurrencies(unittest.TestCase):
+    """Tests para los códigos de moneda y su formato."""
+
+    def test_normalize_currency(self) -> None:
+        """Los códigos se normalizan a mayúsculas y se validan."""
+        self.assertEqual(normalize_currency(" ars "), "ARS")
+        with self.assertRaises(ValueError):
+            normalize_currency("US$")
+        with self.assertRaises(ValueError):
+            Stock("AAPL", "2023-01-17", lazy=True, currency="dollars")
+
+    def test_fx_symbols(self) -> None:
+        """Una serie por moneda distinta de la de reporte."""
+        symbols = fx_symbols(["EUR", "USD", "EUR", "ARS"], "usd")
+        self.assertEqual(symbols, {"EUR": "EURUSD=X", "ARS": "ARSUSD=X"})
+
+    def test_format_currency(self) -> None:
+        """Se usa el símbolo de la moneda o, si no se conoce, su código."""
+        self.assertEqual(format_currency(1234.5), "$1,234.50")
+        self.assertEqual(format_currency(1234.5, "eur"), "€1,234.50")
+        self.assertEqual(format_currency(1234.5, "CLP"), "1,234.50 CLP")
+
+
+class TestReportingCurrency(unittest.TestCase):
+    """Tests para la valuación con moneda de reporte."""
+
+    def setUp(self) -> None:
+        memo = get_price_memo()
+        if memo is not None:
+            memo.clear()
+        index = get_price_index()
+        if index is not None:
+            index.clear()
+        self.portfolio = Portfolio()
+        self.portfolio.add_stock("AAPL", "2023-01-17", 3)
+        self.portfolio.add_stock("MSFT", "2023-06-01", 2, currency="EUR")
+
+    def test_mixed_currencies_require_reporting_currency(self) -> None:
+        """No se suman importes en monedas distintas."""
+        with self.assertRaises(ValueError):
+            self.portfolio.profit("2023-01-01", "2024-06-28")
+        with self.assertRaises(ValueError):
+            self.portfolio.profit_vectorized("2023-01-01", "2024-06-28")
+
+    def test_converts_with_rates_of_each_date(self) -> None:
+        """El costo se convierte con el tipo de cambio de compra y el final con el del final."""
+        result = self.portfolio.profit("2023-01-01", "2024-06-28", currency="USD")
+        purchase_rate = get_stock_price("EURUSD=X", datetime(2023, 6, 1))
+        end_rate = get_stock_price("EURUSD=X", datetime(2024, 6, 28))
+        msft_cost = get_stock_price("MSFT", datetime(2023, 6, 1))
+        msft_end = get_stock_price("MSFT", datetime(2024, 6, 28))
+
+        aapl, msft = result["stocks"]
+        self.assertAlmostEqual(msft["purchase_price"], msft_cost * purchase_rate)
+        self.assertAlmostEqual(msft["end_price"], msft_end * end_rate)
+        self.assertAlmostEqual(
+            msft["profit"], 2 * (msft_end * end_rate - msft_cost * purchase_rate)
+        )
+        self.assertEqual(aapl["purchase_price"], self.portfolio.stocks[0].unit_cost)
+        self.assertAlmostEqual(result["total_profit"], aapl["profit"] + msft["profit"])
+
+    def test_total_return(self) -> None:
+        """El retorno total convierte los importes como el beneficio."""
+        with self.assertRaises(ValueError):
+            self.portfolio.total_return("2023-01-01", "2024-06-28")
+        total = self.portfolio.total_return("2023-01-01", "2024-06-28", currency="USD")
+        profit = self.portfolio.profit("2023-01-01", "2024-06-28", currency="USD")
+        self.assertAlmostEqual(total["total_investment"], profit["total_investment"])
+        self.assertAlmostEqual(total["stocks"][1]["end_price"], profit["stocks"][1]["end_price"])
+
+    def test_risk(self) -> None:
+        """Los rendimientos diarios se calculan sobre el valor convertido de cada día."""
+        with self.assertRaises(ValueError):
+            self.portfolio.risk("2024-06-01", "2024-06-28")
+        with self.assertRaises(ValueError):
+            self.portfolio.rolling_risk("2024-06-01", "2024-06-28", window=5)
+
+        returns = self.portfolio.rolling_risk("2024-06-01", "2024-06-28", window=5, currency="USD")[
+            "returns"
+        ]
+
+        def value(day: datetime) -> float:
+            rate = get_stock_price("EURUSD=X", day)
+            return 3 * get_stock_price("AAPL", day) + 2 * get_stock_price("MSFT", day) * rate
+
+        expected = value(datetime(2024, 6, 28)) / value(datetime(2024, 6, 27)) - 1
+        self.assertAlmostEqual(returns.loc["2024-06-28"], expected)
+        self.assertGreater(
+            self.portfolio.risk("2024-06-01", "2024-06-28", currency="USD")["volatility"], 0
+        )
+
+    def test_holdings_with_currency(self) -> None:
+        """Cada tenencia cargada en lote puede indicar su moneda."""
+        portfolio = Portfolio()
+        errors = portfolio.add_stocks(
+            [("AAPL", "2023-01-17"), ("MSFT", "2023-06-01", 2, "eur")], lazy=True, currency="USD"
+        )
+        self.assertEqual(errors, [])
+        self.assertEqual([stock.currency for stock in portfolio.stocks], ["USD", "EUR"])
+
+    def test_records_keep_currency(self) -> None:
+        """Las tenencias armadas desde registros conservan su moneda."""
+        records = [
+            (
+                stock.symbol,
+                f"{stock.purchase_date:%Y-%m-%d}",
+                stock.unit_cost,
+                stock.quantity,
+                stock.currency,
+            )
+            for stock in self.portfolio.stocks
+        ]
+        self.assertEqual(
+            vectorized_profit(holdings_from_records(records), "2023-01-01", "2024-06-28", "USD"),
+            self.portfolio.profit_vectorized("2023-01-01", "2024-06-28", currency="USD"),
+        )
+
+    def test_single_download(self) -> None:
+        """Los tipos de cambio se descargan junto con los precios."""
+        with record_fetches() as recorder:
+            self.portfolio.profit_vectorized("2023-01-01", "2024-06-28", currency="USD")
+        fetches = [event for event in recorder.events if event["source"] == SOURCE_PROVIDER]
+        self.assertEqual(len(fetches), 1)
+        self.assertIn("EURUSD=X", fetches[0]["symbols"])
+
+    def test_single_currency_without_conversion(self) -> None:
+        """Con una sola moneda igual a la de reporte no se consultan tipos de cambio."""
+        portfolio = Portfolio()
+        portfolio.add_stock("AAPL", "2023-01-17", 3)
+        self.assertEqual(
+            portfolio.profit("2023-01-01", "2024-06-28", currency="USD"),
+            portfolio.profit("2023-01-01", "2024-06-28"),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,19 @@
+"""Tests de las dependencias que carga cada módulo al importarse."""
+
+import unittest
+
+from benchmarks.imports import FORBIDDEN, measure_import
+
+
+class TestImports(unittest.TestCase):
+    """Los módulos livianos no cargan dependencias pesadas al importarse."""
+
+    def test_no_forbidden_imports(self) -> None:
+        """Ningún módulo carga las dependencias que tiene prohibidas."""
+        for module in FORBIDDEN:
+            with self.subTest(module=module):
+                self.assertEqual(measure_import(module, repeat=1)["forbidden"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
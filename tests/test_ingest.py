@@ -0,0 +1,81 @@
+"""Tests para la carga de tenencias desde CSV."""
+
+import tempfile
+import unittest
+from pathlib import Path
+from typing import List
+
+from classes.ingest import ingest_csv
+from classes.portfolio import Portfolio
+from models.portfolio import IngestProgress
+
+CSV = """Symbol,Purchase_Date,Quantity,Cost_Basis
+AAPL,2023-01-17,10,
+msft,2023-06-01,2,600
+GOOGL,2023-13-01,1,
+,2023-01-17,1,
+
+XXXX,2023-01-17,1,
+MSFT,2023-06-01,-1,
+AAPL,2023-01-14,abc,
+AAPL,2023-01-14,1,,extra
+AAPL,2023-01-14
+"""
+
+
+class TestIngestCsv(unittest.TestCase):
+    """Tests para ingest_csv."""
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name) / "holdings.csv"
+        self.path.write_text(CSV)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_ingest(self) -> None:
+        """Las filas válidas se agregan y las inválidas se reportan con su línea."""
+        portfolio = Portfolio()
+        updates: List[IngestProgress] = []
+        errors = ingest_csv(portfolio, self.path, chunksize=3, progress=updates.append)
+
+        self.assertEqual([stock.symbol for stock in portfolio.stocks], ["AAPL", "MSFT", "AAPL"])
+        self.assertTrue(all(stock.resolved for stock in portfolio.stocks))
+        self.assertEqual(portfolio.stocks[1].unit_cost, 300.0)
+        self.assertEqual([error["line"] for error in errors], [4, 5, 7, 8, 9, 10])
+
+        self.assertEqual(len(updates), 3)
+        self.assertEqual(updates[-1], {"rows": 9, "added": 3, "errors": 6})
+
+    def test_currency_column(self) -> None:
+        """La columna currency es opcional y se valida por fila."""
+        self.path.write_text(
+            "symbol,purchase_date,currency\nAAPL,2023-01-17,\nMSFT,2023-06-01,eur\n"
+            "GOOGL,2023-03-01,euros\n"
+        )
+        portfolio = Portfolio()
+        errors = ingest_csv(portfolio, self.path)
+        self.assertEqual([stock.currency for stock in portfolio.stocks], ["USD", "EUR"])
+        self.assertEqual([error["line"] for error in errors], [4])
+
+    def test_non_finite_values(self) -> None:
+        """Las cantidades y costos nan o inf se reportan como filas inválidas."""
+        self.path.write_text(
+            "symbol,purchase_date,quantity,cost_basis\nAAPL,2023-01-17,nan,\n"
+            "AAPL,2023-01-17,inf,\nAAPL,2023-01-17,1,NaN\nAAPL,2023-01-17,1,-inf\n"
+        )
+        portfolio = Portfolio()
+        errors = ingest_csv(portfolio, self.path)
+        self.assertEqual(portfolio.stocks, [])
+        self.assertEqual([error["line"] for error in errors], [2, 3, 4, 5])
+
+    def test_missing_columns(self) -> None:
+        """Un archivo sin las columnas obligatorias genera un ValueError."""
+        self.path.write_text("symbol,quantity\nAAPL,1\n")
+        with self.assertRaises(ValueError):
+            ingest_csv(Portfolio(), self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
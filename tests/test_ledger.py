@@ -0,0 +1,158 @@
+"""Tests para el libro de transacciones."""
+
+import unittest
+from datetime import datetime
+
+import pandas as pd
+
+from classes.ledger import AVERAGE_COST, FIFO, Ledger
+from utils.market import get_stock_price
+
+
+class TestMatching(unittest.TestCase):
+    """Tests para la asignación de las ventas a los lotes."""
+
+    def setUp(self) -> None:
+        self.ledger = Ledger()
+        self.ledger.buy("AAPL", "2023-01-17", 10, 100.0, fee=1.0)
+        self.ledger.buy("AAPL", "2023-02-01", 10, 120.0)
+        self.ledger.sell("AAPL", "2023-03-01", 15, 130.0, fee=2.0)
+
+    def test_fifo(self) -> None:
+        """La venta consume primero el lote más antiguo; las comisiones son costo."""
+        realized = self.ledger.realized(FIFO)
+        self.assertEqual(len(realized), 1)
+        sale = realized.iloc[0]
+        self.assertAlmostEqual(sale["proceeds"], 15 * 130.0 - 2.0)
+        self.assertAlmostEqual(sale["cost"], 10 * 100.0 + 1.0 + 5 * 120.0)
+        self.assertAlmostEqual(sale["profit"], sale["proceeds"] - sale["cost"])
+
+    def test_average_cost(self) -> None:
+        """Con costo promedio, la venta usa el costo medio de todas las acciones."""
+        sale = self.ledger.realized(AVERAGE_COST).iloc[0]
+        self.assertAlmostEqual(sale["cost"], 15 * (10 * 100.0 + 1.0 + 10 * 120.0) / 20)
+
+    def test_same_day_keeps_record_order(self) -> None:
+        """Una compra y una venta del mismo día se procesan en el orden registrado."""
+        ledger = Ledger()
+        ledger.sell("MSFT", "2023-06-02", 1, 300.0)
+        ledger.buy("MSFT", "2023-06-01", 1, 250.0)
+        ledger.buy("MSFT", "2023-06-02", 1, 260.0)
+        ledger.sell("MSFT", "2023-06-02", 1, 310.0)
+        self.assertEqual(ledger.realized()["cost"].tolist(), [250.0, 260.0])
+
+    def test_oversell(self) -> None:
+        """Vender más de lo que se tiene genera un ValueError."""
+        self.ledger.sell("AAPL", "2023-03-02", 6, 130.0)
+        with self.assertRaises(ValueError):
+            self.ledger.realized()
+
+    def test_invalid_transactions(self) -> None:
+        """Los datos inválidos se rechazan al registrarlos."""
+        with self.assertRaises(ValueError):
+            self.ledger.record("AAPL", "2023-01-17", "short", 1)
+        with self.assertRaises(ValueError):
+            self.ledger.buy("AAPL", "2023-01-17", 0)
+        with self.assertRaises(ValueError):
+            self.ledger.buy("AAPL", "17/01/2023", 1)
+        with self.assertRaises(ValueError):
+            self.ledger.realized("lifo")
+
+    def test_non_finite_values(self) -> None:
+        """Las cantidades, precios y comisiones nan o inf se rechazan."""
+        for value in (float("nan"), float("inf")):
+            with self.assertRaises(ValueError):
+                self.ledger.buy("AAPL", "2023-01-17", value)
+            with self.assertRaises(ValueError):
+                self.ledger.buy("AAPL", "2023-01-17", 1, value)
+            with self.assertRaises(ValueError):
+                self.ledger.sell("AAPL", "2023-01-17", 1, 100.0, fee=value)
+        self.assertEqual(len(self.ledger.to_frame()), 3)
+
+    def test_many_lots(self) -> None:
+        """Una venta que agota miles de lotes los recorre una sola vez."""
+        ledger = Ledger()
+        for _ in range(5_000):
+            ledger.buy("GOOGL", "2023-03-01", 1, 10.0)
+        ledger.sell("GOOGL", "2023-03-02", 4_999.5, 12.0)
+        ledger.sell("GOOGL", "2023-03-03", 0.5, 12.0)
+        self.assertAlmostEqual(ledger.realized()["profit"].sum(), 5_000 * 2.0)
+
+
+class TestLedgerProfit(unittest.TestCase):
+    """Tests para el beneficio realizado y no realizado con los fixtures."""
+
+    def setUp(self) -> None:
+        self.ledger = Ledger()
+        self.ledger.buy("AAPL", "2023-01-17", 10, 100.0, fee=1.0)
+        self.ledger.buy("AAPL", "2023-02-01", 10, 120.0)
+        self.ledger.sell("AAPL", "2023-03-01", 15, 130.0, fee=2.0)
+        self.ledger.buy("MSFT", "2023-06-01", 2)
+        self.ledger.sell("MSFT", "2024-12-02", 2, 450.0)
+
+    def test_profit(self) -> None:
+        """Las posiciones abiertas se valúan al cierre de la fecha final."""
+        result = self.ledger.profit("2024-06-28")
+        aapl, msft = result["positions"]
+        end_price = get_stock_price("AAPL", datetime(2024, 6, 28))
+
+        self.assertEqual(aapl["quantity"], 5.0)
+        self.assertAlmostEqual(aapl["cost_basis"], 5 * 120.0)
+        self.assertAlmostEqual(aapl["realized_profit"], 15 * 130.0 - 2.0 - 1601.0)
+        self.assertAlmostEqual(aapl["unrealized_profit"], 5 * (end_price - 120.0))
+        self.assertAlmostEqual(aapl["fees"], 3.0)
+
+        # El precio sin indicar es el cierre del día y la venta posterior se ignora
+        self.assertAlmostEqual(
+            msft["cost_basis"], 2 * get_stock_price("MSFT", datetime(2023, 6, 1))
+        )
+        self.assertEqual(msft["realized_profit"], 0.0)
+        self.assertAlmostEqual(
+            result["total_profit"], result["total_realized"] + result["total_unrealized"]
+        )
+
+    def test_closed_position(self) -> None:
+        """Una posición cerrada sólo tiene beneficio realizado."""
+        msft = self.ledger.profit("2024-12-31")["positions"][1]
+        self.assertEqual(msft["quantity"], 0.0)
+        self.assertEqual(msft["unrealized_profit"], 0.0)
+        cost = 2 * get_stock_price("MSFT", datetime(2023, 6, 1))
+        self.assertAlmostEqual(msft["realized_profit"], 2 * 450.0 - cost)
+
+    def test_to_portfolio(self) -> None:
+        """Los lotes abiertos forman un portfolio con su costo y fecha de compra."""
+        portfolio = self.ledger.to_portfolio("2024-06-28")
+        lots = [(stock.symbol, stock.quantity, stock.unit_cost) for stock in portfolio.stocks]
+        self.assertEqual(lots[0], ("AAPL", 5.0, 120.0))
+        self.assertEqual(lots[1][:2], ("MSFT", 2.0))
+
+        result = self.ledger.profit("2024-06-28")
+        valuation = portfolio.profit("2023-01-01", "2024-06-28")
+        self.assertAlmostEqual(valuation["total_profit"], result["total_unrealized"])
+
+    def test_zero_cost_lot(self) -> None:
+        """Un lote abierto sin costo no puede valuarse como portfolio."""
+        ledger = Ledger()
+        ledger.buy("AAPL", "2023-01-17", 1, 0.0)
+        self.assertEqual(ledger.profit("2024-06-28")["positions"][0]["cost_basis"], 0.0)
+        with self.assertRaises(ValueError):
+            ledger.to_portfolio("2024-06-28")
+
+    def test_frame_roundtrip(self) -> None:
+        """El libro se puede guardar y volver a crear como tabla."""
+        frame = self.ledger.to_frame()
+        self.assertTrue(Ledger.from_frame(frame).to_frame().equals(frame))
+
+        invalid = frame.assign(quantity=[1.0, -1.0, 1.0, 1.0, 1.0])
+        with self.assertRaises(ValueError):
+            Ledger.from_frame(invalid)
+        for column in ("quantity", "price", "fee"):
+            infinite = frame.assign(**{column: [1.0, float("inf"), 1.0, 1.0, 1.0]})
+            with self.assertRaises(ValueError):
+                Ledger.from_frame(infinite)
+        with self.assertRaises(ValueError):
+            Ledger.from_frame(pd.DataFrame({"symbol": ["AAPL"]}))
+
+
+if __name__ == "__main__":
+    unittest.main()
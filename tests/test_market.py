@@ -0,0 +1,160 @@
+"""Tests para las utilidades de datos de mercado."""
+
+import unittest
+from datetime import date, datetime
+from typing import Dict, Sequence
+
+import pandas as pd
+
+from utils.instrumentation import record_fetches
+from utils.market import (
+    get_next_trading_day,
+    get_stock_price,
+    get_stock_prices,
+    get_trading_day_price,
+    validate_symbol,
+)
+from utils.memo import get_price_memo
+from utils.price_index import get_price_index
+from utils.providers import FixtureProvider, get_provider, set_provider
+
+
+class CountingProvider(FixtureProvider):
+    """FixtureProvider que cuenta las descargas realizadas."""
+
+    def __init__(self, provider: FixtureProvider) -> None:
+        super().__init__(provider.directory)
+        self.downloads = 0
+
+    def download(
+        self, symbols: Sequence[str], start: datetime | date, end: datetime | date
+    ) -> Dict[str, pd.DataFrame]:
+        self.downloads += 1
+        return super().download(symbols, start, end)
+
+
+class TestGetStockPrices(unittest.TestCase):
+    """Tests para la consulta de precios en lote."""
+
+    def setUp(self) -> None:
+        self.previous = get_provider()
+        assert isinstance(self.previous, FixtureProvider)
+        self.provider = CountingProvider(self.previous)
+        set_provider(self.provider)
+        memo = get_price_memo()
+        if memo is not None:
+            memo.clear()
+        index = get_price_index()
+        if index is not None:
+            index.clear()
+
+    def tearDown(self) -> None:
+        set_provider(self.previous)
+
+    def test_single_download(self) -> None:
+        """Todos los precios se obtienen con una única descarga."""
+        requests = [
+            ("AAPL", datetime(2023, 1, 17)),
+            ("MSFT", datetime(2023, 1, 17)),
+            ("AAPL", datetime(2023, 6, 1)),
+            ("GOOGL", datetime(2023, 9, 18)),
+        ]
+        prices = get_stock_prices(requests)
+
+        self.assertEqual(self.provider.downloads, 1)
+        for symbol, day in requests:
+            self.assertEqual(prices[(symbol, day)], get_stock_price(symbol, day))
+
+    def test_memoized_prices(self) -> None:
+        """Los precios ya consultados no generan nuevas descargas."""
+        requests = [("AAPL", datetime(2023, 1, 17)), ("MSFT", datetime(2023, 1, 17))]
+        first = get_stock_prices(requests)
+        second = get_stock_prices(requests)
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.provider.downloads, 1)
+
+    def test_fallback_to_previous_close(self) -> None:
+        """Un día sin operaciones usa el último cierre disponible."""
+        saturday = datetime(2023, 1, 14)
+        prices = get_stock_prices([("AAPL", saturday)])
+        self.assertEqual(prices[("AAPL", saturday)], get_stock_price("AAPL", datetime(2023, 1, 13)))
+
+    def test_missing_data(self) -> None:
+        """Sin datos en los 10 días previos se genera un ValueError."""
+        with self.assertRaises(ValueError):
+            get_stock_prices([("AAPL", datetime(2022, 1, 3))])
+
+
+class TestGetTradingDayPrice(unittest.TestCase):
+    """Tests para la búsqueda del siguiente día de trading."""
+
+    def test_trading_day(self) -> None:
+        """Un día hábil se devuelve sin cambios junto con su cierre."""
+        day, price = get_trading_day_price("MSFT", datetime(2023, 6, 1))
+        self.assertEqual(day, datetime(2023, 6, 1))
+        self.assertEqual(price, get_stock_price("MSFT", datetime(2023, 6, 1)))
+
+    def test_skips_weekend_and_holiday(self) -> None:
+        """Se saltan el fin de semana y el feriado del lunes."""
+        self.assertEqual(get_next_trading_day("AAPL", datetime(2023, 1, 14)), datetime(2023, 1, 17))
+
+    def test_no_trading_day(self) -> None:
+        """Sin días de trading en el rango se genera un ValueError."""
+        with self.assertRaises(ValueError):
+            get_trading_day_price("AAPL", datetime(2030, 1, 1))
+
+
+class TestFetchInstrumentation(unittest.TestCase):
+    """Tests para el registro de consultas de datos de mercado."""
+
+    def setUp(self) -> None:
+        memo = get_price_memo()
+        if memo is not None:
+            memo.clear()
+        index = get_price_index()
+        if index is not None:
+            index.clear()
+
+    def test_records_operations(self) -> None:
+        """Cada consulta queda registrada con la operación que la originó."""
+        with record_fetches() as recorder:
+            validate_symbol("AAPL")
+            get_next_trading_day("AAPL", datetime(2023, 1, 14))
+            get_stock_price("AAPL", datetime(2023, 1, 14))
+
+        operations = [event["operation"] for event in recorder.events]
+        self.assertIn("validate_symbol", operations)
+        self.assertIn("next_trading_day", operations)
+        self.assertIn("price_asof", operations)
+
+        lookups = [event for event in recorder.events if event["operation"] == "price_asof"]
+        self.assertEqual(len(lookups), 1)
+        self.assertEqual(lookups[0]["symbols"], ["AAPL"])
+        self.assertEqual(lookups[0]["start"], "2022-12-15")
+        self.assertEqual(lookups[0]["end"], "2023-01-15")
+        self.assertEqual(lookups[0]["rows"], 20)
+        self.assertFalse(lookups[0]["cache_hit"])
+
+    def test_memo_hits_and_summary(self) -> None:
+        """Las consultas repetidas se registran como aciertos de la memoización."""
+        with record_fetches() as recorder:
+            get_stock_price("MSFT", datetime(2023, 6, 1))
+            get_stock_price("MSFT", datetime(2023, 6, 1))
+
+        sources = [event["source"] for event in recorder.events]
+        self.assertEqual(sources, ["provider", "memo"])
+        summary = recorder.summary()
+        self.assertEqual(summary["calls"].sum(), 2)
+        self.assertEqual(summary["cache_hits"].sum(), 1)
+
+    def test_hooks_removed(self) -> None:
+        """Fuera del bloque no se siguen registrando consultas."""
+        with record_fetches() as recorder:
+            pass
+        get_stock_price("GOOGL", datetime(2023, 6, 1))
+        self.assertEqual(recorder.events, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,11 @@
 import unittest
-from typing import cast
+from datetime import datetime
+from typing import List, cast
 
-from classes.portfolio import Portfolio
+from classes.portfolio import HoldingSpec, Portfolio
+from classes.stock import Stock
 from models.portfolio import PortfolioResult
+from utils.instrumentation import record_fetches
 
 
 class TestPortfolio(unittest.TestCase):
@@ -22,6 +25,111 @@ class TestPortfolio(unittest.TestCase):
         self.assertEqual(portfolio.stocks[0].symbol, "AAPL")
         self.assertGreater(portfolio.stocks[0].purchase_price, 0)
 
+    def test_add_stocks(self) -> None:
+        """Test de carga masiva con errores por acción."""
+        portfolio = Portfolio()
+        errors = portfolio.add_stocks(
+            [("AAPL", "2023-01-17"), ("XXXX", "2023-01-17"), ("MSFT", "2023-06-01")],
+            max_workers=2,
+        )
+
+        self.assertEqual([stock.symbol for stock in portfolio.stocks], ["AAPL", "MSFT"])
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(errors[0]["symbol"], "XXXX")
+
+    def test_lazy_add_stocks(self) -> None:
+        """Test de carga diferida resuelta en lote."""
+        portfolio = Portfolio()
+        errors = portfolio.add_stocks(
+            [("AAPL", "2023-01-17"), ("XXXX", "2023-01-17"), ("MSFT", "2023-06-01", 3)],
+            lazy=True,
+        )
+        self.assertEqual(errors, [])
+        self.assertFalse(any(stock.resolved for stock in portfolio.stocks))
+
+        errors = portfolio.resolve()
+        self.assertEqual([error["symbol"] for error in errors], ["XXXX"])
+        self.assertEqual(portfolio.symbols, ["AAPL", "MSFT"])
+
+        eager = Portfolio()
+        eager.add_stocks([("AAPL", "2023-01-17"), ("MSFT", "2023-06-01", 3)])
+        self.assertEqual(
+            portfolio.profit("2023-01-01", "2024-06-28"), eager.profit("2023-01-01", "2024-06-28")
+        )
+
+    def test_incremental_profit(self) -> None:
+        """Test de que el cálculo incremental coincide con uno desde cero."""
+        holdings: List[HoldingSpec] = [
+            ("MSFT", "2022-12-15", 2),
+            ("AAPL", "2023-01-17"),
+            ("AAPL", "2023-03-01", 5),
+        ]
+        portfolio = Portfolio()
+        portfolio.add_stocks(holdings[:2])
+        portfolio.profit("2023-01-01", "2024-06-28")
+
+        # Agregar un lote sólo suma sus términos, sin consultas al proveedor
+        portfolio.add_stocks(holdings[2:])
+        with record_fetches() as recorder:
+            result = portfolio.profit("2023-01-01", "2024-06-28")
+        self.assertFalse(any(event["source"] == "provider" for event in recorder.events))
+
+        fresh = Portfolio()
+        fresh.add_stocks(holdings)
+        self.assertEqual(result, fresh.profit("2023-01-01", "2024-06-28"))
+
+        # Mover la fecha final y quitar un lote
+        self.assertEqual(
+            portfolio.profit("2023-01-01", "2024-07-31"), fresh.profit("2023-01-01", "2024-07-31")
+        )
+        portfolio.remove_stock(portfolio.lots("AAPL")[0])
+        fresh = Portfolio()
+        fresh.add_stocks([holdings[0], holdings[2]])
+        self.assertEqual(
+            portfolio.profit("2023-01-01", "2024-07-31"), fresh.profit("2023-01-01", "2024-07-31")
+        )
+        self.assertEqual(len(portfolio.lots("AAPL")), 1)
+
+    def test_lots_and_quantities(self) -> None:
+        """Test de lotes con cantidad y costo agrupados por símbolo."""
+        portfolio = Portfolio()
+        portfolio.add_stock("AAPL", "2023-01-17", quantity=10)
+        portfolio.add_stock("AAPL", "2023-03-01", quantity=5, cost_basis=700.0)
+        portfolio.add_stock("MSFT", "2023-01-17")
+
+        self.assertEqual(portfolio.symbols, ["AAPL", "MSFT"])
+        self.assertEqual(len(portfolio.lots("aapl")), 2)
+        self.assertEqual(portfolio.lots("AAPL")[1].unit_cost, 140.0)
+
+        result = portfolio.profit("2023-01-17", "2023-06-30")
+        first, second, _ = result["stocks"]
+        self.assertAlmostEqual(first["profit"], (first["end_price"] - first["purchase_price"]) * 10)
+        self.assertEqual(second["purchase_price"], 140.0)
+        self.assertAlmostEqual(second["profit"], second["end_price"] * 5 - 700.0)
+        self.assertAlmostEqual(
+            result["total_investment"],
+            first["purchase_price"] * 10 + 700.0 + result["stocks"][2]["purchase_price"],
+        )
+        self.assertEqual(result, portfolio.profit_vectorized("2023-01-17", "2023-06-30"))
+
+    def test_add_lot(self) -> None:
+        """Un lote ya creado se agrega sin consultas y se agrupa por símbolo."""
+        portfolio = Portfolio()
+        portfolio.add_stock("AAPL", "2023-01-17")
+        lot = Stock.from_resolved("aapl", "2023-03-01", datetime(2023, 3, 1), 145.0, 140.0, 5)
+        with record_fetches() as recorder:
+            portfolio.add_lot(lot)
+
+        self.assertEqual(recorder.events, [])
+        self.assertIs(portfolio.lots("AAPL")[1], lot)
+        self.assertEqual(portfolio.stocks[-1].unit_cost, 140.0)
+
+    def test_invalid_quantity(self) -> None:
+        """Test de que la cantidad debe ser positiva."""
+        portfolio = Portfolio()
+        with self.assertRaises(ValueError):
+            portfolio.add_stock("AAPL", "2023-01-17", quantity=0)
+
     def test_portfolio_profit(self) -> None:
         """Test de cálculo de beneficio del portfolio."""
         portfolio = Portfolio()
@@ -36,6 +144,83 @@ class TestPortfolio(unittest.TestCase):
         total_profit = sum(stock["profit"] for stock in result["stocks"])
         self.assertEqual(result["total_profit"], total_profit)
 
+    def test_profit_vectorized(self) -> None:
+        """Test de que el motor vectorizado coincide con el cálculo por acción."""
+        portfolio = Portfolio()
+        portfolio.add_stock("AAPL", "2023-01-14")
+        portfolio.add_stock("MSFT", "2023-06-01")
+        portfolio.add_stock("GOOGL", "2023-09-17")
+
+        for start_date, end_date in [("2023-01-01", "2024-10-25"), ("2023-07-01", "2023-12-31")]:
+            expected = portfolio.profit(start_date, end_date)
+            result = portfolio.profit_vectorized(start_date, end_date)
+            self.assertEqual(result["stocks"], expected["stocks"])
+            self.assertEqual(result["total_investment"], expected["total_investment"])
+            self.assertEqual(result["total_profit"], expected["total_profit"])
+            self.assertAlmostEqual(result["annualized_return"], expected["annualized_return"])
+
+    def test_profit_arrays(self) -> None:
+        """Test de que el resultado en arrays coincide con profit_vectorized."""
+        portfolio = Portfolio()
+        portfolio.add_stocks(
+            [("MSFT", "2022-12-15", 2), ("AAPL", "2023-01-17"), ("MSFT", "2023-06-01")]
+        )
+
+        arrays = portfolio.profit_arrays("2023-01-01", "2024-06-28")
+        expected = portfolio.profit_vectorized("2023-01-01", "2024-06-28")
+        self.assertEqual(len(arrays), 3)
+        self.assertEqual(arrays.to_result(), expected)
+        self.assertEqual(arrays.stock(2), expected["stocks"][2])
+        self.assertEqual(list(arrays.to_frame()["symbol"]), ["MSFT", "AAPL", "MSFT"])
+        self.assertFalse(hasattr(portfolio.stocks[0], "__dict__"))
+
+    def test_value_series(self) -> None:
+        """Test de que la serie de valores coincide con profit en cada fecha."""
+        portfolio = Portfolio()
+        portfolio.add_stock("AAPL", "2023-01-17")
+        portfolio.add_stock("MSFT", "2023-03-01")
+
+        series = portfolio.value_series("2023-02-01", "2023-03-31", freq="W-FRI")
+        self.assertEqual(len(series), 9)
+
+        expected = portfolio.profit("2023-02-01", "2023-03-31")
+        last = series.iloc[-1]
+        self.assertAlmostEqual(last["total_investment"], expected["total_investment"])
+        self.assertAlmostEqual(last["total_profit"], expected["total_profit"])
+        self.assertAlmostEqual(last["annualized_return"], expected["annualized_return"])
+
+        # Antes de la compra de MSFT sólo cuenta AAPL
+        only_aapl = Portfolio()
+        only_aapl.add_stock("AAPL", "2023-01-17")
+        expected = only_aapl.profit("2023-02-01", "2023-02-10")
+        self.assertAlmostEqual(series["total_profit"]["2023-02-10"], expected["total_profit"])
+
+    def test_value_series_many_lots(self) -> None:
+        """Test de la serie con varios lotes por símbolo, comprados el mismo día y al inicio."""
+        lots = [
+            ("MSFT", "2023-01-17", 3.0, None),
+            ("AAPL", "2023-02-01", 2.0, 250.0),
+            ("AAPL", "2023-02-01", 4.0, None),
+            ("GOOGL", "2023-02-02", 5.0, None),
+            ("AAPL", "2023-02-03", 1.0, None),
+        ]
+        portfolio = Portfolio()
+        for symbol, purchase_date, quantity, cost_basis in lots:
+            portfolio.add_stock(symbol, purchase_date, quantity, cost_basis)
+
+        series = portfolio.value_series("2023-02-01", "2023-02-10")
+        # Las fechas cubren tenencias con 0 y 1 día y los tramos entre compras
+        for date in ["2023-02-01", "2023-02-02", "2023-02-03", "2023-02-06", "2023-02-10"]:
+            bought = Portfolio()
+            for symbol, purchase_date, quantity, cost_basis in lots:
+                if purchase_date <= date:
+                    bought.add_stock(symbol, purchase_date, quantity, cost_basis)
+            expected = bought.profit("2023-02-01", date)
+            row = series.loc[date]
+            self.assertAlmostEqual(row["total_investment"], expected["total_investment"])
+            self.assertAlmostEqual(row["total_profit"], expected["total_profit"])
+            self.assertAlmostEqual(row["annualized_return"], expected["annualized_return"])
+
 
 if __name__ == "__main__":
     unittest.main()
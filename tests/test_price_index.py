@@ -0,0 +1,160 @@
+"""Tests para el índice de cierres ordenado por fecha."""
+
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from utils.instrumentation import SOURCE_INDEX, SOURCE_PROVIDER, record_fetches
+from utils.market import get_stock_histories, get_stock_price, get_stock_prices
+from utils.memo import get_price_memo
+from utils.price_index import PriceIndex, get_price_index
+from utils.providers import FixtureProvider, get_provider, set_provider
+
+
+def _history(days: pd.DatetimeIndex, closes: List[float]) -> pd.DataFrame:
+    """Historial mínimo con cierres conocidos."""
+    history: pd.DataFrame = pd.DataFrame({"Close": closes}, index=days.rename("Date"))
+    return history
+
+
+class TestPriceIndex(unittest.TestCase):
+    """Tests para PriceIndex."""
+
+    def setUp(self) -> None:
+        self.index = PriceIndex()
+        days = pd.to_datetime(["2023-01-03", "2023-01-04", "2023-01-06"])
+        self.index.add(
+            "AAPL", _history(days, [10.0, 11.0, 12.0]), datetime(2023, 1, 1), datetime(2023, 1, 10)
+        )
+
+    def test_asof(self) -> None:
+        """Cada fecha toma la barra del día o el último cierre anterior."""
+        prices = self.index.asof(
+            "AAPL",
+            [datetime(2023, 1, 3), datetime(2023, 1, 5), datetime(2023, 1, 9)],
+            lookback=10,
+        )
+        np.testing.assert_array_equal(prices, [10.0, 11.0, 12.0])
+
+    def test_unresolved_dates(self) -> None:
+        """Las fechas fuera de los rangos consultados o del lookback quedan en NaN."""
+        prices = self.index.asof(
+            "AAPL",
+            [datetime(2023, 1, 2), datetime(2023, 1, 10), datetime(2023, 1, 9)],
+            lookback=2,
+        )
+        self.assertTrue(np.isnan(prices).all())
+        self.assertTrue(np.isnan(self.index.asof("MSFT", [datetime(2023, 1, 3)], 10)).all())
+
+    def test_gap_between_ranges(self) -> None:
+        """Un tramo no consultado entre la barra y la fecha no se resuelve."""
+        days = pd.to_datetime(["2023-01-16"])
+        self.index.add("AAPL", _history(days, [20.0]), datetime(2023, 1, 15), datetime(2023, 1, 20))
+        prices = self.index.asof(
+            "AAPL", [datetime(2023, 1, 12), datetime(2023, 1, 17)], lookback=30
+        )
+        self.assertTrue(np.isnan(prices[0]))
+        self.assertEqual(prices[1], 20.0)
+
+        # Al consultar el tramo faltante, los rangos se unen
+        self.index.add("AAPL", _history(days[:0], []), datetime(2023, 1, 10), datetime(2023, 1, 15))
+        self.assertEqual(self.index.asof("AAPL", [datetime(2023, 1, 12)], 30)[0], 12.0)
+
+    def test_new_bars_replace_old(self) -> None:
+        """Una barra del mismo día reemplaza a la registrada."""
+        days = pd.to_datetime(["2023-01-04"])
+        self.index.add("AAPL", _history(days, [15.0]), datetime(2023, 1, 4), datetime(2023, 1, 5))
+        self.assertEqual(self.index.asof("AAPL", [datetime(2023, 1, 4)], 10)[0], 15.0)
+        self.assertEqual(len(self.index), 3)
+
+    def test_new_split_resets_symbol(self) -> None:
+        """Un split posterior a los registrados descarta los cierres previos."""
+        days = pd.to_datetime(["2023-01-16"])
+        split = _history(days, [5.0]).assign(**{"Stock Splits": [2.0]})
+        self.index.add("AAPL", split, datetime(2023, 1, 15), datetime(2023, 1, 20))
+        self.assertEqual(len(self.index), 1)
+        self.assertTrue(np.isnan(self.index.asof("AAPL", [datetime(2023, 1, 4)], 10)[0]))
+
+        # Volver a registrar el mismo split no descarta nada
+        older = _history(pd.to_datetime(["2023-01-04"]), [5.5])
+        self.index.add("AAPL", older, datetime(2023, 1, 1), datetime(2023, 1, 10))
+        self.index.add("AAPL", split, datetime(2023, 1, 15), datetime(2023, 1, 20))
+        self.assertEqual(len(self.index), 2)
+
+        # Los dividendos no cambian la base de los cierres
+        dividend = _history(pd.to_datetime(["2023-02-01"]), [6.0]).assign(Dividends=[0.5])
+        self.index.add("AAPL", dividend, datetime(2023, 2, 1), datetime(2023, 2, 2))
+        self.assertEqual(len(self.index), 3)
+
+    def test_current_day_not_indexed(self) -> None:
+        """El día en curso no se registra porque su precio todavía puede cambiar."""
+        today = pd.Timestamp.today().normalize()
+        self.index.add(
+            "LIVE", _history(pd.DatetimeIndex([today]), [1.0]), today, today + timedelta(days=1)
+        )
+        self.assertTrue(np.isnan(self.index.asof("LIVE", [today.to_pydatetime()], 10)[0]))
+
+
+class TestIndexedPrices(unittest.TestCase):
+    """Tests para los precios servidos desde el índice."""
+
+    def setUp(self) -> None:
+        memo = get_price_memo()
+        if memo is not None:
+            memo.clear()
+        index = get_price_index()
+        if index is not None:
+            index.clear()
+
+    def test_prices_from_loaded_history(self) -> None:
+        """Las fechas de un rango ya obtenido no vuelven a consultarse."""
+        get_stock_histories(["AAPL", "MSFT"], datetime(2023, 1, 1), datetime(2023, 7, 1))
+        requests = [
+            ("AAPL", datetime(2023, 1, 14)),
+            ("AAPL", datetime(2023, 6, 1)),
+            ("MSFT", datetime(2023, 4, 9)),
+        ]
+        with record_fetches() as recorder:
+            prices = get_stock_prices(requests)
+        sources = {event["source"] for event in recorder.events}
+        self.assertEqual(sources, {SOURCE_INDEX})
+        self.assertEqual(
+            prices[("AAPL", datetime(2023, 1, 14))], get_stock_price("AAPL", datetime(2023, 1, 13))
+        )
+
+
+class TestLongClosure(unittest.TestCase):
+    """Tests con un cierre del mercado de más de 10 días."""
+
+    def setUp(self) -> None:
+        self.previous = get_provider()
+        self.directory = tempfile.TemporaryDirectory()
+        days = pd.bdate_range("2023-01-02", "2023-03-31", name="Date")
+        days = days[(days < "2023-02-01") | (days > "2023-02-20")]
+        history = pd.DataFrame(
+            {"Open": 1.0, "High": 1.0, "Low": 1.0, "Volume": 1000.0, "Close": 1.0}, index=days
+        )
+        history.loc["2023-01-31", "Close"] = 7.0
+        history.to_csv(Path(self.directory.name) / "SHUT.csv")
+        set_provider(FixtureProvider(self.directory.name))
+
+    def tearDown(self) -> None:
+        set_provider(self.previous)
+        self.directory.cleanup()
+
+    def test_single_fetch(self) -> None:
+        """El último cierre anterior al cierre del mercado se obtiene con una sola consulta."""
+        with record_fetches() as recorder:
+            price = get_stock_price("SHUT", datetime(2023, 2, 17))
+        self.assertEqual(price, 7.0)
+        fetches = [event for event in recorder.events if event["source"] == SOURCE_PROVIDER]
+        self.assertEqual(len(fetches), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
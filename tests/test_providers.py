@@ -0,0 +1,85 @@
+"""Tests para los proveedores de datos de mercado."""
+
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+
+from utils.providers import (
+    FixtureProvider,
+    RecordingProvider,
+    SyntheticProvider,
+    period_to_days,
+)
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+class TestFixtureProvider(unittest.TestCase):
+    """Tests básicos para la clase FixtureProvider."""
+
+    def setUp(self) -> None:
+        self.provider = FixtureProvider(FIXTURES_DIR)
+
+    def test_history_range(self) -> None:
+        """El rango es semiabierto y omite los días sin operaciones."""
+        history = self.provider.history("AAPL", date(2023, 1, 13), date(2023, 1, 18))
+        days = [day.strftime("%Y-%m-%d") for day in history.index]
+        self.assertEqual(days, ["2023-01-13", "2023-01-17"])
+
+    def test_recent_history(self) -> None:
+        """El período reciente se calcula desde la última fecha del archivo."""
+        history = self.provider.recent_history("AAPL", "5d")
+        self.assertGreater(len(history), 0)
+        self.assertLessEqual(len(history), 5)
+
+    def test_unknown_symbol(self) -> None:
+        """Un símbolo sin archivo genera un ValueError."""
+        with self.assertRaises(ValueError):
+            self.provider.history("XXXX", date(2023, 1, 1), date(2023, 2, 1))
+
+    def test_period_to_days(self) -> None:
+        """Conversión de períodos de yfinance a días calendario."""
+        self.assertEqual(period_to_days("5d"), 5)
+        self.assertEqual(period_to_days("2wk"), 14)
+        self.assertIsNone(period_to_days("max"))
+        with self.assertRaises(ValueError):
+            period_to_days("5x")
+
+
+class TestSyntheticProvider(unittest.TestCase):
+    """Tests básicos para la clase SyntheticProvider."""
+
+    def test_deterministic(self) -> None:
+        """Los mismos parámetros generan siempre los mismos precios."""
+        first = SyntheticProvider().history("SYM001", date(2023, 1, 1), date(2023, 2, 1))
+        second = SyntheticProvider().history("SYM001", date(2023, 1, 1), date(2023, 2, 1))
+        self.assertEqual(list(first["Close"]), list(second["Close"]))
+        self.assertTrue((first["Close"] > 0).all())
+
+    def test_symbols_differ(self) -> None:
+        """Cada símbolo tiene su propia serie de precios."""
+        provider = SyntheticProvider()
+        first = provider.history("SYM001", date(2023, 1, 1), date(2023, 2, 1))
+        second = provider.history("SYM002", date(2023, 1, 1), date(2023, 2, 1))
+        self.assertNotEqual(list(first["Close"]), list(second["Close"]))
+
+
+class TestRecordingProvider(unittest.TestCase):
+    """Tests básicos para la clase RecordingProvider."""
+
+    def test_record_and_replay(self) -> None:
+        """Lo grabado se reproduce luego con un FixtureProvider."""
+        with tempfile.TemporaryDirectory() as directory:
+            recorder = RecordingProvider(FixtureProvider(FIXTURES_DIR), directory)
+            recorded = recorder.history("MSFT", date(2023, 1, 3), date(2023, 1, 10))
+            recorder.history("MSFT", date(2023, 1, 9), date(2023, 1, 12))
+
+            replay = FixtureProvider(directory)
+            replayed = replay.history("MSFT", date(2023, 1, 3), date(2023, 1, 10))
+            self.assertEqual(list(replayed["Close"]), list(recorded["Close"]))
+            self.assertEqual(len(replay.load("MSFT")), 7)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+"""Tests para las métricas de riesgo del portfolio."""
+
+import unittest
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from classes.portfolio import Portfolio
+from classes.risk import daily_returns, drawdown, risk_metrics
+from utils.instrumentation import SOURCE_PROVIDER, record_fetches
+from utils.market import get_stock_history
+
+
+class TestDailyReturns(unittest.TestCase):
+    """Tests para daily_returns."""
+
+    def test_single_holding_matches_closes(self) -> None:
+        """Con un solo lote, los rendimientos son los de sus cierres."""
+        portfolio = Portfolio()
+        portfolio.add_stock("AAPL", "2023-01-03", 5)
+        returns = daily_returns(portfolio.to_frame(), "2023-01-03", "2023-03-31", "MSFT")
+
+        closes = get_stock_history("AAPL", datetime(2023, 1, 3), datetime(2023, 4, 1))["Close"]
+        expected = closes.pct_change().dropna()
+        np.testing.assert_allclose(returns["portfolio"].to_numpy(), expected.to_numpy())
+        self.assertEqual(list(returns.columns), ["portfolio", "benchmark"])
+
+    def test_purchases_are_not_returns(self) -> None:
+        """Una compra no modifica el rendimiento del día."""
+        single = Portfolio()
+        single.add_stock("MSFT", "2023-01-03", 2)
+        both = Portfolio()
+        both.add_stocks([("MSFT", "2023-01-03", 2), ("MSFT", "2023-02-01", 2)])
+        np.testing.assert_allclose(
+            daily_returns(both.to_frame(), "2023-01-01", "2023-06-30")["portfolio"].to_numpy(),
+            daily_returns(single.to_frame(), "2023-01-01", "2023-06-30")["portfolio"].to_numpy(),
+        )
+
+    def test_no_holdings(self) -> None:
+        """Un portfolio sin tenencias en el rango genera un ValueError."""
+        portfolio = Portfolio()
+        portfolio.add_stock("AAPL", "2024-06-03")
+        with self.assertRaises(ValueError):
+            daily_returns(portfolio.to_frame(), "2023-01-01", "2023-12-31")
+
+
+class TestRiskMetrics(unittest.TestCase):
+    """Tests para risk_metrics y drawdown."""
+
+    def test_known_series(self) -> None:
+        """Métricas de una serie conocida."""
+        returns = pd.Series([0.1, -0.2, 0.05, 0.1])
+        metrics = risk_metrics(returns, benchmark_returns=returns * 2, benchmark="SPY")
+        self.assertAlmostEqual(metrics["total_return"], 1.1 * 0.8 * 1.05 * 1.1 - 1)
+        self.assertAlmostEqual(metrics["max_drawdown"], -0.2)
+        self.assertAlmostEqual(metrics["volatility"], returns.std() * np.sqrt(252))
+        self.assertAlmostEqual(metrics["beta"] or 0.0, 0.5)
+        self.assertEqual(metrics["days"], 4)
+
+    def test_drawdown_from_start(self) -> None:
+        """Una caída desde el primer día se mide respecto del valor inicial."""
+        drawdowns = drawdown(pd.Series([-0.1, -0.1, 0.5]))
+        np.testing.assert_allclose(drawdowns.to_numpy(), [-0.1, -0.19, 0.0])
+
+    def test_too_few_returns(self) -> None:
+        """Se necesitan al menos dos rendimientos."""
+        with self.assertRaises(ValueError):
+            risk_metrics(pd.Series([0.01]))
+
+
+class TestPortfolioRisk(unittest.TestCase):
+    """Tests para Portfolio.risk y Portfolio.rolling_risk."""
+
+    def setUp(self) -> None:
+        self.portfolio = Portfolio()
+        self.portfolio.add_stocks([("AAPL", "2023-01-17", 3), ("MSFT", "2023-06-01", 2)])
+
+    def test_benchmark_against_itself(self) -> None:
+        """Un portfolio de un solo símbolo tiene beta 1 contra ese símbolo."""
+        portfolio = Portfolio()
+        portfolio.add_stock("GOOGL", "2023-03-01")
+        metrics = portfolio.risk("2023-01-01", "2024-06-28", benchmark="GOOGL")
+        self.assertAlmostEqual(metrics["beta"] or 0.0, 1.0)
+        self.assertEqual(metrics["benchmark"], "GOOGL")
+
+    def test_risk(self) -> None:
+        """Las métricas son coherentes con el rendimiento del portfolio."""
+        metrics = self.portfolio.risk("2023-01-01", "2024-06-28", risk_free_rate=0.04)
+        self.assertIsNone(metrics["beta"])
+        self.assertGreater(metrics["volatility"], 0)
+        self.assertLessEqual(metrics["max_drawdown"], 0)
+        lower = self.portfolio.risk("2023-01-01", "2024-06-28", risk_free_rate=0.0)
+        self.assertGreater(lower["sharpe_ratio"], metrics["sharpe_ratio"])
+
+    def test_reuses_history(self) -> None:
+        """Después de value_series, el riesgo no vuelve a consultar al proveedor."""
+        self.portfolio.value_series("2023-01-01", "2024-06-28")
+        with record_fetches() as recorder:
+            self.portfolio.risk("2023-01-01", "2024-06-28")
+        sources = {event["source"] for event in recorder.events}
+        self.assertNotIn(SOURCE_PROVIDER, sources)
+
+    def test_rolling_risk(self) -> None:
+        """La ventana móvil coincide con las métricas de la última ventana."""
+        series = self.portfolio.rolling_risk("2023-01-01", "2024-06-28", 20, benchmark="GOOGL")
+        self.assertEqual(
+            list(series.columns), ["returns", "drawdown", "volatility", "sharpe_ratio", "beta"]
+        )
+        self.assertTrue(series["volatility"].iloc[:19].isna().all())
+        last = risk_metrics(series["returns"].iloc[-20:])
+        self.assertAlmostEqual(series["volatility"].iloc[-1], last["volatility"])
+        self.assertAlmostEqual(series["sharpe_ratio"].iloc[-1], last["sharpe_ratio"])
+
+        with self.assertRaises(ValueError):
+            self.portfolio.rolling_risk("2023-01-01", "2024-06-28", window=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
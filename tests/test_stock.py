@@ -1,10 +1,12 @@
 """Tests para la clase Stock."""
 
 import unittest
+from datetime import datetime
 from typing import cast
 
-from classes.stock import Stock
+from classes.stock import Stock, resolve_stocks
 from models.portfolio import StockResult
+from utils.market import get_stock_price
 
 
 class TestStock(unittest.TestCase):
@@ -17,6 +19,49 @@ class TestStock(unittest.TestCase):
         self.assertEqual(stock.symbol, "AAPL")
         self.assertGreater(stock.purchase_price, 0)
 
+    def test_weekend_purchase(self) -> None:
+        """Una compra en fin de semana se ejecuta el siguiente día hábil."""
+        stock = Stock("AAPL", "2023-01-14")
+
+        # El lunes 16 es feriado (Martin Luther King Jr. Day)
+        self.assertEqual(stock.purchase_date, datetime(2023, 1, 17))
+        self.assertEqual(stock.purchase_price, get_stock_price("AAPL", datetime(2023, 1, 17)))
+
+    def test_lazy_stock(self) -> None:
+        """Una acción diferida se resuelve al acceder a su precio."""
+        stock = Stock("aapl", "2023-01-14", lazy=True)
+        self.assertFalse(stock.resolved)
+
+        self.assertEqual(stock.purchase_price, get_stock_price("AAPL", datetime(2023, 1, 17)))
+        self.assertTrue(stock.resolved)
+        self.assertEqual(stock.purchase_date, datetime(2023, 1, 17))
+
+    def test_resolve_stocks(self) -> None:
+        """La resolución en lote coincide con la construcción inmediata."""
+        stocks = [
+            Stock("AAPL", "2023-01-14", lazy=True),
+            Stock("MSFT", "2023-06-01", quantity=2, cost_basis=500.0, lazy=True),
+            Stock("XXXX", "2023-06-01", lazy=True),
+            Stock("GOOGL", "2030-01-01", lazy=True),
+        ]
+        errors = resolve_stocks(stocks)
+
+        self.assertEqual([error["symbol"] for error in errors], ["XXXX", "GOOGL"])
+        self.assertFalse(stocks[2].resolved)
+        eager = Stock("MSFT", "2023-06-01", quantity=2, cost_basis=500.0)
+        self.assertEqual(stocks[1].purchase_date, eager.purchase_date)
+        self.assertEqual(stocks[1].purchase_price, eager.purchase_price)
+        self.assertEqual(stocks[1].unit_cost, 250.0)
+        self.assertEqual(stocks[0].purchase_date, datetime(2023, 1, 17))
+
+    def test_invalid_cost(self) -> None:
+        """Un costo nulo o negativo se rechaza antes de calcular retornos."""
+        for cost in (0.0, -1.0):
+            with self.assertRaises(ValueError):
+                Stock("AAPL", "2023-01-17", cost_basis=cost, lazy=True)
+            with self.assertRaises(ValueError):
+                Stock.from_resolved("AAPL", "2023-01-17", datetime(2023, 1, 17), 135.0, cost, 1)
+
     def test_calculate_profit(self) -> None:
         """Test básico de cálculo de beneficio."""
         stock = Stock("AAPL", "2023-01-17")
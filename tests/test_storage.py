@@ -0,0 +1,70 @@
+"""Tests para el guardado y la carga en Parquet / Arrow."""
+
+import importlib.util
+import tempfile
+import unittest
+from pathlib import Path
+
+from classes.portfolio import Portfolio
+from classes.storage import load_portfolio, load_result, read_table, save_portfolio, save_result
+from utils.instrumentation import record_fetches
+
+
+@unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow no está instalado")
+class TestStorage(unittest.TestCase):
+    """Tests para save/load de tenencias y resultados."""
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.portfolio = Portfolio()
+        self.portfolio.add_stock("AAPL", "2023-01-14", quantity=3)
+        self.portfolio.add_stock("MSFT", "2023-06-01", quantity=2, cost_basis=600.0)
+        self.portfolio.add_stock("GOOGL", "2023-03-01", lazy=True)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_portfolio_round_trip(self) -> None:
+        """Un portfolio cargado se valúa igual que el original, sin consultas al cargarlo."""
+        paths = [Path(self.directory.name) / name for name in ("book.parquet", "book.arrow")]
+        for path in paths:
+            save_portfolio(self.portfolio, path)
+        for path in paths:
+            with record_fetches() as recorder:
+                loaded = load_portfolio(path)
+            self.assertEqual(recorder.events, [])
+
+            self.assertEqual(loaded.symbols, ["AAPL", "MSFT", "GOOGL"])
+            self.assertTrue(loaded.stocks[0].resolved)
+            self.assertFalse(loaded.stocks[2].resolved)
+            self.assertEqual(loaded.stocks[1].unit_cost, 300.0)
+            self.assertEqual(
+                loaded.profit("2023-01-01", "2024-06-28"),
+                self.portfolio.profit("2023-01-01", "2024-06-28"),
+            )
+
+    def test_currency_round_trip(self) -> None:
+        """Se conserva la moneda de cada lote."""
+        self.portfolio.add_stock("MSFT", "2023-07-03", currency="EUR")
+        path = Path(self.directory.name) / "book.parquet"
+        save_portfolio(self.portfolio, path)
+        loaded = load_portfolio(path)
+        self.assertEqual([stock.currency for stock in loaded.stocks], ["USD"] * 3 + ["EUR"])
+
+    def test_result_round_trip(self) -> None:
+        """Un resultado guardado conserva las filas y los totales."""
+        result = self.portfolio.profit("2023-01-01", "2024-06-28")
+        for name in ("result.parquet", "result.feather"):
+            path = Path(self.directory.name) / name
+            save_result(result, path)
+            self.assertEqual(load_result(path), result)
+            self.assertEqual(read_table(path).num_rows, 3)
+
+    def test_unsupported_extension(self) -> None:
+        """Una extensión desconocida genera un ValueError."""
+        with self.assertRaises(ValueError):
+            save_portfolio(self.portfolio, Path(self.directory.name) / "book.csv")
+
+
+if __name__ == "__main__":
+    unittest.main()
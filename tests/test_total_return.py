@@ -0,0 +1,208 @@
+"""Tests para la valuación con retorno total."""
+
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, Sequence
+from unittest import mock
+
+import pandas as pd
+
+from classes.portfolio import Portfolio
+from utils.instrumentation import SOURCE_PROVIDER, record_fetches
+from utils.market import get_stock_history
+from utils.providers import FixtureProvider, YFinanceProvider, get_provider, set_provider
+
+
+class FakeYFinance:
+    """
+    Reemplazo de yfinance con un dividendo de 1 sobre un cierre constante de 10.
+
+    Como Yahoo Finance, con auto_adjust=True (el valor por defecto) devuelve los
+    cierres anteriores a la fecha ex-dividendo ajustados por el dividendo.
+    """
+
+    def __init__(self) -> None:
+        days = pd.bdate_range("2023-01-02", "2023-03-31", name="Date")
+        self.raw = pd.DataFrame(
+            {
+                "Open": 10.0,
+                "High": 10.0,
+                "Low": 10.0,
+                "Close": 10.0,
+                "Volume": 1000.0,
+                "Dividends": 0.0,
+                "Stock Splits": 0.0,
+            },
+            index=days,
+        )
+        self.raw.loc["2023-03-01", "Dividends"] = 1.0
+
+    def _bars(self, start: Any, end: Any, auto_adjust: bool) -> pd.DataFrame:
+        bars: pd.DataFrame = self.raw.loc[(self.raw.index >= start) & (self.raw.index < end)].copy()
+        if auto_adjust:
+            before = bars.index < "2023-03-01"
+            bars.loc[before, ["Open", "High", "Low", "Close"]] *= 0.9
+        return bars
+
+    def Ticker(self, symbol: str) -> SimpleNamespace:
+        def history(
+            start: Any = None,
+            end: Any = None,
+            period: Any = None,
+            auto_adjust: bool = True,
+            **_: Any,
+        ) -> pd.DataFrame:
+            if period is not None:
+                return self._bars(
+                    self.raw.index[-5], self.raw.index[-1] + pd.Timedelta(days=1), auto_adjust
+                )
+            return self._bars(pd.Timestamp(start), pd.Timestamp(end), auto_adjust)
+
+        return SimpleNamespace(history=history)
+
+    def download(
+        self, symbols: Sequence[str], start: Any, end: Any, auto_adjust: bool = True, **_: Any
+    ) -> pd.DataFrame:
+        bars = self._bars(pd.Timestamp(start), pd.Timestamp(end), auto_adjust)
+        frames: Dict[str, pd.DataFrame] = {symbol: bars for symbol in symbols}
+        return pd.concat(frames, axis=1)
+
+
+class TestTotalReturn(unittest.TestCase):
+    """Tests para Portfolio.total_return con los fixtures."""
+
+    def setUp(self) -> None:
+        self.portfolio = Portfolio()
+        self.portfolio.add_stocks([("AAPL", "2023-01-17", 3), ("MSFT", "2023-06-01", 2)])
+
+    def test_reinvests_dividends(self) -> None:
+        """Cada dividendo se reinvierte al cierre de su fecha ex-dividendo."""
+        result = self.portfolio.total_return("2023-01-01", "2024-06-28")
+        history = get_stock_history("AAPL", datetime(2023, 1, 18), datetime(2024, 6, 29))
+        shares = 3.0
+        income = 0.0
+        for close, dividend in zip(history["Close"], history["Dividends"]):
+            income += shares * dividend
+            shares += shares * dividend / close
+
+        aapl = result["stocks"][0]
+        self.assertAlmostEqual(aapl["shares"], shares)
+        self.assertAlmostEqual(aapl["dividends"], income)
+        self.assertAlmostEqual(aapl["end_value"], shares * aapl["end_price"])
+        self.assertAlmostEqual(
+            result["total_profit"], result["total_value"] - result["total_investment"]
+        )
+
+    def test_exceeds_price_return(self) -> None:
+        """Con dividendos, el retorno total supera al de profit."""
+        total = self.portfolio.total_return("2023-01-01", "2024-06-28")
+        price = self.portfolio.profit("2023-01-01", "2024-06-28")
+        self.assertEqual(total["total_investment"], price["total_investment"])
+        self.assertGreater(total["total_dividends"], 0)
+        self.assertGreater(total["total_profit"], price["total_profit"])
+        self.assertGreater(total["annualized_return"], price["annualized_return"])
+
+    def test_single_fetch(self) -> None:
+        """Precios y eventos corporativos salen de una sola consulta al proveedor."""
+        portfolio = Portfolio()
+        portfolio.add_stock("GOOGL", "2023-03-01")
+        with record_fetches() as recorder:
+            portfolio.total_return("2023-02-01", "2024-03-28")
+        fetches = [event for event in recorder.events if event["source"] == SOURCE_PROVIDER]
+        self.assertEqual(len(fetches), 1)
+
+    def test_empty(self) -> None:
+        """Un portfolio vacío tiene retorno total nulo."""
+        self.assertEqual(Portfolio().total_return("2023-01-01", "2024-06-28")["stocks"], [])
+
+
+class TestSplits(unittest.TestCase):
+    """Tests de splits con un historial propio."""
+
+    def setUp(self) -> None:
+        self.previous = get_provider()
+        self.directory = tempfile.TemporaryDirectory()
+        days = pd.bdate_range("2023-01-02", "2023-03-31", name="Date")
+        history = pd.DataFrame(
+            {
+                "Open": 10.0,
+                "High": 10.0,
+                "Low": 10.0,
+                "Close": 10.0,
+                "Volume": 1000.0,
+                "Dividends": 0.0,
+                "Stock Splits": 0.0,
+            },
+            index=days,
+        )
+        history.loc["2023-02-01", "Stock Splits"] = 4.0
+        history.loc["2023-03-01", "Dividends"] = 1.0
+        history.to_csv(Path(self.directory.name) / "SPLT.csv")
+        set_provider(FixtureProvider(self.directory.name))
+
+    def tearDown(self) -> None:
+        set_provider(self.previous)
+        self.directory.cleanup()
+
+    def test_split_multiplies_shares(self) -> None:
+        """Un split multiplica las acciones del lote y el valor final es acciones por cierre."""
+        portfolio = Portfolio()
+        portfolio.add_stock("SPLT", "2023-01-03", 5)
+        stock = portfolio.total_return("2023-01-01", "2023-03-31")["stocks"][0]
+
+        # El cierre del proveedor ya está ajustado: antes del split cotizaba a 40
+        self.assertAlmostEqual(stock["purchase_price"], 40.0)
+        self.assertAlmostEqual(stock["shares"], 5 * 4 * 1.1)
+        self.assertAlmostEqual(stock["dividends"], 20.0)
+        self.assertAlmostEqual(stock["end_value"], stock["shares"] * stock["end_price"])
+        self.assertAlmostEqual(stock["end_value"], 220.0)
+        self.assertAlmostEqual(stock["profit"], 20.0)
+
+    def test_split_with_cost_basis(self) -> None:
+        """Un lote con costo indicado y un split sin cambio de precio no tiene pérdida."""
+        portfolio = Portfolio()
+        portfolio.add_stock("SPLT", "2023-01-03", 5, cost_basis=200.0)
+        result = portfolio.total_return("2023-01-01", "2023-02-28")
+        stock = result["stocks"][0]
+        self.assertAlmostEqual(stock["shares"], 20.0)
+        self.assertAlmostEqual(stock["end_value"], 200.0)
+        self.assertAlmostEqual(result["total_profit"], 0.0)
+        self.assertAlmostEqual(result["annualized_return"], 0.0)
+
+    def test_bought_on_ex_date(self) -> None:
+        """Las acciones compradas en la fecha ex-dividendo no cobran el dividendo."""
+        portfolio = Portfolio()
+        portfolio.add_stock("SPLT", "2023-03-01", 5)
+        stock = portfolio.total_return("2023-01-01", "2023-03-31")["stocks"][0]
+        self.assertEqual(stock["dividends"], 0.0)
+        self.assertEqual(stock["shares"], 5.0)
+
+
+class TestYFinanceDividends(unittest.TestCase):
+    """Tests del retorno total con los datos de yfinance."""
+
+    def setUp(self) -> None:
+        self.previous = get_provider()
+        set_provider(YFinanceProvider())
+
+    def tearDown(self) -> None:
+        set_provider(self.previous)
+
+    def test_dividends_counted_once(self) -> None:
+        """Los cierres se piden sin ajustar, por lo que el dividendo se reinvierte una vez."""
+        with mock.patch("utils.providers._yfinance", return_value=FakeYFinance()):
+            portfolio = Portfolio()
+            portfolio.add_stock("DIVD", "2023-01-03", 5)
+            result = portfolio.total_return("2023-01-01", "2023-03-31")
+        stock = result["stocks"][0]
+        self.assertAlmostEqual(stock["purchase_price"], 10.0)
+        self.assertAlmostEqual(stock["dividends"], 5.0)
+        self.assertAlmostEqual(stock["end_value"], 55.0)
+        self.assertAlmostEqual(result["total_profit"], 5.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,17 +1,123 @@
-"""Utilidades para el portfolio de stocks."""
+"""
+Utilidades para el portfolio de stocks.
+
+Los nombres exportados se importan al primer uso, por lo que importar el
+paquete (o sólo utils.formatting) no carga pandas ni yfinance.
+"""
+
+import importlib
+from typing import TYPE_CHECKING, Any, List
 
 from .formatting import format_currency, format_percentage, print_logo, print_stock_info
-from .market import (
-    calculate_annualized_return,
-    calculate_years_between,
-    get_next_trading_day,
-    get_stock_history,
-    get_stock_price,
-    get_ticker,
-    is_trading_day,
-    validate_dates,
-    validate_symbol,
-)
+from .fx import DEFAULT_CURRENCY, fx_symbol, fx_symbols, normalize_currency
+
+if TYPE_CHECKING:
+    from .aio import (
+        aget_stock_history,
+        aget_stock_price,
+        aget_stock_prices,
+        aget_trading_day_price,
+        avalidate_symbol,
+        get_max_concurrency,
+        set_max_concurrency,
+    )
+    from .cache import PriceCache, get_price_cache, set_price_cache
+    from .instrumentation import (
+        FetchEvent,
+        FetchRecorder,
+        add_fetch_hook,
+        operation,
+        record_fetches,
+        remove_fetch_hook,
+    )
+    from .market import (
+        calculate_annualized_return,
+        calculate_years_between,
+        get_next_trading_day,
+        get_stock_histories,
+        get_stock_history,
+        get_stock_price,
+        get_stock_prices,
+        get_ticker,
+        get_trading_day_price,
+        get_trading_day_prices,
+        is_trading_day,
+        validate_dates,
+        validate_symbol,
+    )
+    from .memo import PriceMemo, get_price_memo, set_price_memo
+    from .price_index import PriceIndex, get_price_index, set_price_index
+    from .providers import (
+        FixtureProvider,
+        MarketDataProvider,
+        RecordingProvider,
+        SyntheticProvider,
+        YFinanceProvider,
+        get_provider,
+        set_provider,
+    )
+
+# Módulo que define cada nombre exportado que se importa al primer uso
+_LAZY_ATTRIBUTES = {
+    "aget_stock_history": "aio",
+    "aget_stock_price": "aio",
+    "aget_stock_prices": "aio",
+    "aget_trading_day_price": "aio",
+    "avalidate_symbol": "aio",
+    "get_max_concurrency": "aio",
+    "set_max_concurrency": "aio",
+    "PriceCache": "cache",
+    "get_price_cache": "cache",
+    "set_price_cache": "cache",
+    "FetchEvent": "instrumentation",
+    "FetchRecorder": "instrumentation",
+    "add_fetch_hook": "instrumentation",
+    "operation": "instrumentation",
+    "record_fetches": "instrumentation",
+    "remove_fetch_hook": "instrumentation",
+    "calculate_annualized_return": "market",
+    "calculate_years_between": "market",
+    "get_next_trading_day": "market",
+    "get_stock_histories": "market",
+    "get_stock_history": "market",
+    "get_stock_price": "market",
+    "get_stock_prices": "market",
+    "get_ticker": "market",
+    "get_trading_day_price": "market",
+    "get_trading_day_prices": "market",
+    "is_trading_day": "market",
+    "validate_dates": "market",
+    "validate_symbol": "market",
+    "PriceMemo": "memo",
+    "get_price_memo": "memo",
+    "set_price_memo": "memo",
+    "PriceIndex": "price_index",
+    "get_price_index": "price_index",
+    "set_price_index": "price_index",
+    "FixtureProvider": "providers",
+    "MarketDataProvider": "providers",
+    "RecordingProvider": "providers",
+    "SyntheticProvider": "providers",
+    "YFinanceProvider": "providers",
+    "get_provider": "providers",
+    "set_provider": "providers",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Importa el módulo que define un nombre exportado al primer acceso."""
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    """Nombres del paquete, incluidos los que todavía no se importaron."""
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
 
 __all__ = [
     "format_currency",
@@ -19,12 +125,49 @@ __all__ = [
     "print_logo",
     "print_stock_info",
     "get_next_trading_day",
+    "get_trading_day_price",
+    "get_trading_day_prices",
     "get_stock_history",
     "get_stock_price",
+    "get_stock_histories",
+    "get_stock_prices",
     "get_ticker",
     "is_trading_day",
     "validate_symbol",
     "calculate_years_between",
     "validate_dates",
     "calculate_annualized_return",
+    "PriceCache",
+    "get_price_cache",
+    "set_price_cache",
+    "PriceMemo",
+    "get_price_memo",
+    "set_price_memo",
+    "PriceIndex",
+    "get_price_index",
+    "set_price_index",
+    "MarketDataProvider",
+    "YFinanceProvider",
+    "FixtureProvider",
+    "RecordingProvider",
+    "SyntheticProvider",
+    "get_provider",
+    "set_provider",
+    "FetchEvent",
+    "FetchRecorder",
+    "add_fetch_hook",
+    "remove_fetch_hook",
+    "operation",
+    "record_fetches",
+    "aget_stock_history",
+    "aget_stock_price",
+    "aget_stock_prices",
+    "aget_trading_day_price",
+    "avalidate_symbol",
+    "get_max_concurrency",
+    "set_max_concurrency",
+    "DEFAULT_CURRENCY",
+    "fx_symbol",
+    "fx_symbols",
+    "normalize_currency",
 ]
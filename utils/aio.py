@@ -0,0 +1,116 @@
+"""
+API asíncrona de datos de mercado para servicios basados en asyncio.
+
+Las consultas se ejecutan en hilos con asyncio.to_thread, por lo que no
+bloquean el event loop, y comparten el caché en disco, la memoización y el
+proveedor activos con la API sincrónica. Un límite de concurrencia
+configurable acota la cantidad de consultas simultáneas al proveedor.
+"""
+
+import asyncio
+import weakref
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Optional, Tuple, TypeVar
+
+import pandas as pd
+
+from utils.market import (
+    get_stock_history,
+    get_stock_price,
+    get_stock_prices,
+    get_trading_day_price,
+    validate_symbol,
+)
+
+T = TypeVar("T")
+
+# Cantidad máxima de consultas simultáneas por defecto
+DEFAULT_MAX_CONCURRENCY = 8
+
+_max_concurrency = DEFAULT_MAX_CONCURRENCY
+# Un semáforo por event loop, ya que asyncio.Semaphore queda asociado a un loop
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_max_concurrency() -> int:
+    """Obtiene la cantidad máxima de consultas simultáneas."""
+    return _max_concurrency
+
+
+def set_max_concurrency(limit: int) -> None:
+    """
+    Cambia la cantidad máxima de consultas simultáneas.
+
+    Args:
+        limit: Cantidad máxima de consultas en curso por event loop
+
+    Raises:
+        ValueError: Si el límite no es mayor a cero
+    """
+    global _max_concurrency
+    if limit <= 0:
+        raise ValueError("El límite de concurrencia debe ser mayor a cero")
+    _max_concurrency = limit
+    _semaphores.clear()
+
+
+def _semaphore() -> asyncio.Semaphore:
+    """Semáforo del event loop en curso."""
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(_max_concurrency)
+        _semaphores[loop] = semaphore
+    return semaphore
+
+
+async def run_limited(func: Callable[..., T], *args: object, **kwargs: object) -> T:
+    """
+    Ejecuta una función sincrónica en un hilo respetando el límite de concurrencia.
+
+    Args:
+        func: Función a ejecutar
+        *args: Argumentos de la función
+        **kwargs: Argumentos por nombre de la función
+
+    Returns:
+        El resultado de la función
+    """
+    async with _semaphore():
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+
+async def aget_stock_history(
+    symbol: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    period: Optional[str] = None,
+) -> pd.DataFrame:
+    """Versión asíncrona de get_stock_history."""
+    return await run_limited(get_stock_history, symbol, start, end, period)
+
+
+async def aget_stock_price(symbol: str, date: datetime) -> float:
+    """Versión asíncrona de get_stock_price."""
+    return await run_limited(get_stock_price, symbol, date)
+
+
+async def aget_stock_prices(
+    requests: Iterable[Tuple[str, datetime]],
+) -> Dict[Tuple[str, datetime], float]:
+    """Versión asíncrona de get_stock_prices."""
+    return await run_limited(get_stock_prices, list(requests))
+
+
+async def aget_trading_day_price(
+    symbol: str, date: datetime, max_attempts: int = 10
+) -> Tuple[datetime, float]:
+    """Versión asíncrona de get_trading_day_price."""
+    return await run_limited(get_trading_day_price, symbol, date, max_attempts)
+
+
+async def avalidate_symbol(symbol: str) -> None:
+    """Versión asíncrona de validate_symbol."""
+    await run_limited(validate_symbol, symbol)
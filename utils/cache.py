@@ -0,0 +1,312 @@
+"""Caché persistente en disco para el historial diario de precios."""
+
+import os
+import sqlite3
+import threading
+from datetime import date, datetime
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import pandas as pd
+
+# Columnas de eventos corporativos: dividendo por acción y proporción del split
+ACTION_COLUMNS = ["Dividends", "Stock Splits"]
+
+# Columnas que se guardan por símbolo y fecha: OHLCV y eventos corporativos
+BAR_COLUMNS = ["Open", "High", "Low", "Close", "Volume", *ACTION_COLUMNS]
+
+# Versión del esquema, guardada en PRAGMA user_version
+SCHEMA_VERSION = 2
+
+# Variable de entorno para cambiar la ubicación del caché
+CACHE_DIR_ENV = "STOCKS_PORTFOLIO_CACHE_DIR"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bars (
+    symbol TEXT NOT NULL,
+    date TEXT NOT NULL,
+    open REAL,
+    high REAL,
+    low REAL,
+    close REAL,
+    volume REAL,
+    dividends REAL,
+    splits REAL,
+    PRIMARY KEY (symbol, date)
+);
+CREATE TABLE IF NOT EXISTS coverage (
+    symbol TEXT NOT NULL,
+    start TEXT NOT NULL,
+    end TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS coverage_symbol ON coverage (symbol);
+"""
+
+
+def _to_day(value: datetime | date) -> date:
+    """Normaliza un datetime o date a un date."""
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+class PriceCache:
+    """
+    Caché SQLite de barras diarias OHLCV por símbolo y fecha.
+
+    Cada barra guarda también los dividendos y splits del día, por lo que la
+    valuación con retorno total no requiere consultas adicionales.
+
+    Además de las barras, se guardan los rangos de fechas ya consultados
+    (cobertura), de modo que los días sin barra dentro de un rango cubierto
+    (fines de semana, feriados) no generan nuevas consultas. Los rangos se
+    manejan como intervalos semiabiertos [start, end), igual que yfinance.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        """
+        Abre (o crea) el caché en la ruta indicada.
+
+        Args:
+            path: Ruta al archivo SQLite, o ":memory:" para un caché en memoria
+        """
+        self.path = str(path)
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+            self._migrate()
+
+    def _migrate(self) -> None:
+        """
+        Actualiza un caché creado con una versión anterior del esquema.
+
+        Los cachés de la versión 1 no tienen las columnas de dividendos y
+        splits: se agregan y se descarta la cobertura, de modo que las barras
+        se vuelvan a consultar (con sus eventos corporativos) al usarlas.
+        """
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            return
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(bars)")}
+        if "dividends" not in columns:
+            self._conn.execute("ALTER TABLE bars ADD COLUMN dividends REAL")
+            self._conn.execute("ALTER TABLE bars ADD COLUMN splits REAL")
+            self._conn.execute("DELETE FROM coverage")
+        self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self) -> None:
+        """Cierra la conexión con la base de datos."""
+        with self._lock:
+            self._conn.close()
+
+    def covered_ranges(self, symbol: str) -> List[Tuple[date, date]]:
+        """Devuelve los rangos cubiertos para un símbolo, ordenados por fecha."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT start, end FROM coverage WHERE symbol = ? ORDER BY start",
+                (symbol,),
+            ).fetchall()
+        return [(date.fromisoformat(s), date.fromisoformat(e)) for s, e in rows]
+
+    def missing_ranges(
+        self, symbol: str, start: datetime | date, end: datetime | date
+    ) -> List[Tuple[date, date]]:
+        """
+        Calcula los rangos de [start, end) que todavía no están en el caché.
+
+        Args:
+            symbol: Símbolo de la acción
+            start: Fecha inicial (inclusive)
+            end: Fecha final (exclusiva)
+
+        Returns:
+            list: Rangos (inicio, fin) semiabiertos que faltan consultar
+        """
+        cursor = _to_day(start)
+        stop = _to_day(end)
+        missing: List[Tuple[date, date]] = []
+        for covered_start, covered_end in self.covered_ranges(symbol):
+            if cursor >= stop:
+                break
+            if covered_end <= cursor:
+                continue
+            if covered_start > cursor:
+                missing.append((cursor, min(covered_start, stop)))
+            cursor = max(cursor, covered_end)
+        if cursor < stop:
+            missing.append((cursor, stop))
+        return missing
+
+    def store(
+        self,
+        symbol: str,
+        start: datetime | date,
+        end: datetime | date,
+        history: pd.DataFrame,
+    ) -> bool:
+        """
+        Guarda las barras de un rango consultado y lo marca como cubierto.
+
+        Los proveedores ajustan todo el historial anterior a un split (los
+        cierres no se ajustan por dividendos). Si el rango trae un split
+        posterior al último que conoce el caché, las barras guardadas de otros
+        rangos están en otra base de precios, por lo que se descartan junto con
+        su cobertura antes de guardar las nuevas.
+
+        Args:
+            symbol: Símbolo de la acción
+            start: Fecha inicial del rango consultado (inclusive)
+            end: Fecha final del rango consultado (exclusiva)
+            history: Historial devuelto por el proveedor para ese rango
+
+        Returns:
+            bool: True si se descartaron las barras guardadas del símbolo y hay
+                que volver a consultar los demás rangos
+        """
+        start_day = _to_day(start)
+        end_day = _to_day(end)
+        if end_day <= start_day:
+            return False
+
+        rows = []
+        latest_split: Optional[str] = None
+        if not history.empty:
+            frame = history.reindex(columns=BAR_COLUMNS)
+            # Los proveedores sin eventos corporativos se guardan sin dividendos ni splits
+            frame[ACTION_COLUMNS] = frame[ACTION_COLUMNS].fillna(0.0)
+            days = pd.DatetimeIndex(frame.index).strftime("%Y-%m-%d")
+            splits = (frame["Stock Splits"] != 0).to_numpy()
+            if splits.any():
+                latest_split = str(days[splits].max())
+            for day, values in zip(days, frame.itertuples(index=False)):
+                rows.append((symbol, day, *[None if pd.isna(v) else float(v) for v in values]))
+
+        with self._lock, self._conn:
+            invalidated = latest_split is not None and self._is_new_split(symbol, latest_split)
+            if invalidated:
+                self._conn.execute("DELETE FROM bars WHERE symbol = ?", (symbol,))
+                self._conn.execute("DELETE FROM coverage WHERE symbol = ?", (symbol,))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO bars VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._merge_coverage(symbol, start_day, end_day)
+        return invalidated
+
+    def _is_new_split(self, symbol: str, day: str) -> bool:
+        """Indica si un split es posterior a los guardados de un símbolo con barras."""
+        known, has_bars = self._conn.execute(
+            "SELECT MAX(CASE WHEN splits != 0 THEN date END), COUNT(*) "
+            "FROM bars WHERE symbol = ?",
+            (symbol,),
+        ).fetchone()
+        return bool(has_bars) and (known is None or day > known)
+
+    def _merge_coverage(self, symbol: str, start: date, end: date) -> None:
+        """Agrega un rango cubierto fusionándolo con los adyacentes o solapados."""
+        overlapping = self._conn.execute(
+            "SELECT start, end FROM coverage WHERE symbol = ? AND start <= ? AND end >= ?",
+            (symbol, end.isoformat(), start.isoformat()),
+        ).fetchall()
+        for covered_start, covered_end in overlapping:
+            start = min(start, date.fromisoformat(covered_start))
+            end = max(end, date.fromisoformat(covered_end))
+        self._conn.execute(
+            "DELETE FROM coverage WHERE symbol = ? AND start <= ? AND end >= ?",
+            (symbol, end.isoformat(), start.isoformat()),
+        )
+        self._conn.execute(
+            "INSERT INTO coverage VALUES (?, ?, ?)",
+            (symbol, start.isoformat(), end.isoformat()),
+        )
+
+    def read(self, symbol: str, start: datetime | date, end: datetime | date) -> pd.DataFrame:
+        """
+        Lee del caché las barras de [start, end).
+
+        Args:
+            symbol: Símbolo de la acción
+            start: Fecha inicial (inclusive)
+            end: Fecha final (exclusiva)
+
+        Returns:
+            pd.DataFrame: Barras indexadas por fecha con las columnas BAR_COLUMNS
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT date, open, high, low, close, volume, dividends, splits FROM bars "
+                "WHERE symbol = ? AND date >= ? AND date < ? ORDER BY date",
+                (symbol, _to_day(start).isoformat(), _to_day(end).isoformat()),
+            ).fetchall()
+        frame: pd.DataFrame = pd.DataFrame(
+            [row[1:] for row in rows],
+            index=pd.DatetimeIndex([row[0] for row in rows], name="Date"),
+            columns=BAR_COLUMNS,
+            dtype=float,
+        )
+        return frame
+
+    def last_close(self, symbol: str) -> Optional[float]:
+        """Devuelve el último precio de cierre guardado para un símbolo, si existe."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT close FROM bars WHERE symbol = ? AND close IS NOT NULL "
+                "ORDER BY date DESC LIMIT 1",
+                (symbol,),
+            ).fetchone()
+        return None if row is None else float(row[0])
+
+    def clear(self, symbol: Optional[str] = None) -> None:
+        """Elimina las entradas del caché, de un símbolo o de todos."""
+        with self._lock, self._conn:
+            if symbol is None:
+                self._conn.execute("DELETE FROM bars")
+                self._conn.execute("DELETE FROM coverage")
+            else:
+                self._conn.execute("DELETE FROM bars WHERE symbol = ?", (symbol,))
+                self._conn.execute("DELETE FROM coverage WHERE symbol = ?", (symbol,))
+
+
+def cacheable_until(today: Optional[date] = None) -> date:
+    """
+    Devuelve el límite (exclusivo) de fechas que se pueden guardar en el caché.
+
+    Las barras del día en curso todavía pueden cambiar, por lo que sólo se
+    guardan las de días ya cerrados.
+    """
+    return today or date.today()
+
+
+def default_cache_path() -> Path:
+    """Ruta por defecto del caché, configurable con STOCKS_PORTFOLIO_CACHE_DIR."""
+    base = os.environ.get(CACHE_DIR_ENV) or Path.home() / ".cache" / "stocks-portfolio"
+    return Path(base) / "prices.sqlite3"
+
+
+_price_cache: Optional[PriceCache] = None
+_cache_disabled = False
+
+
+def get_price_cache() -> Optional[PriceCache]:
+    """Obtiene el caché de precios activo, creándolo en la ruta por defecto."""
+    global _price_cache
+    if _cache_disabled:
+        return None
+    if _price_cache is None:
+        _price_cache = PriceCache(default_cache_path())
+    return _price_cache
+
+
+def set_price_cache(cache: Optional[PriceCache]) -> None:
+    """
+    Reemplaza el caché de precios activo.
+
+    Args:
+        cache: Caché a utilizar, o None para desactivar el caché en disco
+    """
+    global _price_cache, _cache_disabled
+    _price_cache = cache
+    _cache_disabled = cache is None
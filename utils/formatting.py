@@ -3,24 +3,43 @@
 import logging
 
 from models.portfolio import StockResult
+from utils.fx import DEFAULT_CURRENCY, normalize_currency
 
 logger = logging.getLogger(__name__)
 
+# Símbolo de las monedas más usadas; el resto se muestra con su código
+CURRENCY_SYMBOLS = {
+    "USD": "$",
+    "EUR": "€",
+    "GBP": "£",
+    "JPY": "¥",
+    "ARS": "AR$",
+    "BRL": "R$",
+    "MXN": "MX$",
+    "CAD": "CA$",
+}
+
 
 def print_stock_info(stock: StockResult) -> None:
     """Print detailed stock information."""
     logger.info(f"\n{stock['symbol']}:")
     logger.info(f"  Fecha de compra: {stock['purchase_date']}")
+    logger.info(f"  Cantidad: {stock['quantity']:g}")
     logger.info(f"  Precio de compra: {format_currency(stock['purchase_price'])}")
     logger.info(f"  Precio actual: {format_currency(stock['end_price'])}")
     logger.info(f"  Beneficio: {format_currency(stock['profit'])}")
-    logger.info(f"  Rendimiento: {format_percentage(stock['profit']/stock['purchase_price']*100)}")
+    investment = stock["purchase_price"] * stock["quantity"]
+    logger.info(f"  Rendimiento: {format_percentage(stock['profit']/investment*100)}")
     logger.info(f"  Retorno anualizado: {format_percentage(stock['annualized_return']*100)}")
 
 
-def format_currency(amount: float) -> str:
-    """Format a number as currency."""
-    return f"${amount:,.2f}"
+def format_currency(amount: float, currency: str = DEFAULT_CURRENCY) -> str:
+    """Format a number as currency, with the currency symbol or its ISO code."""
+    code = normalize_currency(currency)
+    symbol = CURRENCY_SYMBOLS.get(code)
+    if symbol is None:
+        return f"{amount:,.2f} {code}"
+    return f"{symbol}{amount:,.2f}"
 
 
 def format_percentage(value: float) -> str:
@@ -0,0 +1,69 @@
+"""
+Monedas y tipos de cambio.
+
+Los tipos de cambio se obtienen como una serie diaria por par de monedas con
+los símbolos de Yahoo Finance (ej: EURUSD=X es el precio de un euro en
+dólares), por lo que se descargan, se guardan en el caché y se memoizan igual
+que los historiales de las acciones.
+"""
+
+import re
+from typing import Dict, Iterable
+
+# Moneda de las acciones cuando no se indica otra
+DEFAULT_CURRENCY = "USD"
+
+_CURRENCY_CODE = re.compile(r"^[A-Z]{3}$")
+
+
+def normalize_currency(currency: str) -> str:
+    """
+    Valida un código de moneda ISO 4217 y lo devuelve en mayúsculas.
+
+    Args:
+        currency: Código de la moneda (ej: usd, EUR, ARS)
+
+    Returns:
+        str: El código en mayúsculas
+
+    Raises:
+        ValueError: Si el código no tiene tres letras
+    """
+    code = currency.strip().upper()
+    if not _CURRENCY_CODE.match(code):
+        raise ValueError(f"Moneda inválida: {currency}")
+    return code
+
+
+def fx_symbol(currency: str, reporting_currency: str) -> str:
+    """
+    Símbolo de la serie de tipo de cambio de una moneda a otra.
+
+    Args:
+        currency: Moneda de origen (ej: EUR)
+        reporting_currency: Moneda de destino (ej: USD)
+
+    Returns:
+        str: Símbolo cuyo precio es el valor de una unidad de currency en
+            reporting_currency (ej: EURUSD=X)
+    """
+    return f"{normalize_currency(currency)}{normalize_currency(reporting_currency)}=X"
+
+
+def fx_symbols(currencies: Iterable[str], reporting_currency: str) -> Dict[str, str]:
+    """
+    Símbolos de tipo de cambio necesarios para convertir varias monedas.
+
+    Args:
+        currencies: Monedas de las tenencias, con repeticiones
+        reporting_currency: Moneda de reporte
+
+    Returns:
+        dict: Símbolo de la serie por moneda distinta de la de reporte
+    """
+    reporting = normalize_currency(reporting_currency)
+    return {
+        currency: fx_symbol(currency, reporting)
+        for currency in dict.fromkeys(currencies)
+        if currency != reporting
+    }
@@ -0,0 +1,187 @@
+"""Instrumentación de las consultas de datos de mercado."""
+
+import contextlib
+import contextvars
+import json
+import logging
+import threading
+from datetime import date, datetime
+from typing import Callable, Iterator, List, Optional, Sequence, TypedDict
+
+import pandas as pd
+
+# Origen de los datos de una consulta
+SOURCE_PROVIDER = "provider"
+SOURCE_DISK = "disk"
+SOURCE_MEMO = "memo"
+SOURCE_INDEX = "index"
+
+# Operación por defecto cuando no hay ninguna etiqueta activa
+DEFAULT_OPERATION = "get_stock_history"
+
+
+class FetchEvent(TypedDict):
+    """Registro de una consulta de datos de mercado."""
+
+    operation: str
+    kind: str
+    symbols: List[str]
+    start: Optional[str]
+    end: Optional[str]
+    rows: int
+    source: str
+    cache_hit: bool
+    latency_s: float
+    parse_s: float
+
+
+FetchHook = Callable[[FetchEvent], None]
+
+_hooks: List[FetchHook] = []
+_hooks_lock = threading.Lock()
+_operation: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "fetch_operation", default=DEFAULT_OPERATION
+)
+
+
+def add_fetch_hook(hook: FetchHook) -> None:
+    """Registra una función que recibe cada consulta realizada."""
+    with _hooks_lock:
+        _hooks.append(hook)
+
+
+def remove_fetch_hook(hook: FetchHook) -> None:
+    """Quita una función registrada con add_fetch_hook."""
+    with _hooks_lock:
+        if hook in _hooks:
+            _hooks.remove(hook)
+
+
+@contextlib.contextmanager
+def operation(name: str) -> Iterator[None]:
+    """
+    Etiqueta las consultas realizadas dentro del bloque con una operación.
+
+    Args:
+        name: Nombre de la operación (ej: validate_symbol, next_trading_day)
+    """
+    token = _operation.set(name)
+    try:
+        yield
+    finally:
+        _operation.reset(token)
+
+
+def _isoformat(value: Optional[datetime | date]) -> Optional[str]:
+    """Convierte una fecha a texto ISO, conservando None."""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        value = value.date()
+    return value.isoformat()
+
+
+def record_fetch(
+    kind: str,
+    symbols: Sequence[str],
+    start: Optional[datetime | date],
+    end: Optional[datetime | date],
+    rows: int,
+    source: str,
+    latency_s: float = 0.0,
+    parse_s: float = 0.0,
+) -> None:
+    """
+    Notifica una consulta a las funciones registradas.
+
+    Args:
+        kind: Tipo de consulta (history, recent_history, download, price)
+        symbols: Símbolos consultados
+        start: Fecha inicial del rango consultado
+        end: Fecha final (exclusiva) del rango consultado
+        rows: Cantidad de filas obtenidas
+        source: Origen de los datos (provider, disk o memo)
+        latency_s: Segundos de espera de la consulta
+        parse_s: Segundos de procesamiento del resultado con pandas
+    """
+    if not _hooks:
+        return
+    event: FetchEvent = {
+        "operation": _operation.get(),
+        "kind": kind,
+        "symbols": list(symbols),
+        "start": _isoformat(start),
+        "end": _isoformat(end),
+        "rows": rows,
+        "source": source,
+        "cache_hit": source != SOURCE_PROVIDER,
+        "latency_s": latency_s,
+        "parse_s": parse_s,
+    }
+    with _hooks_lock:
+        hooks = list(_hooks)
+    for hook in hooks:
+        hook(event)
+
+
+class FetchRecorder:
+    """Acumula las consultas realizadas y las resume."""
+
+    def __init__(self) -> None:
+        """Inicializa un registro vacío."""
+        self.events: List[FetchEvent] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, event: FetchEvent) -> None:
+        """Agrega una consulta al registro."""
+        with self._lock:
+            self.events.append(event)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Devuelve las consultas registradas como una tabla, una fila por consulta."""
+        frame: pd.DataFrame = pd.DataFrame(self.events, columns=list(FetchEvent.__annotations__))
+        return frame
+
+    def summary(self) -> pd.DataFrame:
+        """
+        Resume las consultas por operación y origen de los datos.
+
+        Returns:
+            pd.DataFrame: Cantidad de consultas, filas, aciertos de caché y
+                segundos totales y promedio de espera y de procesamiento
+        """
+        frame = self.to_frame()
+        summary: pd.DataFrame = frame.groupby(["operation", "source"]).agg(
+            calls=("kind", "size"),
+            rows=("rows", "sum"),
+            cache_hits=("cache_hit", "sum"),
+            latency_s=("latency_s", "sum"),
+            mean_latency_s=("latency_s", "mean"),
+            parse_s=("parse_s", "sum"),
+        )
+        return summary
+
+    def log(self, logger: logging.Logger, level: int = logging.INFO) -> None:
+        """Emite cada consulta registrada como un log estructurado en JSON."""
+        with self._lock:
+            events = list(self.events)
+        for event in events:
+            logger.log(level, json.dumps(event))
+
+
+@contextlib.contextmanager
+def record_fetches() -> Iterator[FetchRecorder]:
+    """
+    Registra las consultas realizadas dentro del bloque.
+
+    Ejemplo:
+        with record_fetches() as recorder:
+            portfolio.profit("2023-01-01", "2024-01-01")
+        print(recorder.summary())
+    """
+    recorder = FetchRecorder()
+    add_fetch_hook(recorder)
+    try:
+        yield recorder
+    finally:
+        remove_fetch_hook(recorder)
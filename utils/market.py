@@ -1,15 +1,101 @@
 """Utilidades de datos de mercado para operaciones con acciones."""
 
-from datetime import datetime, timedelta
-from typing import Optional, Tuple, cast
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, cast
 
+import numpy as np
 import pandas as pd
-import yfinance as yf  # type: ignore
+
+from utils.cache import PriceCache, cacheable_until, get_price_cache
+from utils.instrumentation import (
+    SOURCE_DISK,
+    SOURCE_INDEX,
+    SOURCE_MEMO,
+    SOURCE_PROVIDER,
+    operation,
+    record_fetch,
+)
+from utils.memo import get_price_memo
+from utils.price_index import get_price_index
+from utils.providers import get_provider, get_ticker  # noqa: F401
+
+# Días hacia atrás en los que se busca el último cierre de una fecha sin barra
+# (fines de semana, feriados y cierres prolongados del mercado)
+PRICE_LOOKBACK_DAYS = 30
+
+
+def _normalize_history(history: pd.DataFrame) -> pd.DataFrame:
+    """Normaliza el índice del historial a fechas sin zona horaria."""
+    index = pd.DatetimeIndex(history.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    history.index = index.normalize().rename("Date")
+    return history
+
+
+def _fetch_history(symbol: str, start: datetime | date, end: datetime | date) -> pd.DataFrame:
+    """Consulta al proveedor el historial diario del rango [start, end)."""
+    started = time.perf_counter()
+    raw = get_provider().history(symbol, start, end)
+    fetched = time.perf_counter()
+    history = _normalize_history(raw)
+    record_fetch(
+        "history",
+        [symbol],
+        start,
+        end,
+        len(history),
+        SOURCE_PROVIDER,
+        latency_s=fetched - started,
+        parse_s=time.perf_counter() - fetched,
+    )
+    return history
 
 
-def get_ticker(symbol: str) -> yf.Ticker:
-    """Obtiene un ticker para el símbolo especificado."""
-    return yf.Ticker(symbol)
+def _download_histories(
+    symbols: Sequence[str], start: datetime | date, end: datetime | date
+) -> Dict[str, pd.DataFrame]:
+    """Consulta al proveedor el historial de varios símbolos en una única descarga."""
+    started = time.perf_counter()
+    raw = get_provider().download(symbols, start, end)
+    fetched = time.perf_counter()
+    histories = {symbol: _normalize_history(raw[symbol]) for symbol in symbols}
+    record_fetch(
+        "download",
+        symbols,
+        start,
+        end,
+        sum(len(history) for history in histories.values()),
+        SOURCE_PROVIDER,
+        latency_s=fetched - started,
+        parse_s=time.perf_counter() - fetched,
+    )
+    return histories
+
+
+def _store_period(cache: PriceCache, symbol: str, history: pd.DataFrame) -> None:
+    """Guarda en el caché las barras cerradas de una consulta por período."""
+    closed = history[pd.DatetimeIndex(history.index).date < cacheable_until()]
+    if not closed.empty:
+        first = closed.index[0].date()
+        last = closed.index[-1].date()
+        cache.store(symbol, first, last + timedelta(days=1), closed)
+
+
+def _index_history(
+    symbol: str, history: pd.DataFrame, start: datetime | date, end: datetime | date
+) -> None:
+    """Registra en el índice de cierres el historial obtenido para [start, end)."""
+    index = get_price_index()
+    if index is not None:
+        index.add(symbol, history, start, end)
+
+
+def _is_recent(day: datetime | date) -> bool:
+    """Indica si una fecha corresponde al día en curso o a uno posterior."""
+    value = day.date() if isinstance(day, datetime) else day
+    return value >= date.today()
 
 
 def get_stock_history(
@@ -18,34 +104,364 @@ def get_stock_history(
     end: Optional[datetime] = None,
     period: Optional[str] = None,
 ) -> pd.DataFrame:
-    """Obtiene el historial de precios de una acción."""
-    ticker = get_ticker(symbol)
+    """
+    Obtiene el historial de precios de una acción.
+
+    Las consultas repetidas se sirven desde la memoización en memoria. Las
+    barras de días ya cerrados se sirven desde el caché en disco y sólo se
+    consultan al proveedor los rangos que faltan. El día en curso siempre se
+    consulta, ya que su precio todavía puede cambiar.
+    """
+    memo = get_price_memo()
+    if memo is None:
+        return _load_stock_history(symbol, start, end, period)
+
+    key = ("history", symbol, start, end, period)
+    cached = memo.get(key)
+    if cached is not None:
+        copy: pd.DataFrame = cast(pd.DataFrame, cached).copy()
+        record_fetch("history", [symbol], start, end, len(copy), SOURCE_MEMO)
+        return copy
+
+    history = _load_stock_history(symbol, start, end, period)
+    # Incluye el día en curso si se pidió un período o el rango llega hasta hoy
+    until = end or (start + timedelta(days=1) if start is not None else None)
+    recent = period is not None or until is None or _is_recent(until - timedelta(days=1))
+    memo.set(key, history.copy(), recent=recent)
+    return history
+
+
+def _load_stock_history(
+    symbol: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    period: Optional[str] = None,
+) -> pd.DataFrame:
+    """Obtiene el historial de precios desde el caché en disco o el proveedor."""
+    cache = get_price_cache()
     if period:
-        history: pd.DataFrame = ticker.history(period=period)
+        started = time.perf_counter()
+        raw = get_provider().recent_history(symbol, period)
+        fetched = time.perf_counter()
+        history = _normalize_history(raw)
+        record_fetch(
+            "recent_history",
+            [symbol],
+            None,
+            None,
+            len(history),
+            SOURCE_PROVIDER,
+            latency_s=fetched - started,
+            parse_s=time.perf_counter() - fetched,
+        )
+        if cache is not None:
+            _store_period(cache, symbol, history)
         return history
     if start is None:
         raise ValueError("Debe especificar start o period")
-    history = ticker.history(start=start, end=end or start + timedelta(days=1), interval="1d")
+    end = end or start + timedelta(days=1)
+    if cache is None:
+        history = _fetch_history(symbol, start, end)
+        _index_history(symbol, history, start, end)
+        return history
+
+    # Completamos en el caché los rangos de días cerrados que falten. Si un
+    # split nuevo invalida las barras guardadas, se vuelven a calcular los
+    # rangos que faltan
+    limit = cacheable_until()
+    cached_end = min(end.date(), limit)
+    missing = cache.missing_ranges(symbol, start, cached_end)
+    while missing:
+        for missing_start, missing_end in missing:
+            history = _fetch_history(symbol, missing_start, missing_end)
+            if cache.store(symbol, missing_start, missing_end, history):
+                missing = cache.missing_ranges(symbol, start, cached_end)
+                break
+        else:
+            missing = []
+    started = time.perf_counter()
+    history = cache.read(symbol, start, cached_end)
+    record_fetch(
+        "history",
+        [symbol],
+        start,
+        cached_end,
+        len(history),
+        SOURCE_DISK,
+        latency_s=time.perf_counter() - started,
+    )
+
+    # El tramo que incluye el día en curso se consulta siempre al proveedor
+    if end.date() > limit:
+        live = _fetch_history(symbol, max(start.date(), limit), end)
+        history = (
+            live if history.empty else pd.concat([history, live.reindex(columns=history.columns)])
+        )
+    _index_history(symbol, history, start, end)
     return history
 
 
-def get_stock_price(symbol: str, date: datetime) -> float:
-    """Obtiene el precio de cierre de una acción para una fecha específica."""
-    try:
-        # Intentamos obtener el precio para la fecha específica
-        hist = get_stock_history(symbol, start=date)
-        if len(hist) > 0:
-            return float(hist["Close"].iloc[0])
+def get_stock_histories(
+    symbols: Iterable[str], start: datetime, end: datetime
+) -> Dict[str, pd.DataFrame]:
+    """
+    Obtiene el historial de precios de varias acciones con una única descarga.
+
+    Se consulta al proveedor un solo rango que cubre todo lo que falta en el
+    caché para el conjunto de símbolos, en lugar de una consulta por símbolo.
+    Los historiales ya obtenidos para el mismo rango se sirven desde la
+    memoización en memoria.
+
+    Args:
+        symbols: Símbolos de las acciones
+        start: Fecha inicial (inclusive)
+        end: Fecha final (exclusiva)
+
+    Returns:
+        dict: Historial por símbolo con las barras de [start, end)
+    """
+    unique_symbols = list(dict.fromkeys(symbols))
+    memo = get_price_memo()
+    if memo is None or not unique_symbols:
+        return _load_stock_histories(unique_symbols, start, end)
+
+    # Comparte las claves de get_stock_history, por lo que un rango ya obtenido
+    # por cualquiera de las dos funciones no vuelve a consultarse
+    histories: Dict[str, pd.DataFrame] = {}
+    for symbol in unique_symbols:
+        cached = memo.get(("history", symbol, start, end, None))
+        if cached is not None:
+            histories[symbol] = cast(pd.DataFrame, cached).copy()
+    if histories:
+        record_fetch(
+            "download",
+            list(histories),
+            start,
+            end,
+            sum(len(history) for history in histories.values()),
+            SOURCE_MEMO,
+        )
+    pending = [symbol for symbol in unique_symbols if symbol not in histories]
+    if pending:
+        recent = _is_recent(end - timedelta(days=1))
+        for symbol, history in _load_stock_histories(pending, start, end).items():
+            memo.set(("history", symbol, start, end, None), history.copy(), recent=recent)
+            histories[symbol] = history
+    return {symbol: histories[symbol] for symbol in unique_symbols}
+
+
+def _load_stock_histories(
+    unique_symbols: Sequence[str], start: datetime, end: datetime
+) -> Dict[str, pd.DataFrame]:
+    """Obtiene el historial de varias acciones desde el caché en disco o el proveedor."""
+    if not unique_symbols:
+        return {}
+    cache = get_price_cache()
+    if cache is None:
+        histories = _download_histories(unique_symbols, start, end)
+        for symbol, history in histories.items():
+            _index_history(symbol, history, start, end)
+        return histories
+
+    # Unión de los rangos de días cerrados que faltan en el caché
+    limit = cacheable_until()
+    cached_end = min(end.date(), limit)
+    missing = {symbol: cache.missing_ranges(symbol, start, cached_end) for symbol in unique_symbols}
+    pending = [symbol for symbol, ranges in missing.items() if ranges]
+    while pending:
+        fetch_start = min(ranges[0][0] for ranges in missing.values() if ranges)
+        fetch_end = max(ranges[-1][1] for ranges in missing.values() if ranges)
+        fetched = _download_histories(pending, fetch_start, fetch_end)
+        # Los símbolos cuyas barras se invalidaron por un split nuevo vuelven
+        # a consultarse
+        invalidated = [
+            symbol
+            for symbol in pending
+            if cache.store(symbol, fetch_start, fetch_end, fetched[symbol])
+        ]
+        missing = {
+            symbol: cache.missing_ranges(symbol, start, cached_end) for symbol in invalidated
+        }
+        pending = [symbol for symbol, ranges in missing.items() if ranges]
+
+    started = time.perf_counter()
+    histories = {symbol: cache.read(symbol, start, cached_end) for symbol in unique_symbols}
+    record_fetch(
+        "download",
+        unique_symbols,
+        start,
+        cached_end,
+        sum(len(history) for history in histories.values()),
+        SOURCE_DISK,
+        latency_s=time.perf_counter() - started,
+    )
+
+    # El tramo que incluye el día en curso se consulta siempre al proveedor
+    if end.date() > limit:
+        live = _download_histories(unique_symbols, max(start.date(), limit), end)
+        for symbol in unique_symbols:
+            today = live[symbol]
+            history = histories[symbol]
+            histories[symbol] = (
+                today
+                if history.empty
+                else pd.concat([history, today.reindex(columns=history.columns)])
+            )
+    for symbol, history in histories.items():
+        _index_history(symbol, history, start, end)
+    return histories
+
+
+def _asof_closes(history: pd.DataFrame, dates: List[datetime]) -> np.ndarray:
+    """
+    Obtiene de un historial ya descargado el cierre vigente en cada fecha.
+
+    Se usa la barra de la fecha o, si no existe, el último cierre de los
+    PRICE_LOOKBACK_DAYS días anteriores, con una búsqueda binaria sobre las
+    fechas del historial.
+
+    Returns:
+        np.ndarray: Cierre de cada fecha, o NaN si no hay datos
+    """
+    days = pd.DatetimeIndex(history.index).normalize().to_numpy().astype("datetime64[D]")
+    closes = history["Close"].to_numpy(dtype=float) if "Close" in history else np.empty(0)
+    queries = pd.DatetimeIndex(dates).normalize().to_numpy().astype("datetime64[D]")
+    positions = np.searchsorted(days, queries, side="right") - 1
+    prices = np.full(len(queries), np.nan)
+    if len(days):
+        bars = days[np.maximum(positions, 0)]
+        valid = (positions >= 0) & (queries - bars <= np.timedelta64(PRICE_LOOKBACK_DAYS, "D"))
+        prices[valid] = closes[positions[valid]]
+    return prices
+
+
+def _missing_price(symbol: str) -> ValueError:
+    """Error de un precio sin datos históricos en el rango buscado."""
+    return ValueError(
+        f"Error al obtener el precio para {symbol}: "
+        f"No se encontraron datos históricos para {symbol}"
+    )
+
+
+def _prices_from_index(
+    pairs: Sequence[Tuple[str, datetime]],
+) -> Dict[Tuple[str, datetime], float]:
+    """Resuelve desde el índice de cierres los pares cuyo rango ya fue consultado."""
+    index = get_price_index()
+    if index is None:
+        return {}
+    by_symbol: Dict[str, List[datetime]] = {}
+    for symbol, day in pairs:
+        by_symbol.setdefault(symbol, []).append(day)
+
+    prices: Dict[Tuple[str, datetime], float] = {}
+    for symbol, days in by_symbol.items():
+        closes = index.asof(symbol, days, PRICE_LOOKBACK_DAYS)
+        found = [(day, close) for day, close in zip(days, closes.tolist()) if not np.isnan(close)]
+        if found:
+            record_fetch("price", [symbol], found[0][0], None, len(found), SOURCE_INDEX)
+        for day, close in found:
+            prices[(symbol, day)] = close
+    return prices
+
+
+def get_stock_prices(requests: Iterable[Tuple[str, datetime]]) -> Dict[Tuple[str, datetime], float]:
+    """
+    Obtiene los precios de cierre de varios pares (símbolo, fecha) en una sola descarga.
+
+    Los pares cuyo rango ya fue consultado se resuelven desde el índice de
+    cierres; el resto se obtiene con una única descarga.
+
+    Args:
+        requests: Pares (símbolo, fecha) a consultar
+
+    Returns:
+        dict: Precio de cierre para cada par (símbolo, fecha)
 
-        # Si no hay datos para esa fecha, buscamos el último precio disponible
-        # Buscamos hasta 10 días antes para encontrar el último precio
-        hist = get_stock_history(symbol, start=date - timedelta(days=10), end=date)
-        if len(hist) > 0:
-            return float(hist["Close"].iloc[-1])  # Tomamos el último precio disponible
+    Raises:
+        ValueError: Si no hay datos para alguno de los pares
+    """
+    pairs = list(dict.fromkeys(requests))
+    prices: Dict[Tuple[str, datetime], float] = {}
+
+    # Los pares ya consultados se sirven desde la memoización
+    memo = get_price_memo()
+    if memo is not None:
+        for symbol, day in pairs:
+            cached = memo.get(("price", symbol, day))
+            if cached is not None:
+                prices[(symbol, day)] = cast(float, cached)
+                record_fetch("price", [symbol], day, None, 1, SOURCE_MEMO)
+        pairs = [pair for pair in pairs if pair not in prices]
+
+    indexed = _prices_from_index(pairs)
+    pairs = [pair for pair in pairs if pair not in indexed]
+    if pairs:
+        dates = [date for _, date in pairs]
+        start = min(dates) - timedelta(days=PRICE_LOOKBACK_DAYS)
+        end = max(dates) + timedelta(days=1)
+        try:
+            with operation("batch_prices"):
+                histories = get_stock_histories((symbol for symbol, _ in pairs), start, end)
+        except Exception as e:
+            raise ValueError(f"Error al obtener los precios: {str(e)}")
+        by_symbol: Dict[str, List[datetime]] = {}
+        for symbol, day in pairs:
+            by_symbol.setdefault(symbol, []).append(day)
+        for symbol, days in by_symbol.items():
+            closes = _asof_closes(histories[symbol], days)
+            if np.isnan(closes).any():
+                raise _missing_price(symbol)
+            indexed.update(zip(((symbol, day) for day in days), closes.tolist()))
+
+    for (symbol, day), price in indexed.items():
+        prices[(symbol, day)] = price
+        if memo is not None:
+            memo.set(("price", symbol, day), price, recent=_is_recent(day))
+    return prices
+
+
+def get_stock_price(symbol: str, date: datetime) -> float:
+    """
+    Obtiene el precio de cierre de una acción para una fecha específica.
 
-        raise ValueError(f"No se encontraron datos históricos para {symbol}")
+    Si la fecha no tiene barra (fin de semana o feriado) se usa el último
+    cierre de los PRICE_LOOKBACK_DAYS días anteriores. Las fechas de rangos
+    ya consultados se resuelven desde el índice de cierres y el resto con
+    una única consulta que incluye los días anteriores.
+    """
+    memo = get_price_memo()
+    if memo is None:
+        return _load_stock_price(symbol, date)
+
+    key = ("price", symbol, date)
+    cached = memo.get(key)
+    if cached is not None:
+        record_fetch("price", [symbol], date, None, 1, SOURCE_MEMO)
+        return cast(float, cached)
+    price = _load_stock_price(symbol, date)
+    memo.set(key, price, recent=_is_recent(date))
+    return price
+
+
+def _load_stock_price(symbol: str, date: datetime) -> float:
+    """Obtiene el precio de cierre de una fecha desde el índice o consultando el historial."""
+    indexed = _prices_from_index([(symbol, date)])
+    if indexed:
+        return indexed[(symbol, date)]
+    try:
+        with operation("price_asof"):
+            hist = get_stock_history(
+                symbol,
+                start=date - timedelta(days=PRICE_LOOKBACK_DAYS),
+                end=date + timedelta(days=1),
+            )
     except Exception as e:
         raise ValueError(f"Error al obtener el precio para {symbol}: {str(e)}")
+    price = float(_asof_closes(hist, [date])[0])
+    if np.isnan(price):
+        raise _missing_price(symbol)
+    return price
 
 
 def is_trading_day(symbol: str, date: datetime) -> bool:
@@ -57,25 +473,106 @@ def is_trading_day(symbol: str, date: datetime) -> bool:
         return False
 
 
-def get_next_trading_day(symbol: str, date: datetime, max_attempts: int = 10) -> datetime:
-    """Obtiene el siguiente día de trading disponible."""
-    next_day = date
-    attempts = 0
+def get_trading_day_price(
+    symbol: str, date: datetime, max_attempts: int = 10
+) -> Tuple[datetime, float]:
+    """
+    Obtiene el siguiente día de trading y su precio de cierre con una sola consulta.
+
+    Args:
+        symbol: Símbolo de la acción
+        date: Fecha a partir de la cual buscar (inclusive)
+        max_attempts: Cantidad de días calendario a revisar
+
+    Returns:
+        tuple: (día de trading, precio de cierre)
 
-    while not is_trading_day(symbol, next_day) and attempts < max_attempts:
-        next_day += timedelta(days=1)
-        attempts += 1
+    Raises:
+        ValueError: Si no hay días de trading en el rango revisado
+    """
+    try:
+        with operation("next_trading_day"):
+            hist = get_stock_history(symbol, start=date, end=date + timedelta(days=max_attempts))
+    except Exception:
+        hist = pd.DataFrame()
 
-    if attempts >= max_attempts:
+    if hist.empty:
         raise ValueError(f"No se encontró día de trading después de {date} para {symbol}")
+    return _first_trading_day(hist, symbol)
+
 
-    return next_day
+def _first_trading_day(history: pd.DataFrame, symbol: str) -> Tuple[datetime, float]:
+    """Obtiene el día y el cierre de la primera barra de un historial ya descargado."""
+    trading_day = pd.Timestamp(history.index[0]).to_pydatetime()
+    price = float(history["Close"].iloc[0])
+
+    # El precio queda disponible para consultas posteriores del mismo día
+    memo = get_price_memo()
+    if memo is not None:
+        memo.set(("price", symbol, trading_day), price, recent=_is_recent(trading_day))
+    return trading_day, price
+
+
+def get_trading_day_prices(
+    requests: Iterable[Tuple[str, datetime]], max_attempts: int = 10
+) -> Dict[Tuple[str, datetime], Tuple[datetime, float]]:
+    """
+    Obtiene el siguiente día de trading y su cierre de varios pares en una sola descarga.
+
+    Args:
+        requests: Pares (símbolo, fecha a partir de la cual buscar)
+        max_attempts: Cantidad de días calendario a revisar por par
+
+    Returns:
+        dict: (día de trading, precio de cierre) para cada par (símbolo, fecha).
+            Los pares sin días de trading en el rango revisado no se incluyen
+
+    Raises:
+        ValueError: Si falla la descarga de los historiales
+    """
+    pairs = list(dict.fromkeys(requests))
+    if not pairs:
+        return {}
+    dates = [date for _, date in pairs]
+    try:
+        with operation("next_trading_day"):
+            histories = get_stock_histories(
+                (symbol for symbol, _ in pairs),
+                min(dates),
+                max(dates) + timedelta(days=max_attempts),
+            )
+    except Exception as e:
+        raise ValueError(f"Error al obtener los días de trading: {str(e)}")
+
+    found: Dict[Tuple[str, datetime], Tuple[datetime, float]] = {}
+    for symbol, day in pairs:
+        history = histories[symbol]
+        index = pd.DatetimeIndex(history.index)
+        first = pd.Timestamp(day)
+        window = history.loc[(index >= first) & (index < first + pd.Timedelta(days=max_attempts))]
+        if not window.empty:
+            found[(symbol, day)] = _first_trading_day(window, symbol)
+    return found
+
+
+def get_next_trading_day(symbol: str, date: datetime, max_attempts: int = 10) -> datetime:
+    """Obtiene el siguiente día de trading disponible."""
+    trading_day, _ = get_trading_day_price(symbol, date, max_attempts)
+    return trading_day
 
 
 def validate_symbol(symbol: str) -> None:
     """Valida si un símbolo existe y tiene datos disponibles."""
+    # Un símbolo con precios válidos en el caché ya fue validado anteriormente
+    cache = get_price_cache()
+    if cache is not None:
+        cached_close = cache.last_close(symbol)
+        if cached_close is not None and cached_close > 0:
+            return
+
     try:
-        hist = get_stock_history(symbol, period="5d")
+        with operation("validate_symbol"):
+            hist = get_stock_history(symbol, period="5d")
 
         if hist.empty:
             raise ValueError(f"No se encontraron datos históricos para {symbol}")
@@ -0,0 +1,120 @@
+"""Memoización en memoria de consultas de precios con desalojo LRU."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple, TypedDict
+
+
+class MemoStats(TypedDict):
+    """Contadores de uso de la memoización."""
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+
+
+class PriceMemo:
+    """
+    Caché en memoria acotado (LRU) para precios e historiales.
+
+    Las entradas de fechas pasadas no vencen; las que incluyen el día en curso
+    vencen después de `recent_ttl` segundos para que los precios intradiarios
+    se actualicen.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 4096,
+        recent_ttl: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Inicializa la memoización.
+
+        Args:
+            maxsize: Cantidad máxima de entradas antes de desalojar las menos usadas
+            recent_ttl: Segundos de validez de las entradas del día en curso
+            clock: Función que devuelve el tiempo actual en segundos
+        """
+        if maxsize <= 0:
+            raise ValueError("El tamaño máximo debe ser mayor a cero")
+        self.maxsize = maxsize
+        self.recent_ttl = recent_ttl
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Devuelve el valor guardado para la clave, o None si no existe o venció."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires = entry
+                if expires is None or expires > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, key: Hashable, value: Any, recent: bool = False) -> None:
+        """
+        Guarda un valor.
+
+        Args:
+            key: Clave de la consulta
+            value: Valor a guardar
+            recent: Si el valor incluye el día en curso y debe vencer
+        """
+        expires = self._clock() + self.recent_ttl if recent else None
+        with self._lock:
+            self._entries[key] = (value, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Elimina todas las entradas y reinicia los contadores."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> MemoStats:
+        """Devuelve los contadores de aciertos, fallos y desalojos."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
+
+_price_memo: Optional[PriceMemo] = PriceMemo()
+
+
+def get_price_memo() -> Optional[PriceMemo]:
+    """Obtiene la memoización de precios activa, o None si está desactivada."""
+    return _price_memo
+
+
+def set_price_memo(memo: Optional[PriceMemo]) -> None:
+    """
+    Reemplaza la memoización de precios activa.
+
+    Args:
+        memo: Memoización a utilizar, o None para desactivarla
+    """
+    global _price_memo
+    _price_memo = memo
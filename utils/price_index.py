@@ -0,0 +1,189 @@
+"""
+Índice en memoria de los cierres ya obtenidos, ordenado por fecha.
+
+Cada historial diario que se obtiene por rango queda registrado por símbolo
+como un arreglo ordenado de fechas y cierres junto con los rangos consultados.
+El precio de una fecha sin barra (fin de semana o feriado) se resuelve con una
+búsqueda binaria del último cierre anterior, sin volver a consultar al
+proveedor, y varias fechas se resuelven con una sola búsqueda vectorizada.
+"""
+
+import threading
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.cache import cacheable_until
+
+
+def _day(value: datetime | date) -> np.datetime64:
+    """Convierte una fecha a datetime64 con resolución diaria."""
+    day: np.datetime64 = np.datetime64(pd.Timestamp(value).normalize().date(), "D")
+    return day
+
+
+class _SymbolIndex:
+    """Cierres ordenados por fecha y rangos consultados de un símbolo."""
+
+    __slots__ = ("days", "closes", "coverage", "latest_split")
+
+    def __init__(self) -> None:
+        self.days: np.ndarray = np.empty(0, dtype="datetime64[D]")
+        self.closes: np.ndarray = np.empty(0, dtype=float)
+        # Rangos [inicio, fin) consultados, ordenados y sin superposición
+        self.coverage: List[Tuple[np.datetime64, np.datetime64]] = []
+        # Fecha del último split registrado
+        self.latest_split: Optional[np.datetime64] = None
+
+
+class PriceIndex:
+    """
+    Índice de cierres por símbolo con búsqueda del precio vigente en O(log n).
+
+    Sólo se registran las barras de días ya cerrados, igual que en el caché en
+    disco; el día en curso siempre se consulta al proveedor. Como en el caché,
+    un split posterior a los registrados descarta los cierres previos del
+    símbolo, que quedaron con otra base de ajuste.
+    """
+
+    def __init__(self) -> None:
+        """Inicializa un índice vacío."""
+        self._symbols: Dict[str, _SymbolIndex] = {}
+        self._lock = threading.Lock()
+
+    def add(
+        self, symbol: str, history: pd.DataFrame, start: datetime | date, end: datetime | date
+    ) -> None:
+        """
+        Registra el historial obtenido para un rango.
+
+        Args:
+            symbol: Símbolo de la acción
+            history: Historial con las barras de [start, end)
+            start: Fecha inicial del rango consultado (inclusive)
+            end: Fecha final del rango consultado (exclusiva)
+        """
+        first = _day(start)
+        limit = _day(cacheable_until())
+        last = min(_day(end), limit)
+        if last <= first:
+            return
+
+        days = pd.DatetimeIndex(history.index).normalize().to_numpy().astype("datetime64[D]")
+        closes = history["Close"].to_numpy(dtype=float)
+        keep = (days >= first) & (days < last) & ~np.isnan(closes)
+        if "Stock Splits" in history:
+            splits = np.nan_to_num(history["Stock Splits"].to_numpy(dtype=float)) != 0
+        else:
+            splits = np.zeros(len(days), dtype=bool)
+        split_days = days[keep & splits]
+        days = days[keep]
+        closes = closes[keep]
+        latest_split = split_days.max() if len(split_days) else None
+
+        with self._lock:
+            entry = self._symbols.get(symbol)
+            if entry is None or _is_new_split(entry, latest_split):
+                entry = self._symbols[symbol] = _SymbolIndex()
+            if latest_split is not None and (
+                entry.latest_split is None or latest_split > entry.latest_split
+            ):
+                entry.latest_split = latest_split
+            # Las barras nuevas reemplazan a las ya registradas del mismo día
+            merged_days, positions = np.unique(
+                np.concatenate([days, entry.days]), return_index=True
+            )
+            entry.days = merged_days
+            entry.closes = np.concatenate([closes, entry.closes])[positions]
+            entry.coverage = _merge_ranges(entry.coverage, (first, last))
+
+    def asof(self, symbol: str, dates: List[datetime], lookback: int) -> np.ndarray:
+        """
+        Obtiene el cierre vigente de un símbolo en cada fecha.
+
+        Se usa la barra de la fecha o, si no existe, el último cierre de los
+        `lookback` días anteriores. Una fecha sólo se resuelve si todo el
+        tramo entre esa barra y la fecha fue consultado, por lo que la falta
+        de una barra nunca se confunde con un rango no consultado.
+
+        Args:
+            symbol: Símbolo de la acción
+            dates: Fechas a consultar
+            lookback: Cantidad máxima de días entre la fecha y la barra usada
+
+        Returns:
+            np.ndarray: Cierre de cada fecha, o NaN si no puede resolverse
+                con los datos registrados
+        """
+        queries = pd.DatetimeIndex(dates).normalize().to_numpy().astype("datetime64[D]")
+        prices = np.full(len(queries), np.nan)
+        with self._lock:
+            entry = self._symbols.get(symbol)
+            if entry is None or not len(entry.days) or not len(queries):
+                return prices
+            days = entry.days
+            closes = entry.closes
+            starts = np.array([first for first, _ in entry.coverage], dtype="datetime64[D]")
+            ends = np.array([last for _, last in entry.coverage], dtype="datetime64[D]")
+
+        positions = np.searchsorted(days, queries, side="right") - 1
+        found = positions >= 0
+        bars = days[np.maximum(positions, 0)]
+        ranges = np.searchsorted(starts, queries, side="right") - 1
+        covered = (ranges >= 0) & (queries < ends[np.maximum(ranges, 0)])
+        covered &= starts[np.maximum(ranges, 0)] <= bars
+        valid = found & covered & (queries - bars <= np.timedelta64(lookback, "D"))
+        prices[valid] = closes[positions[valid]]
+        return prices
+
+    def clear(self) -> None:
+        """Elimina todos los historiales registrados."""
+        with self._lock:
+            self._symbols.clear()
+
+    def __len__(self) -> int:
+        """Cantidad de barras registradas entre todos los símbolos."""
+        with self._lock:
+            return sum(len(entry.days) for entry in self._symbols.values())
+
+
+def _is_new_split(entry: _SymbolIndex, day: Optional[np.datetime64]) -> bool:
+    """Indica si un split es posterior a los registrados de un símbolo."""
+    if day is None or not len(entry.days):
+        return False
+    return entry.latest_split is None or bool(day > entry.latest_split)
+
+
+def _merge_ranges(
+    ranges: List[Tuple[np.datetime64, np.datetime64]],
+    new: Tuple[np.datetime64, np.datetime64],
+) -> List[Tuple[np.datetime64, np.datetime64]]:
+    """Agrega un rango [inicio, fin) uniendo los que se superponen o son contiguos."""
+    merged: List[Tuple[np.datetime64, np.datetime64]] = []
+    for first, last in sorted([*ranges, new]):
+        if merged and first <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], last))
+        else:
+            merged.append((first, last))
+    return merged
+
+
+_price_index: Optional[PriceIndex] = PriceIndex()
+
+
+def get_price_index() -> Optional[PriceIndex]:
+    """Obtiene el índice de cierres activo, o None si está desactivado."""
+    return _price_index
+
+
+def set_price_index(index: Optional[PriceIndex]) -> None:
+    """
+    Reemplaza el índice de cierres activo.
+
+    Args:
+        index: Índice a utilizar, o None para desactivarlo
+    """
+    global _price_index
+    _price_index = index
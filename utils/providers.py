@@ -0,0 +1,361 @@
+"""Proveedores de datos de mercado intercambiables."""
+
+import os
+import re
+import threading
+import zlib
+from abc import ABC, abstractmethod
+from datetime import date, datetime
+from pathlib import Path
+from types import ModuleType
+from typing import TYPE_CHECKING, Dict, Optional, Sequence, cast
+
+import numpy as np
+import pandas as pd
+
+if TYPE_CHECKING:
+    import yfinance as yf  # type: ignore
+
+# Variable de entorno para usar fixtures locales en lugar de yfinance
+FIXTURES_DIR_ENV = "STOCKS_PORTFOLIO_FIXTURES"
+
+_PERIOD_PATTERN = re.compile(r"^(\d+)(d|wk|mo|y)$")
+_PERIOD_DAYS = {"d": 1, "wk": 7, "mo": 31, "y": 366}
+
+
+def _yfinance() -> ModuleType:
+    """
+    Importa yfinance al momento de la primera consulta.
+
+    yfinance demora cientos de milisegundos en importarse y no se necesita
+    cuando los datos provienen del caché o de fixtures.
+    """
+    import yfinance  # type: ignore
+
+    module: ModuleType = yfinance
+    return module
+
+
+def get_ticker(symbol: str) -> "yf.Ticker":
+    """Obtiene un ticker para el símbolo especificado."""
+    return _yfinance().Ticker(symbol)
+
+
+def period_to_days(period: str) -> Optional[int]:
+    """
+    Convierte un período de yfinance (ej: 5d, 1mo, 1y) a días calendario.
+
+    Returns:
+        int: Cantidad de días, o None si el período es "max"
+    """
+    if period == "max":
+        return None
+    match = _PERIOD_PATTERN.match(period)
+    if match is None:
+        raise ValueError(f"Período inválido: {period}")
+    return int(match.group(1)) * _PERIOD_DAYS[match.group(2)]
+
+
+class MarketDataProvider(ABC):
+    """Interfaz común para las fuentes de historial diario de precios."""
+
+    @abstractmethod
+    def history(self, symbol: str, start: datetime | date, end: datetime | date) -> pd.DataFrame:
+        """
+        Obtiene el historial diario de un símbolo en el rango [start, end).
+
+        Los precios están ajustados por splits pero no por dividendos, que se
+        informan aparte en la columna Dividends.
+
+        Returns:
+            pd.DataFrame: Barras indexadas por fecha con las columnas de yfinance
+                (Open, High, Low, Close, Volume, Dividends, Stock Splits)
+        """
+
+    @abstractmethod
+    def recent_history(self, symbol: str, period: str) -> pd.DataFrame:
+        """Obtiene el historial diario más reciente de un símbolo (ej: period="5d")."""
+
+    def download(
+        self, symbols: Sequence[str], start: datetime | date, end: datetime | date
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Obtiene el historial diario de varios símbolos en el rango [start, end).
+
+        La implementación por defecto consulta cada símbolo por separado; los
+        proveedores con soporte de descargas múltiples la reemplazan por una
+        única consulta.
+
+        Returns:
+            dict: Historial por símbolo
+        """
+        return {symbol: self.history(symbol, start, end) for symbol in symbols}
+
+
+class YFinanceProvider(MarketDataProvider):
+    """
+    Proveedor que consulta los datos a Yahoo Finance mediante yfinance.
+
+    Los precios se piden sin ajustar por dividendos (auto_adjust=False): con el
+    ajuste, los cierres ya incluyen los dividendos reinvertidos y el retorno
+    total los contaría dos veces. Yahoo Finance los devuelve ajustados por splits.
+    """
+
+    def history(self, symbol: str, start: datetime | date, end: datetime | date) -> pd.DataFrame:
+        """Obtiene el historial diario de un símbolo en el rango [start, end)."""
+        history: pd.DataFrame = get_ticker(symbol).history(
+            start=start, end=end, interval="1d", auto_adjust=False
+        )
+        return history
+
+    def recent_history(self, symbol: str, period: str) -> pd.DataFrame:
+        """Obtiene el historial diario más reciente de un símbolo."""
+        history: pd.DataFrame = get_ticker(symbol).history(period=period, auto_adjust=False)
+        return history
+
+    def download(
+        self, symbols: Sequence[str], start: datetime | date, end: datetime | date
+    ) -> Dict[str, pd.DataFrame]:
+        """Obtiene el historial de varios símbolos con una única descarga de yfinance."""
+        if not symbols:
+            return {}
+        data: pd.DataFrame = _yfinance().download(
+            list(symbols),
+            start=start,
+            end=end,
+            interval="1d",
+            group_by="ticker",
+            auto_adjust=False,
+            actions=True,
+            progress=False,
+        )
+        histories: Dict[str, pd.DataFrame] = {}
+        for symbol in symbols:
+            if symbol in data.columns.get_level_values(0):
+                histories[symbol] = cast(pd.DataFrame, data[symbol]).dropna(how="all")
+            else:
+                histories[symbol] = data.iloc[0:0]
+        return histories
+
+
+class FixtureProvider(MarketDataProvider):
+    """
+    Proveedor offline que lee el historial desde archivos locales.
+
+    Cada símbolo se guarda en `<directorio>/<SÍMBOLO>.csv` (o `.parquet`) con
+    una columna Date y las columnas de precios de yfinance. Los períodos
+    recientes se calculan respecto de la última fecha disponible en el archivo,
+    por lo que los resultados son deterministas.
+    """
+
+    def __init__(self, directory: str | Path) -> None:
+        """
+        Inicializa el proveedor.
+
+        Args:
+            directory: Directorio con los archivos de historial por símbolo
+        """
+        self.directory = Path(directory)
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, symbol: str, suffix: str) -> Path:
+        """Ruta del archivo de un símbolo con la extensión indicada."""
+        return self.directory / f"{symbol}{suffix}"
+
+    def load(self, symbol: str) -> pd.DataFrame:
+        """
+        Carga el historial completo de un símbolo.
+
+        Raises:
+            ValueError: Si no existe un archivo para el símbolo
+        """
+        with self._lock:
+            if symbol not in self._frames:
+                self._frames[symbol] = self._read(symbol)
+            return self._frames[symbol]
+
+    def _read(self, symbol: str) -> pd.DataFrame:
+        """Lee el archivo de un símbolo desde el disco."""
+        parquet_path = self._path(symbol, ".parquet")
+        csv_path = self._path(symbol, ".csv")
+        if parquet_path.exists():
+            frame = pd.read_parquet(parquet_path)
+            if "Date" in frame.columns:
+                frame = frame.set_index("Date")
+        elif csv_path.exists():
+            frame = pd.read_csv(csv_path, index_col="Date")
+        else:
+            raise ValueError(f"No hay datos de fixture para {symbol} en {self.directory}")
+        frame.index = pd.DatetimeIndex(frame.index, name="Date")
+        ordered: pd.DataFrame = frame.sort_index()
+        return ordered
+
+    def invalidate(self, symbol: Optional[str] = None) -> None:
+        """Descarta los historiales cargados en memoria."""
+        with self._lock:
+            if symbol is None:
+                self._frames.clear()
+            else:
+                self._frames.pop(symbol, None)
+
+    def history(self, symbol: str, start: datetime | date, end: datetime | date) -> pd.DataFrame:
+        """Obtiene el historial diario de un símbolo en el rango [start, end)."""
+        frame = self.load(symbol)
+        mask = (frame.index >= pd.Timestamp(start)) & (frame.index < pd.Timestamp(end))
+        history: pd.DataFrame = frame.loc[mask].copy()
+        return history
+
+    def recent_history(self, symbol: str, period: str) -> pd.DataFrame:
+        """Obtiene las barras del período que termina en la última fecha del archivo."""
+        frame = self.load(symbol)
+        days = period_to_days(period)
+        if days is None or frame.empty:
+            history: pd.DataFrame = frame.copy()
+        else:
+            first = frame.index[-1] - pd.Timedelta(days=days - 1)
+            history = frame.loc[frame.index >= first].copy()
+        return history
+
+
+class SyntheticProvider(FixtureProvider):
+    """
+    Proveedor offline que genera historiales sintéticos deterministas.
+
+    Cada símbolo recibe una caminata aleatoria geométrica sobre los días hábiles
+    del rango configurado, con una semilla derivada del símbolo, por lo que los
+    mismos parámetros producen siempre los mismos precios. Pensado para
+    benchmarks y tests con cualquier cantidad de símbolos.
+    """
+
+    def __init__(
+        self,
+        start: date = date(1995, 1, 2),
+        end: date = date(2026, 12, 31),
+        seed: int = 0,
+    ) -> None:
+        """
+        Inicializa el proveedor.
+
+        Args:
+            start: Primera fecha de los historiales generados
+            end: Última fecha de los historiales generados
+            seed: Semilla base para la generación de precios
+        """
+        super().__init__(Path("."))
+        self.start = start
+        self.end = end
+        self.seed = seed
+
+    def _read(self, symbol: str) -> pd.DataFrame:
+        """Genera el historial de un símbolo."""
+        days = pd.bdate_range(self.start, self.end, name="Date")
+        rng = np.random.default_rng([self.seed, zlib.crc32(symbol.encode())])
+        initial = rng.uniform(10.0, 500.0)
+        close = initial * np.exp(np.cumsum(rng.normal(0.0003, 0.015, len(days))))
+        spread = np.abs(rng.normal(0.0, 0.005, len(days)))
+        frame: pd.DataFrame = pd.DataFrame(
+            {
+                "Open": close * (1 + rng.normal(0.0, 0.003, len(days))),
+                "High": close * (1 + spread),
+                "Low": close * (1 - spread),
+                "Close": close,
+                "Volume": rng.integers(100_000, 10_000_000, len(days)).astype(float),
+                "Dividends": 0.0,
+                "Stock Splits": 0.0,
+            },
+            index=days,
+        )
+        return frame
+
+
+class RecordingProvider(MarketDataProvider):
+    """
+    Proveedor que delega en otro y graba cada respuesta como fixture.
+
+    Los archivos generados tienen el formato de FixtureProvider, por lo que
+    una sesión grabada se reproduce offline con `FixtureProvider(directorio)`.
+    """
+
+    def __init__(self, provider: MarketDataProvider, directory: str | Path) -> None:
+        """
+        Inicializa el proveedor.
+
+        Args:
+            provider: Proveedor real al que se delegan las consultas
+            directory: Directorio donde se graban los historiales por símbolo
+        """
+        self.provider = provider
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def _record(self, symbol: str, history: pd.DataFrame) -> None:
+        """Agrega las barras obtenidas al archivo CSV del símbolo."""
+        if history.empty:
+            return
+        frame = history.copy()
+        index = pd.DatetimeIndex(frame.index)
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        frame.index = index.normalize().rename("Date")
+
+        path = self.directory / f"{symbol}.csv"
+        with self._lock:
+            if path.exists():
+                previous = pd.read_csv(path, index_col="Date")
+                previous.index = pd.DatetimeIndex(previous.index, name="Date")
+                frame = pd.concat([previous, frame])
+                frame = frame[~frame.index.duplicated(keep="last")]
+            frame.sort_index().to_csv(path, date_format="%Y-%m-%d")
+
+    def history(self, symbol: str, start: datetime | date, end: datetime | date) -> pd.DataFrame:
+        """Obtiene y graba el historial diario de un símbolo en el rango [start, end)."""
+        history = self.provider.history(symbol, start, end)
+        self._record(symbol, history)
+        return history
+
+    def recent_history(self, symbol: str, period: str) -> pd.DataFrame:
+        """Obtiene y graba el historial diario más reciente de un símbolo."""
+        history = self.provider.recent_history(symbol, period)
+        self._record(symbol, history)
+        return history
+
+    def download(
+        self, symbols: Sequence[str], start: datetime | date, end: datetime | date
+    ) -> Dict[str, pd.DataFrame]:
+        """Obtiene y graba el historial de varios símbolos en el rango [start, end)."""
+        histories = self.provider.download(symbols, start, end)
+        for symbol, history in histories.items():
+            self._record(symbol, history)
+        return histories
+
+
+def default_provider() -> MarketDataProvider:
+    """Proveedor por defecto: fixtures si STOCKS_PORTFOLIO_FIXTURES está definida, o yfinance."""
+    fixtures = os.environ.get(FIXTURES_DIR_ENV)
+    if fixtures:
+        return FixtureProvider(fixtures)
+    return YFinanceProvider()
+
+
+_provider: Optional[MarketDataProvider] = None
+
+
+def get_provider() -> MarketDataProvider:
+    """Obtiene el proveedor de datos de mercado activo."""
+    global _provider
+    if _provider is None:
+        _provider = default_provider()
+    return _provider
+
+
+def set_provider(provider: Optional[MarketDataProvider]) -> None:
+    """
+    Reemplaza el proveedor de datos de mercado activo.
+
+    Args:
+        provider: Proveedor a utilizar, o None para volver al proveedor por defecto
+    """
+    global _provider
+    _provider = provider